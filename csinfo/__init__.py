@@ -3,18 +3,65 @@
 This module re-exports selected helpers implemented in :mod:`csinfo._impl` so that
 code doing `import csinfo` keeps working and finds the expected symbols (main,
 write_report, write_pdf_report, set_default_credential, clear_default_credential,
-safe_filename, etc.).
+safe_filename, etc.), plus the asyncio API from :mod:`csinfo._aio` and the
+fleet collection API from :mod:`csinfo._fleet`, the SQLite inventory from
+:mod:`csinfo._store`, the snapshot diff from :mod:`csinfo._diff` and the
+deduplicated snapshot archive from :mod:`csinfo._archive`.
+
+The re-exports are resolved lazily on first attribute access, so importing the
+package stays cheap and works on hosts without reportlab or Windows modules.
 """
 
-from ._impl import (
-	main,
-	write_report,
-	write_pdf_report,
-	set_default_credential,
-	clear_default_credential,
-	safe_filename,
-	get_machine_name,
-)
+import importlib
+
+# nome público -> (submódulo, atributo). Os submódulos só são importados no
+# primeiro acesso (PEP 562): `import csinfo` não carrega reportlab, asyncio
+# nem o restante da coleta até que sejam usados.
+_LAZY = {
+	'main': ('_impl', 'main'),
+	'write_report': ('_impl', 'write_report'),
+	'write_pdf_report': ('_impl', 'write_pdf_report'),
+	'set_default_credential': ('_impl', 'set_default_credential'),
+	'clear_default_credential': ('_impl', 'clear_default_credential'),
+	'safe_filename': ('_impl', 'safe_filename'),
+	'get_machine_name': ('_impl', 'get_machine_name'),
+	'iter_collect': ('_impl', 'iter_collect'),
+	'CollectionCancelled': ('_dag', 'CollectionCancelled'),
+	'arun_powershell': ('_aio', 'arun_powershell'),
+	'acollect': ('_aio', 'acollect'),
+	'add_windows_update_listener': ('_winupdate', 'add_listener'),
+	'PowerShellExecutor': ('_executor', 'PowerShellExecutor'),
+	'RecordingExecutor': ('_executor', 'RecordingExecutor'),
+	'ReplayExecutor': ('_executor', 'ReplayExecutor'),
+	'get_executor': ('_executor', 'get_executor'),
+	'set_executor': ('_executor', 'set_executor'),
+	'FleetRun': ('_fleet', 'FleetRun'),
+	'collect_fleet': ('_fleet', 'collect_fleet'),
+	'load_hosts': ('_fleet', 'load_hosts'),
+	'aprobe_host': ('_probe', 'aprobe_host'),
+	'aprobe_hosts': ('_probe', 'aprobe_hosts'),
+	'probe_host': ('_probe', 'probe_host'),
+	'probe_hosts': ('_probe', 'probe_hosts'),
+	'Report': ('_model', 'Report'),
+	'render_lines': ('_model', 'render_lines'),
+	'InventoryStore': ('_store', 'InventoryStore'),
+	'diff_reports': ('_diff', 'diff_reports'),
+	'SnapshotArchive': ('_archive', 'SnapshotArchive'),
+}
+
+
+def __getattr__(name):
+	try:
+		module, attr = _LAZY[name]
+	except KeyError:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+	value = getattr(importlib.import_module('.' + module, __name__), attr)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return sorted(set(globals()) | set(_LAZY))
 
 # Configurações públicas que podem ser sobrescritas pelo usuário do pacote
 # Controla se a barra lateral do PDF é desenhada no canvas (True por padrão)
@@ -30,4 +77,26 @@ __all__ = [
 	'clear_default_credential',
 	'safe_filename',
 	'get_machine_name',
+	'iter_collect',
+	'CollectionCancelled',
+	'arun_powershell',
+	'acollect',
+	'add_windows_update_listener',
+	'PowerShellExecutor',
+	'RecordingExecutor',
+	'ReplayExecutor',
+	'get_executor',
+	'set_executor',
+	'FleetRun',
+	'collect_fleet',
+	'load_hosts',
+	'aprobe_host',
+	'aprobe_hosts',
+	'probe_host',
+	'probe_hosts',
+	'Report',
+	'render_lines',
+	'InventoryStore',
+	'diff_reports',
+	'SnapshotArchive',
 ]
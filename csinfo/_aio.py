@@ -0,0 +1,238 @@
+"""API assíncrona (asyncio) para execução de PowerShell e coleta.
+
+Para quem embute o csinfo em um serviço asyncio: `arun_powershell` é o
+equivalente de `run_powershell` construído sobre
+`asyncio.create_subprocess_exec`, com as mesmas tentativas/backoff, o mesmo
+log de debug (CSINFO_DEBUG), as mesmas variantes remotas e o circuit breaker.
+Cancelar a task (ou estourar o `deadline`) mata o processo filho do
+PowerShell em vez de deixá-lo pendurado.
+
+`acollect` faz a coleta completa de `main()`: os comandos de todos os getters
+são combinados em um único script (ver csinfo._batch) executado com
+`arun_powershell`; em seguida o relatório é montado em uma thread a partir
+das saídas já obtidas. Se a coleta for cancelada (ou o `deadline` estourar)
+nessa fase, os comandos restantes não disparam mais PowerShell e a montagem
+para na próxima seção, sem exportar nem gravar nada (ver `cancel` em
+`main()`). A consulta das impressões digitais do modo delta e a captura dos
+comandos também rodam fora do loop.
+
+`deadline` é um instante absoluto de `time.monotonic()`; ao ser atingido a
+chamada termina com `asyncio.TimeoutError`.
+"""
+import asyncio
+import functools
+import os
+import signal
+import subprocess
+import threading
+import time
+
+from . import _batch
+from . import _breaker
+from . import _executor
+from . import _impl
+
+
+def _remaining(deadline):
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def _attempt_timeout(timeout, deadline):
+    """Timeout da tentativa limitado ao que resta até o deadline."""
+    remaining = _remaining(deadline)
+    if remaining is None:
+        return timeout, False
+    if remaining <= 0:
+        raise asyncio.TimeoutError()
+    if timeout is None or remaining < timeout:
+        return remaining, True
+    return timeout, False
+
+
+async def _kill(proc):
+    """Mata o processo filho (e, fora do Windows, o seu grupo de processos)."""
+    if proc.returncode is None:
+        try:
+            if os.name == 'nt':
+                proc.kill()
+            else:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            await asyncio.wait_for(asyncio.shield(proc.wait()), 5)
+        except BaseException:
+            pass
+
+
+async def _exec(argv, timeout):
+    """Executa `argv` e retorna (código de retorno, bytes); mata o filho em timeout/cancelamento."""
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000)
+    else:
+        kwargs['start_new_session'] = True
+    proc = await asyncio.create_subprocess_exec(*argv, stdin=asyncio.subprocess.DEVNULL,
+                                                stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.STDOUT, **kwargs)
+    try:
+        raw, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _kill(proc)
+        raise subprocess.TimeoutExpired(argv, timeout)
+    except BaseException:
+        # cancelamento da task: não deixar o powershell órfão
+        await _kill(proc)
+        raise
+    return proc.returncode, raw
+
+
+async def arun_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backoff=0.3, credential=None, deadline=None):
+    """Versão assíncrona de `run_powershell` (mesmos argumentos e retorno).
+
+    - deadline: instante de `time.monotonic()` após o qual a chamada é
+      abortada com `asyncio.TimeoutError` (o processo filho é encerrado)
+    """
+    computer_name, timeout = _impl._normalize_ps_args(computer_name, timeout)
+
+    batched = _batch.lookup(cmd, computer_name, timeout)
+    if batched is not None:
+        return batched
+
+    # executores simulados (replay de fixtures) não abrem processos
+    executor = _executor.get_executor()
+    if not getattr(executor, 'real', True):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(
+            executor.run, cmd, computer_name, timeout, retries, initial_backoff, credential))
+
+    credential, remote_variants, negotiation, negotiation_user = _impl._prepare_remote_variants(cmd, computer_name, credential)
+    session_log = _impl._debug_session_log() if os.environ.get('CSINFO_DEBUG') else None
+
+    def _write_debug_entry(full_cmd, computer, to, **kwargs):
+        if session_log:
+            _impl._write_ps_debug_entry(session_log, full_cmd, computer, to, **kwargs)
+
+    breaker = _breaker.get_default_breaker() if remote_variants else None
+    if breaker is not None:
+        try:
+            breaker.before_call(computer_name)
+        except _breaker.CircuitOpenError as exc:
+            _write_debug_entry(['powershell', '-Command', cmd], computer_name, timeout, exc=exc)
+            return _breaker.CircuitOpenOutput(computer_name, exc.reason)
+
+    attempt = 0
+    backoff = initial_backoff
+    while attempt < retries:
+        attempt += 1
+        ts = time.time()
+        used_variant = None
+        if remote_variants:
+            idx = min(len(remote_variants)-1, attempt-1)
+            used_variant, sel_cmd = remote_variants[idx]
+        else:
+            sel_cmd = cmd
+        cmd_with_encoding = f"[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; {sel_cmd}"
+        full = ['powershell', '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass', '-Command', cmd_with_encoding]
+        attempt_timeout, limited_by_deadline = _attempt_timeout(timeout, deadline)
+        try:
+            rc, raw = await _exec(full, attempt_timeout)
+            out = raw.decode('utf-8', errors='replace') if raw else ''
+            if rc != 0:
+                raise subprocess.CalledProcessError(rc, full, output=out)
+            _write_debug_entry(full, computer_name, timeout, dur=time.time() - ts, return_code=0, output=out)
+            if used_variant and negotiation is not None:
+                negotiation.record_success(computer_name, negotiation_user, used_variant)
+            if breaker is not None:
+                breaker.record_success(computer_name)
+            return out.strip()
+        except subprocess.CalledProcessError as cpe:
+            _write_debug_entry(full, computer_name, timeout, dur=time.time() - ts, return_code=cpe.returncode, output=cpe.output)
+            if used_variant and negotiation is not None and _breaker.is_connection_failure(cpe):
+                negotiation.record_failure(computer_name, negotiation_user, used_variant)
+            if breaker is not None:
+                if _breaker.is_connection_failure(cpe):
+                    _impl._record_breaker_failure(breaker, computer_name, cpe)
+                else:
+                    breaker.record_success(computer_name)
+            # autenticação recusada nesta variante: seguir para a próxima, sem espera
+            if (used_variant and _breaker.is_connection_failure(cpe) and idx < len(remote_variants) - 1
+                    and (breaker is None or breaker.state(computer_name) != _breaker.OPEN)):
+                retries = max(retries, attempt + 1)
+                continue
+            break
+        except subprocess.TimeoutExpired as exc:
+            _write_debug_entry(full, computer_name, timeout, dur=time.time() - ts, exc=exc)
+            if limited_by_deadline:
+                raise asyncio.TimeoutError()
+            if used_variant and negotiation is not None:
+                negotiation.record_failure(computer_name, negotiation_user, used_variant)
+            if breaker is not None:
+                _impl._record_breaker_failure(breaker, computer_name, exc)
+                if breaker.state(computer_name) == _breaker.OPEN:
+                    break
+        except Exception as exc:
+            # powershell ausente / falha ao iniciar o processo
+            _write_debug_entry(full, computer_name, timeout, dur=time.time() - ts, exc=exc)
+        if attempt < retries:
+            remaining = _remaining(deadline)
+            if remaining is not None and remaining <= backoff:
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(backoff)
+            backoff *= 2
+    if breaker is not None and breaker.state(computer_name) == _breaker.OPEN:
+        return _breaker.CircuitOpenOutput(computer_name, breaker.reason(computer_name))
+    return _executor.FailedOutput('sem resposta válida')
+
+
+async def acollect(computer_name=None, export_type='nenhum', barra_callback=None, machine_alias=None, include_debug_on_export=False, deadline=None, force_refresh=None, delta=None):
+    """Versão assíncrona de `main()` para uso programático (sem prompts).
+
+    Retorna o mesmo dicionário de `main()` ({'txt', 'pdf', 'lines', ...}).
+    `export_type` aceita 'txt', 'pdf' ou 'ambos' para também exportar.
+    """
+    loop = asyncio.get_running_loop()
+    # no modo delta o grafo consulta as impressões digitais do alvo (PowerShell
+    # síncrono): fora do loop, assim como a captura, que executa os getters
+    _grafo, secoes_cache = await loop.run_in_executor(None, _impl._collection_graph, computer_name, force_refresh, delta)
+    getters = tuple(getter for nome, getter, _deps in _impl._COLLECTION_GRAPH
+                    if nome not in secoes_cache and nome not in _impl._FORA_DO_LOTE)
+    plan = await loop.run_in_executor(None, _batch.capture, getters, computer_name)
+    if plan.command_count():
+        out = await arun_powershell(plan.build_script(), computer_name=computer_name,
+                                    timeout=plan.total_timeout(), retries=1, deadline=deadline)
+        plan.executed = plan.load_output(out)
+    # com o plano ativo e estrito, a montagem do relatório não executa PowerShell
+    # para comandos sem resultado quando a coleta é cancelada (ver abaixo)
+    plan.activate()
+    cancel = threading.Event()
+    future = loop.run_in_executor(None, functools.partial(
+        _impl.main, export_type=export_type or 'nenhum', barra_callback=barra_callback,
+        computer_name=computer_name, include_debug_on_export=include_debug_on_export,
+        machine_alias=machine_alias, batch=False, force_refresh=force_refresh, delta=delta,
+        cancel=cancel))
+
+    def _encerrar(f):
+        plan.release()
+        # a thread termina com CollectionCancelled depois do cancelamento
+        if not f.cancelled():
+            f.exception()
+
+    try:
+        remaining = _remaining(deadline)
+        if remaining is not None and remaining <= 0:
+            raise asyncio.TimeoutError()
+        return await asyncio.wait_for(asyncio.shield(future), remaining)
+    except BaseException:
+        # cancelado ou deadline: os getters em andamento só consomem o que já
+        # foi obtido e a montagem para sem exportar nem gravar
+        plan.strict = True
+        cancel.set()
+        raise
+    finally:
+        if future.done():
+            _encerrar(future)
+        else:
+            future.add_done_callback(_encerrar)
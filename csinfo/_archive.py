@@ -0,0 +1,421 @@
+"""Arquivo histórico de coletas, deduplicado por conteúdo.
+
+Guardar o par TXT+PDF de cada máquina todos os dias faz a pasta de relatórios
+crescer linearmente, embora quase tudo se repita de um dia para o outro (a
+lista de softwares, o bloco de hardware). Aqui cada coleta (`Report`, ver
+csinfo._model) é dividida em seções; cada seção vira um blob JSON canônico
+comprimido (zlib), endereçado pelo SHA-256 do conteúdo, e a coleta em si é só
+um manifesto pequeno com a identificação e o hash de cada seção. Seções que
+não mudaram apontam para o mesmo blob já gravado.
+
+Estrutura em disco:
+
+    <raiz>/blobs/ab/cdef....z                 seção comprimida (imutável)
+    <raiz>/manifests/<host>/<instante>-<id>.json
+
+Qualquer coleta é reconstruída lendo o manifesto e os blobs (decodificados
+uma vez e mantidos em memória, pois não mudam) e pode ser reexportada em
+TXT/PDF com `write_report`/`write_pdf_report`. `gc()` remove os blobs que
+nenhum manifesto referencia (blobs recentes são preservados, para não
+competir com uma gravação em andamento) e `prune()` descarta manifestos
+antigos antes do gc.
+
+`main()` arquiva a coleta quando recebe `archive=` ou quando a variável
+CSINFO_ARCHIVE está definida ('1' usa a pasta `archive` no diretório de
+estado; outro valor é o caminho da raiz). Linha de comando: `csinfo-archive
+list`, `... render ID -f pdf`, `... gc`, `... stats`.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+
+from . import _model
+from . import _state
+
+DEFAULT_NAME = 'archive'
+
+# seção do arquivo -> campos do Report gravados no blob. A identificação e as
+# marcas de cache mudam a cada coleta e ficam no próprio manifesto.
+SECTIONS = (
+    ('system', ('os_version', 'windows_status', 'office_version', 'office_status', 'sql_servers', 'antivirus', 'domain')),
+    ('hardware', ('memory_total', 'memory_modules', 'processors', 'monitors', 'keyboard', 'mouse', 'motherboard',
+                  'video_cards', 'printers')),
+    ('storage', ('disks', 'logical_drives')),
+    ('network', ('network_adapters', 'network_interfaces')),
+    ('security', ('firewall', 'firewall_controller', 'windows_update')),
+    ('admins', ('admins',)),
+    ('software', ('software',)),
+)
+_INLINE = ('identification', 'cached')
+assert sorted(_INLINE + tuple(f for _s, campos in SECTIONS for f in campos)) == sorted(_model.Report.__slots__)
+
+# blobs mais novos que isso não são removidos pelo gc (gravação em andamento)
+GC_GRACE = 3600.0
+_CACHE_MAX = 512
+_SAFE = re.compile(r'[^0-9a-z_.-]+')
+
+
+def _canonical(data):
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _host_dir(host):
+    return _SAFE.sub('_', str(host or '').strip().lower()) or '_'
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+        raise
+
+
+class SnapshotArchive(object):
+    """Arquivo de coletas em `root`; seguro para várias threads e processos."""
+
+    def __init__(self, root=None, level=6):
+        self.root = os.path.abspath(root or _state.state_path(DEFAULT_NAME))
+        self.level = level
+        self._blobs = os.path.join(self.root, 'blobs')
+        self._manifests = os.path.join(self.root, 'manifests')
+        os.makedirs(self._blobs, exist_ok=True)
+        os.makedirs(self._manifests, exist_ok=True)
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    # blobs --------------------------------------------------------------
+
+    def _blob_path(self, digest):
+        return os.path.join(self._blobs, digest[:2], digest[2:] + '.z')
+
+    def put_blob(self, data):
+        """Grava `data` (estrutura JSON) e retorna (hash, tamanho sem compressão)."""
+        raw = _canonical(data)
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            try:
+                # renovar o mtime protege o blob de um gc concorrente até o manifesto ser gravado
+                os.utime(path, None)
+                return digest, len(raw)
+            except OSError:
+                pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, zlib.compress(raw, self.level))
+        return digest, len(raw)
+
+    def get_blob(self, digest):
+        """Estrutura JSON de um blob (decodificada uma vez por processo)."""
+        with self._lock:
+            if digest in self._cache:
+                return self._cache[digest]
+        with open(self._blob_path(digest), 'rb') as fh:
+            data = json.loads(zlib.decompress(fh.read()).decode('utf-8'))
+        with self._lock:
+            if len(self._cache) >= _CACHE_MAX:
+                self._cache.clear()
+            self._cache[digest] = data
+        return data
+
+    # manifestos ---------------------------------------------------------
+
+    def put(self, report, host=None, alias=None, user=None, collected_at=None):
+        """Arquiva um `Report` (ou seu `as_dict()`) e retorna o id do manifesto."""
+        data = report.as_dict() if isinstance(report, _model.Report) else _model.Report.from_dict(report or {}).as_dict()
+        ident = data.get('identification') or {}
+        host = str(host or ident.get('computer_name') or '').strip()
+        if not host:
+            raise ValueError('coleta sem host')
+        if collected_at is None:
+            collected_at = ident.get('generated_at') or time.time()
+        sections = {}
+        for name, campos in SECTIONS:
+            sections[name] = list(self.put_blob({campo: data.get(campo) for campo in campos}))
+        manifest = {
+            'host': host,
+            'alias': alias,
+            'user': user or ident.get('generated_by'),
+            'collected_at': float(collected_at),
+            'identification': ident,
+            'cached': data.get('cached') or {},
+            'sections': sections,
+        }
+        raw = _canonical(manifest)
+        stem = f"{int(manifest['collected_at'] * 1000):015d}-{hashlib.sha256(raw).hexdigest()[:12]}"
+        folder = os.path.join(self._manifests, _host_dir(host))
+        os.makedirs(folder, exist_ok=True)
+        _write_atomic(os.path.join(folder, stem + '.json'), raw)
+        return f"{_host_dir(host)}/{stem}"
+
+    def _manifest_path(self, manifest_id):
+        host_dir, _sep, stem = str(manifest_id).partition('/')
+        if not stem or _host_dir(host_dir) != host_dir or not re.match(r'^[0-9a-f-]+$', stem):
+            raise KeyError(manifest_id)
+        return os.path.join(self._manifests, host_dir, stem + '.json')
+
+    def manifest(self, manifest_id):
+        data = _state.load_json(self._manifest_path(manifest_id))
+        if not isinstance(data, dict):
+            raise KeyError(manifest_id)
+        return data
+
+    def snapshots(self, host=None):
+        """Ids dos manifestos (de `host` ou de todos), do mais antigo ao mais recente."""
+        folders = [_host_dir(host)] if host is not None else sorted(os.listdir(self._manifests))
+        ids = []
+        for folder in folders:
+            try:
+                names = os.listdir(os.path.join(self._manifests, folder))
+            except OSError:
+                continue
+            ids += [(name[:-5], folder) for name in names if name.endswith('.json')]
+        # o nome começa pelo instante da coleta: a ordem alfabética é cronológica
+        return [f"{folder}/{stem}" for stem, folder in sorted(ids)]
+
+    def latest(self, host):
+        ids = self.snapshots(host)
+        return ids[-1] if ids else None
+
+    def load(self, manifest_id):
+        """Reconstrói o `Report` de uma coleta arquivada."""
+        manifest = self.manifest(manifest_id)
+        data = {'identification': manifest.get('identification'), 'cached': manifest.get('cached') or {}}
+        for digest, _size in manifest['sections'].values():
+            data.update(self.get_blob(digest))
+        return _model.Report.from_dict(data)
+
+    def render(self, manifest_id, path, fmt='txt'):
+        """Reexporta uma coleta em TXT ('txt') ou PDF ('pdf'); retorna o caminho."""
+        from . import _impl
+        report = self.load(manifest_id)
+        if fmt == 'pdf':
+            machine = report.identification.computer_name if report.identification is not None else ''
+            if not _impl.write_pdf_report(path, report, machine):
+                raise RuntimeError(f'falha ao gerar o PDF {path}')
+        else:
+            _impl.write_report(path, _model.render_lines(report))
+        return path
+
+    # manutenção ---------------------------------------------------------
+
+    def _referenced(self):
+        refs = set()
+        for manifest_id in self.snapshots():
+            try:
+                refs.update(digest for digest, _size in self.manifest(manifest_id)['sections'].values())
+            except Exception:
+                continue
+        return refs
+
+    def _iter_blobs(self):
+        for prefix in os.listdir(self._blobs):
+            folder = os.path.join(self._blobs, prefix)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith('.z'):
+                    yield prefix + name[:-2], os.path.join(folder, name)
+
+    def gc(self, grace=None):
+        """Remove blobs não referenciados; retorna (blobs removidos, bytes liberados)."""
+        grace = GC_GRACE if grace is None else grace
+        refs = self._referenced()
+        limite = time.time() - grace
+        removidos = liberados = 0
+        for digest, path in list(self._iter_blobs()):
+            if digest in refs:
+                continue
+            try:
+                st = os.stat(path)
+                if st.st_mtime > limite:
+                    continue
+                os.remove(path)
+                removidos += 1
+                liberados += st.st_size
+            except OSError:
+                continue
+            with self._lock:
+                self._cache.pop(digest, None)
+        return removidos, liberados
+
+    def prune(self, keep=None, older_than=None, grace=None):
+        """Descarta manifestos (mantém os `keep` mais recentes por host e/ou os
+        mais novos que `older_than` segundos) e executa o gc."""
+        agora = time.time()
+        descartados = 0
+        for folder in os.listdir(self._manifests) if keep is not None or older_than is not None else ():
+            ids = self.snapshots(folder)
+            for idx, manifest_id in enumerate(ids):
+                if keep is not None and len(ids) - idx <= keep:
+                    continue
+                if older_than is not None:
+                    try:
+                        if agora - float(self.manifest(manifest_id).get('collected_at') or 0) < older_than:
+                            continue
+                    except KeyError:
+                        pass
+                try:
+                    os.remove(self._manifest_path(manifest_id))
+                    descartados += 1
+                except OSError:
+                    pass
+        removidos, liberados = self.gc(grace)
+        return descartados, removidos, liberados
+
+    def stats(self):
+        """Totais do arquivo: manifestos, blobs, bytes em disco e bytes lógicos (sem deduplicação)."""
+        manifestos = logicos = 0
+        for manifest_id in self.snapshots():
+            try:
+                logicos += sum(size for _digest, size in self.manifest(manifest_id)['sections'].values())
+                manifestos += 1
+            except Exception:
+                continue
+        blobs = em_disco = 0
+        for _digest, path in self._iter_blobs():
+            try:
+                em_disco += os.path.getsize(path)
+                blobs += 1
+            except OSError:
+                pass
+        return {'root': self.root, 'snapshots': manifestos, 'blobs': blobs, 'stored_bytes': em_disco,
+                'logical_bytes': logicos, 'ratio': round(logicos / em_disco, 1) if em_disco else None}
+
+
+_ARCHIVES = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+def open_archive(root=None):
+    """`SnapshotArchive` compartilhado por raiz (um por pasta no processo)."""
+    key = os.path.abspath(root or _state.state_path(DEFAULT_NAME))
+    with _ARCHIVES_LOCK:
+        archive = _ARCHIVES.get(key)
+        if archive is None:
+            archive = _ARCHIVES[key] = SnapshotArchive(key)
+        return archive
+
+
+def get_default_archive():
+    """Arquivo definido por CSINFO_ARCHIVE, ou None se desativado."""
+    spec = os.environ.get('CSINFO_ARCHIVE', '').strip()
+    if not spec or spec == '0':
+        return None
+    return open_archive(None if spec == '1' else spec)
+
+
+def record(report, archive=None, host=None, alias=None, user=None):
+    """Arquiva `report` em `archive` (instância, caminho ou None = CSINFO_ARCHIVE).
+
+    Retorna o id do manifesto, ou None se não houver arquivo ou a gravação
+    falhar (a coleta não é interrompida por isso).
+    """
+    if report is None or archive is False:
+        return None
+    try:
+        if archive is None:
+            archive = get_default_archive()
+        elif not isinstance(archive, SnapshotArchive):
+            archive = open_archive(archive)
+        if archive is None:
+            return None
+        return archive.put(report, host=host, alias=alias, user=user)
+    except Exception as e:
+        try:
+            print(f"Aviso: não foi possível arquivar a coleta: {e}", file=sys.stderr)
+        except Exception:
+            pass
+        return None
+
+
+def cli(argv=None):
+    """Linha de comando do arquivo de coletas (`csinfo-archive`)."""
+    parser = argparse.ArgumentParser(description='Arquivo histórico de coletas deduplicado por conteúdo.')
+    parser.add_argument('--root', default=None, help='pasta do arquivo (padrão: CSINFO_ARCHIVE ou "archive" no diretório de estado)')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('list', help='coletas arquivadas')
+    p.add_argument('host', nargs='?')
+    p = sub.add_parser('show', help='relatório TXT de uma coleta na saída padrão')
+    p.add_argument('id', help='id da coleta ou nome do host (a mais recente)')
+    p = sub.add_parser('render', help='reexportar uma coleta em TXT/PDF')
+    p.add_argument('id', help='id da coleta ou nome do host (a mais recente)')
+    p.add_argument('-f', '--format', default='pdf', choices=('txt', 'pdf', 'ambos'))
+    p.add_argument('-o', '--output', default=None, help='arquivo de saída, sem extensão (padrão: Info_maquina_<host>_<data>)')
+    p = sub.add_parser('import', help='arquivar os JSON por host gerados pela coleta da frota')
+    p.add_argument('files', nargs='+')
+    p = sub.add_parser('prune', help='descartar coletas antigas e remover blobs sem referência')
+    p.add_argument('--keep', type=int, default=None, help='coletas mantidas por host')
+    p.add_argument('--older-than', type=float, default=None, help='descartar coletas com mais de N dias')
+    sub.add_parser('gc', help='remover blobs sem referência')
+    sub.add_parser('stats', help='tamanho do arquivo e taxa de deduplicação')
+    args = parser.parse_args(argv)
+
+    root = args.root
+    if root is None:
+        spec = os.environ.get('CSINFO_ARCHIVE', '').strip()
+        root = spec if spec not in ('', '0', '1') else None
+    archive = SnapshotArchive(root)
+
+    def resolver(ident):
+        if '/' in ident:
+            return ident
+        latest = archive.latest(ident)
+        if latest is None:
+            raise SystemExit(f'nenhuma coleta arquivada de {ident}')
+        return latest
+
+    if args.cmd == 'list':
+        for manifest_id in archive.snapshots(args.host):
+            m = archive.manifest(manifest_id)
+            quando = time.strftime('%Y-%m-%d %H:%M', time.localtime(m.get('collected_at') or 0))
+            print(f"{manifest_id}  {quando}  {m.get('host')}  {m.get('alias') or ''}")
+    elif args.cmd == 'show':
+        start = time.perf_counter()
+        print('\n'.join(_model.render_lines(archive.load(resolver(args.id)))))
+        print(f"({(time.perf_counter() - start) * 1000:.1f} ms)", file=sys.stderr)
+    elif args.cmd == 'render':
+        manifest_id = resolver(args.id)
+        base = args.output
+        if base is None:
+            m = archive.manifest(manifest_id)
+            base = f"Info_maquina_{_host_dir(m.get('host'))}_{time.strftime('%Y%m%d%H%M', time.localtime(m.get('collected_at') or 0))}"
+        formatos = ('txt', 'pdf') if args.format == 'ambos' else (args.format,)
+        for fmt in formatos:
+            print(archive.render(manifest_id, f"{base}.{fmt}", fmt))
+    elif args.cmd == 'import':
+        total = 0
+        for path in args.files:
+            data = _state.load_json(path)
+            if not isinstance(data, dict) or not data.get('report'):
+                print(f"{path}: sem relatório, ignorado", file=sys.stderr)
+                continue
+            archive.put(data['report'], host=data.get('host'), alias=data.get('alias'), user=data.get('user'))
+            total += 1
+        print(f"{total} coleta(s) arquivada(s) em {archive.root}")
+    elif args.cmd == 'prune':
+        older = args.older_than * 86400 if args.older_than is not None else None
+        descartados, removidos, liberados = archive.prune(keep=args.keep, older_than=older)
+        print(f"{descartados} coleta(s) descartada(s), {removidos} blob(s) removido(s), {liberados / 1024:.1f} KB liberados")
+    elif args.cmd == 'gc':
+        removidos, liberados = archive.gc()
+        print(f"{removidos} blob(s) removido(s), {liberados / 1024:.1f} KB liberados")
+    else:
+        print(json.dumps(archive.stats(), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
@@ -0,0 +1,214 @@
+"""Coleta em lote: um único script PowerShell (e um único Invoke-Command) por alvo.
+
+`main()` chama cerca de 25 getters e cada um envia seu próprio script. No modo
+em lote a coleta acontece em três fases:
+
+1. captura: os getters selecionados são executados com `run_powershell` em
+   modo de registro — cada comando é anotado (por seção = nome do getter) e
+   recebe saída vazia;
+2. execução: os comandos registrados são combinados em um único script que
+   devolve um documento JSON `{seção: [saída do comando 1, ...]}`, executado
+   com uma única chamada a `run_powershell` (um único Invoke-Command remoto);
+3. replay: enquanto o plano estiver ativo, `run_powershell` devolve para cada
+   comando a sua fatia do documento, e os parsers existentes dos getters
+   consomem essa saída normalmente.
+
+Comandos não previstos na captura (ex.: ramos condicionais que dependem de
+dados reais) simplesmente não encontram resultado e seguem o caminho normal.
+Se o script combinado falhar, todos os getters caem no caminho individual.
+"""
+import json
+import threading
+
+# Marcador que precede o documento JSON na saída do script combinado
+_MARKER = '@@CSINFO_BATCH@@'
+
+# Cada comando é compilado isoladamente: um erro de sintaxe ou exceção em uma
+# seção não derruba as demais.
+_PRELUDE = r'''function __CSInfoRun([string]$code) {
+try { (& ([scriptblock]::Create($code)) 2>&1 | Out-String -Width 4096) } catch { ($_ | Out-String) }
+}
+$__csinfo = [ordered]@{}'''
+
+_LOCK = threading.Lock()
+# plano em captura da thread que executa os getters: outras threads
+# consultando o mesmo alvo nesse meio tempo seguem o caminho normal
+_CAPTURING = threading.local()
+# alvo -> plano ativo (replay)
+_ACTIVE = {}
+
+
+def _target_key(computer_name):
+    return str(computer_name or '').strip().lower()
+
+
+def normalize_command(cmd):
+    """Normaliza espaços em branco para comparar comandos equivalentes."""
+    return ' '.join(str(cmd).split())
+
+
+def _compact(cmd):
+    """Remove indentação, linhas vazias e comentários de linha inteira.
+
+    Here-strings (@' ... '@, @" ... "@) e comentários de bloco (<# ... #>)
+    são mantidos como estão, linha a linha.
+    """
+    out = []
+    fim = None      # terminador do bloco em andamento
+    for ln in str(cmd).splitlines():
+        if fim is not None:
+            out.append(ln)
+            if (fim in ln) if fim == '#>' else ln.startswith(fim):
+                fim = None
+            continue
+        s = ln.strip()
+        if not s or s.startswith('#'):
+            continue
+        out.append(s)
+        if s.endswith("@'") or s.endswith('@"'):
+            fim = s[-1] + '@'
+        elif '<#' in s and '#>' not in s[s.rindex('<#') + 2:]:
+            fim = '#>'
+    return '\n'.join(out)
+
+
+def _ps_quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+class BatchPlan(object):
+    """Comandos capturados por seção e, após a execução, as saídas por comando."""
+
+    def __init__(self, computer_name=None):
+        self.computer_name = computer_name
+        self.key = _target_key(computer_name)
+        self.sections = {}      # seção -> [comando, ...] (ordem de inserção preservada)
+        self.timeouts = {}      # comando normalizado -> timeout solicitado
+        self.results = {}       # comando normalizado -> saída
+        self.current = None
+        self.executed = False
+        self.strict = False     # True: comandos sem resultado devolvem '' (não executam)
+        self.hits = 0
+
+    def record(self, cmd, timeout):
+        norm = normalize_command(cmd)
+        if norm in self.timeouts:
+            return
+        self.timeouts[norm] = timeout or 0
+        self.sections.setdefault(self.current or 'misc', []).append(cmd)
+
+    def command_count(self):
+        return len(self.timeouts)
+
+    def build_script(self):
+        """Monta o script combinado que devolve um JSON keyed por seção."""
+        parts = [_PRELUDE]
+        for section, cmds in self.sections.items():
+            calls = ',\n'.join(f"(__CSInfoRun {_ps_quote(_compact(c))})" for c in cmds)
+            parts.append(f"$__csinfo[{_ps_quote(section)}] = @(\n{calls}\n)")
+        parts.append(f"'{_MARKER}'")
+        parts.append("$__csinfo | ConvertTo-Json -Compress -Depth 4")
+        return '\n'.join(parts)
+
+    def total_timeout(self):
+        return sum(self.timeouts.values()) or 60
+
+    def load_output(self, out):
+        """Interpreta a saída do script combinado; retorna True se algo foi carregado."""
+        if not out or _MARKER not in out:
+            return False
+        try:
+            doc = json.loads(out.split(_MARKER, 1)[1].strip())
+        except Exception:
+            return False
+        if not isinstance(doc, dict):
+            return False
+        for section, cmds in self.sections.items():
+            outs = doc.get(section)
+            if isinstance(outs, str):
+                outs = [outs]
+            if not isinstance(outs, list):
+                continue
+            for cmd, value in zip(cmds, outs):
+                self.results[normalize_command(cmd)] = (value or '').strip()
+        return bool(self.results)
+
+    def activate(self):
+        """Ativa o replay deste plano para o alvo."""
+        with _LOCK:
+            _ACTIVE[self.key] = self
+
+    def release(self):
+        """Desativa o replay deste plano (fim da coleta)."""
+        with _LOCK:
+            if _ACTIVE.get(self.key) is self:
+                del _ACTIVE[self.key]
+
+
+def lookup(cmd, computer_name, timeout=None):
+    """Gancho chamado por `run_powershell`.
+
+    Retorna '' durante a captura (registrando o comando), a saída já obtida
+    quando há um plano ativo para o alvo, ou None para seguir o caminho normal.
+    """
+    key = _target_key(computer_name)
+    capturing = getattr(_CAPTURING, 'plan', None)
+    if capturing is not None and capturing.key != key:
+        capturing = None
+    with _LOCK:
+        active = _ACTIVE.get(key)
+    if capturing is not None:
+        capturing.record(cmd, timeout)
+        return ''
+    if active is not None:
+        value = active.results.get(normalize_command(cmd))
+        if value is not None:
+            active.hits += 1
+        elif active.strict:
+            return ''
+        return value
+    return None
+
+
+def capture(getters, computer_name=None):
+    """Executa os getters em modo de registro e retorna o `BatchPlan` resultante.
+
+    Só os comandos emitidos pela thread atual são registrados.
+    """
+    plan = BatchPlan(computer_name)
+    anterior = getattr(_CAPTURING, 'plan', None)
+    _CAPTURING.plan = plan
+    try:
+        for getter in getters:
+            plan.current = getattr(getter, '__name__', str(getter))
+            try:
+                getter(computer_name)
+            except Exception:
+                pass
+    finally:
+        _CAPTURING.plan = anterior
+        plan.current = None
+    return plan
+
+
+def prefetch(getters, computer_name=None, runner=None):
+    """Captura, executa o script combinado e ativa o replay para o alvo.
+
+    `runner(script, computer_name, timeout)` executa o script combinado e
+    retorna sua saída; por padrão usa `csinfo._impl.run_powershell`.
+    Retorna o plano (chamar `plan.release()` ao final da coleta).
+    """
+    plan = capture(getters, computer_name)
+    if not plan.command_count():
+        return plan
+    if runner is None:
+        from . import _impl
+        runner = lambda script, comp, to: _impl.run_powershell(script, computer_name=comp, timeout=to, retries=1)
+    try:
+        out = runner(plan.build_script(), computer_name, plan.total_timeout())
+    except Exception:
+        out = ''
+    plan.executed = plan.load_output(out)
+    if plan.executed:
+        plan.activate()
+    return plan
@@ -0,0 +1,209 @@
+"""Circuit breaker por host remoto.
+
+Com um host inacessível (ou com o WinRM parado), cada um dos getters de
+`main()` esperava o seu próprio timeout × retries (mais o backoff) antes de
+desistir, e uma coleta podia ficar presa por vários minutos. O breaker conta
+as falhas de conexão por host: ao atingir o limite o circuito abre e as
+chamadas seguintes para aquele host falham imediatamente com o motivo
+registrado (`run_powershell` devolve um `CircuitOpenOutput`, vazio, e o
+resultado de `main()` traz o motivo em 'circuit_open'). Passado o tempo de espera o circuito fica meio-aberto e deixa
+passar uma única chamada de prova; se ela funcionar o circuito fecha, senão
+reabre por mais um período.
+
+`check_remote_machine` também alimenta o breaker: um host dado como
+inacessível abre o circuito na hora e um host acessível o fecha.
+
+Variáveis de ambiente:
+    CSINFO_BREAKER=0            desabilita o breaker
+    CSINFO_BREAKER_THRESHOLD    falhas de conexão seguidas para abrir (padrão 3)
+    CSINFO_BREAKER_COOLDOWN     segundos antes de testar de novo (padrão 60)
+"""
+import os
+import subprocess
+import threading
+import time
+
+from . import _executor
+from . import _pshost
+
+CLOSED = 'fechado'
+OPEN = 'aberto'
+HALF_OPEN = 'meio-aberto'
+
+# Trechos de mensagens (PowerShell/WinRM, em inglês e português) que indicam
+# falha de conexão com o host, e não erro do comando executado.
+_CONNECTION_MARKERS = (
+    'winrm cannot complete',
+    'winrm client cannot',
+    'cannot connect to the destination',
+    'connecting to remote server',
+    'the rpc server is unavailable',
+    'no such host is known',
+    'network path was not found',
+    'the client cannot connect',
+    'cliente winrm não pode',
+    'o winrm não pode concluir',
+    'falha ao conectar ao servidor remoto',
+    'conectando ao servidor remoto',
+    'o servidor rpc não está disponível',
+    'host desconhecido',
+    'caminho da rede não foi encontrado',
+)
+
+
+class CircuitOpenError(Exception):
+    """Chamada recusada porque o circuito do host está aberto."""
+
+    def __init__(self, computer_name, reason):
+        self.computer_name = computer_name
+        self.reason = reason
+        super().__init__(f"circuito aberto para {computer_name}: {reason}")
+
+
+class CircuitOpenOutput(_executor.FailedOutput):
+    """Saída de um comando recusado porque o circuito do host está aberto.
+
+    É igual a '' para os getters, que seguem com o valor de falha de sempre;
+    quem precisa distinguir de uma saída vazia confere o tipo e lê `reason`.
+    """
+
+    def __new__(cls, computer_name, reason):
+        obj = super(CircuitOpenOutput, cls).__new__(cls, reason)
+        obj.computer_name = computer_name
+        return obj
+
+
+def is_connection_failure(exc=None, output=None):
+    """Indica se a falha (exceção e/ou saída) é de conexão com o host."""
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return True
+    try:
+        from ._psession import RemoteSessionError
+        if isinstance(exc, RemoteSessionError):
+            return True
+    except Exception:
+        pass
+    if output is None and exc is not None:
+        output = getattr(exc, 'output', None)
+    if isinstance(output, bytes):
+        output = output.decode('utf-8', errors='replace')
+    text = str(output or '').lower()
+    return any(m in text for m in _CONNECTION_MARKERS)
+
+
+def describe_failure(exc):
+    """Motivo curto e legível para uma falha de conexão."""
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return f"sem resposta em {exc.timeout}s"
+    text = getattr(exc, 'output', None) or str(exc)
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', errors='replace')
+    for ln in str(text).splitlines():
+        if ln.strip():
+            return ln.strip()[:200]
+    return exc.__class__.__name__
+
+
+class CircuitBreaker(object):
+    """Estado do circuito por host: fechado, aberto ou meio-aberto."""
+
+    def __init__(self, threshold=None, cooldown=None):
+        self.threshold = threshold if threshold is not None else _pshost._env_number('CSINFO_BREAKER_THRESHOLD', 3)
+        self.cooldown = cooldown if cooldown is not None else _pshost._env_number('CSINFO_BREAKER_COOLDOWN', 60.0, float)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(computer_name):
+        return str(computer_name or '').strip().lower()
+
+    def _entry(self, key):
+        entry = self._hosts.get(key)
+        if entry is None:
+            entry = self._hosts[key] = {'state': CLOSED, 'failures': 0, 'opened_at': 0.0, 'reason': '', 'probing': False, 'probe_at': 0.0}
+        return entry
+
+    def state(self, computer_name):
+        with self._lock:
+            entry = self._hosts.get(self._key(computer_name))
+            return entry['state'] if entry else CLOSED
+
+    def reason(self, computer_name):
+        """Motivo da última abertura do circuito do host ('' se fechado)."""
+        with self._lock:
+            entry = self._hosts.get(self._key(computer_name))
+            return entry['reason'] if entry and entry['state'] != CLOSED else ''
+
+    def before_call(self, computer_name):
+        """Levanta `CircuitOpenError` se a chamada deve falhar imediatamente."""
+        key = self._key(computer_name)
+        with self._lock:
+            entry = self._hosts.get(key)
+            if entry is None or entry['state'] == CLOSED:
+                return
+            now = time.monotonic()
+            if entry['state'] == OPEN and now - entry['opened_at'] >= self.cooldown:
+                entry['state'] = HALF_OPEN
+                entry['probing'] = False
+            if entry['state'] == HALF_OPEN and (not entry['probing'] or now - entry['probe_at'] >= self.cooldown):
+                # deixar passar uma única chamada de prova (outra, se a anterior
+                # terminou sem dizer nada sobre a conexão)
+                entry['probing'] = True
+                entry['probe_at'] = now
+                return
+            reason = entry['reason']
+        raise CircuitOpenError(computer_name, reason)
+
+    def record_success(self, computer_name):
+        key = self._key(computer_name)
+        with self._lock:
+            if key in self._hosts:
+                del self._hosts[key]
+
+    def record_failure(self, computer_name, reason=''):
+        """Conta uma falha de conexão; retorna True se o circuito acabou de abrir."""
+        key = self._key(computer_name)
+        with self._lock:
+            entry = self._entry(key)
+            entry['failures'] += 1
+            entry['reason'] = reason or entry['reason'] or 'falha de conexão'
+            if entry['state'] == OPEN:
+                return False
+            if entry['state'] == HALF_OPEN or entry['failures'] >= self.threshold:
+                self._open_locked(entry)
+                return True
+            return False
+
+    def trip(self, computer_name, reason):
+        """Abre o circuito imediatamente (ex.: host inacessível por ping/portas)."""
+        with self._lock:
+            entry = self._entry(self._key(computer_name))
+            entry['reason'] = reason
+            self._open_locked(entry)
+
+    def _open_locked(self, entry):
+        entry['state'] = OPEN
+        entry['opened_at'] = time.monotonic()
+        entry['probing'] = False
+
+    def reset(self, computer_name=None):
+        with self._lock:
+            if computer_name is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(self._key(computer_name), None)
+
+
+_DEFAULT_BREAKER = None
+_DEFAULT_BREAKER_LOCK = threading.Lock()
+
+
+def get_default_breaker():
+    """Breaker compartilhado do processo, ou None se desabilitado por env."""
+    global _DEFAULT_BREAKER
+    if os.environ.get('CSINFO_BREAKER', '1') == '0':
+        return None
+    with _DEFAULT_BREAKER_LOCK:
+        if _DEFAULT_BREAKER is None:
+            _DEFAULT_BREAKER = CircuitBreaker()
+        return _DEFAULT_BREAKER
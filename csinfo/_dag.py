@@ -0,0 +1,121 @@
+"""Execução concorrente dos getters de `main()` a partir de um grafo de dependências.
+
+Quase todos os getters são independentes entre si; as exceções são
+declaradas como dependências (ex.: o tipo de chassi usa os monitores na
+heurística de notebook). Cada nó é `(nome, função, dependências)` e a função
+é chamada como `função(computer_name, **{dep: resultado_da_dep})`.
+
+Os nós são submetidos, na ordem declarada (que precisa ser topológica), a
+um pool de threads limitado. Quem monta o relatório consome os resultados
+com `GetterRun.result(nome)` na ordem original das linhas, então a saída e a
+progressão de `barra_callback` continuam idênticas à execução sequencial —
+a diferença é que os resultados seguintes já estão sendo coletados.
+
+Com `max_workers <= 1` nada é executado em threads: cada getter roda sob
+demanda, no momento em que o resultado é pedido (comportamento original).
+
+`timings` guarda (início, fim) de cada getter (`time.perf_counter()`) e
+`wait_ready` permite consumir grupos de resultados na ordem em que ficam
+prontos (ver `csinfo.iter_collect`).
+
+Com `cancel` (um `threading.Event`) sinalizado, os getters que ainda não
+começaram levantam `CollectionCancelled` em vez de consultar o alvo.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class CollectionCancelled(Exception):
+    """Coleta interrompida por quem a pediu (prazo esgotado ou cancelamento)."""
+
+
+def validate(nodes):
+    """Garante nomes únicos e dependências declaradas antes de quem as usa."""
+    seen = set()
+    for name, _func, deps in nodes:
+        if name in seen:
+            raise ValueError(f"getter duplicado no grafo: {name}")
+        for dep in deps:
+            if dep not in seen:
+                raise ValueError(f"dependência '{dep}' de '{name}' não declarada antes dele")
+        seen.add(name)
+
+
+class GetterRun(object):
+    """Uma execução do grafo para um alvo."""
+
+    def __init__(self, nodes, computer_name=None, max_workers=1, cancel=None):
+        validate(nodes)
+        self.computer_name = computer_name
+        self.cancel = cancel
+        self._nodes = {name: (func, tuple(deps)) for name, func, deps in nodes}
+        self._futures = {}
+        self._results = {}
+        self.timings = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        if max_workers and max_workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='csinfo-getter')
+            # a ordem de submissão é topológica e o pool é FIFO: quando um nó
+            # espera por uma dependência, ela já está em execução ou concluída
+            for name, _func, _deps in nodes:
+                self._futures[name] = self._executor.submit(self._call, name)
+
+    def _call(self, name):
+        if self.cancel is not None and self.cancel.is_set():
+            raise CollectionCancelled(name)
+        func, deps = self._nodes[name]
+        kwargs = {dep: self.result(dep) for dep in deps}
+        start = time.perf_counter()
+        try:
+            return func(self.computer_name, **kwargs)
+        finally:
+            self.timings[name] = (start, time.perf_counter())
+
+    def result(self, name):
+        """Resultado do getter `name` (bloqueia até que esteja disponível)."""
+        future = self._futures.get(name)
+        if future is not None:
+            return future.result()
+        with self._lock:
+            if name in self._results:
+                return self._results[name]
+        value = self._call(name)
+        with self._lock:
+            self._results.setdefault(name, value)
+            return self._results[name]
+
+    def ready(self, name):
+        """Indica se o resultado de `name` já está disponível (sem bloquear)."""
+        future = self._futures.get(name)
+        if future is not None:
+            return future.done()
+        with self._lock:
+            return name in self._results
+
+    def wait_ready(self, groups):
+        """Índice do primeiro grupo de nós com todos os resultados prontos.
+
+        Bloqueia até algum grupo ficar pronto. Na execução sequencial nada
+        roda antes de ser pedido, então retorna o primeiro grupo.
+        """
+        if self._executor is None:
+            return 0
+        while True:
+            for idx, names in enumerate(groups):
+                if all(self.ready(name) for name in names):
+                    return idx
+            waiting = [self._futures[name] for names in groups for name in names
+                       if name in self._futures and not self._futures[name].done()]
+            if not waiting:
+                return 0
+            wait(waiting, return_when=FIRST_COMPLETED)
+
+    def close(self):
+        """Encerra o pool; getters ainda não iniciados são cancelados."""
+        if self._executor is not None:
+            for future in self._futures.values():
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
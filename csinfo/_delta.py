@@ -0,0 +1,186 @@
+"""Coleta incremental (delta) guiada por impressões digitais de mudança.
+
+Uma nova coleta de inventário refaz tudo, mesmo quando nada mudou: a árvore
+Uninstall do registro, os dispositivos PnP e todas as classes CIM. No modo
+delta `main()` primeiro busca, em uma única chamada barata, uma impressão
+digital por grupo de seções:
+
+    software  nomes das subchaves Uninstall (64 e 32 bits) + DisplayVersion
+    boot      LastBootUpTime e versão do Win32_OperatingSystem (hardware
+              interno e versão do Windows só mudam com reinicialização)
+    pnp       conjunto de PNPDeviceID presentes (monitores, teclado/mouse,
+              placas de vídeo e de rede)
+    disks     modelo, tamanho e serial dos discos e volumes
+
+e só consulta de novo as seções cujo grupo tem impressão diferente da
+gravada na última coleta do host. As demais são servidas do valor gravado e
+marcadas no relatório como vindas do cache (com o instante da coleta real).
+Seções fora destes grupos (ativação, segurança, rede, administradores...)
+são sempre coletadas. Espaço usado/livre dos discos só é atualizado quando a
+impressão `disks` muda.
+
+O estado fica no diretório de estado do csinfo, um arquivo por (host,
+seção), com o mesmo formato e a mesma política de remoção de
+csinfo._sectioncache. A primeira coleta delta de um host é completa.
+
+Variáveis de ambiente:
+    CSINFO_DELTA=1             ativa o modo delta em main()/iter_collect
+    CSINFO_DELTA_MAX_MB        tamanho máximo do estado em disco (padrão 100)
+"""
+import json
+import os
+import threading
+import time
+
+from . import _pshost
+from . import _sectioncache
+from . import _state
+
+# nó de _COLLECTION_GRAPH -> grupo de impressão digital que o invalida
+GROUPS = {
+    'get_installed_software': 'software',
+    'get_os_version': 'boot',
+    'get_memory_info': 'boot',
+    'get_memory_modules_info': 'boot',
+    'get_processor_info': 'boot',
+    'get_motherboard_info': 'boot',
+    'get_chassis_type_name': 'boot',
+    'monitors': 'pnp',
+    'get_keyboard_mouse_status': 'pnp',
+    'get_video_cards_info': 'pnp',
+    'get_network_adapters_info': 'pnp',
+    'get_disk_info': 'disks',
+}
+
+# seções cujo valor original é uma tupla (JSON devolve lista)
+_TUPLE_SECTIONS = _sectioncache._TUPLE_SECTIONS + ('get_keyboard_mouse_status',)
+
+# impressões de uma mesma coleta são reaproveitadas (ex.: acollect e main())
+FINGERPRINT_TTL = 30.0
+
+FINGERPRINT_SCRIPT = r"""
+$r = @{}
+function H($s) {
+    $sha = [System.Security.Cryptography.SHA1]::Create()
+    ([System.BitConverter]::ToString($sha.ComputeHash([System.Text.Encoding]::UTF8.GetBytes([string]$s)))) -replace '-', ''
+}
+try {
+    $itens = @()
+    foreach ($p in @('SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall', 'SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall')) {
+        $k = [Microsoft.Win32.Registry]::LocalMachine.OpenSubKey($p)
+        if (-not $k) { continue }
+        foreach ($n in $k.GetSubKeyNames()) {
+            $v = ''
+            $s = $k.OpenSubKey($n)
+            if ($s) { $v = $s.GetValue('DisplayVersion'); $s.Close() }
+            $itens += "$p\$n=$v"
+        }
+        $k.Close()
+    }
+    $r.software = "$($itens.Count):" + (H (($itens | Sort-Object) -join '|'))
+} catch {}
+try {
+    $os = Get-CimInstance Win32_OperatingSystem -Property LastBootUpTime, Version, Caption -ErrorAction Stop
+    $r.boot = "$($os.LastBootUpTime.ToUniversalTime().ToString('o'))|$($os.Version)|$($os.Caption)"
+} catch {}
+try {
+    $ids = @(Get-CimInstance Win32_PnPEntity -Property PNPDeviceID -ErrorAction Stop | ForEach-Object { $_.PNPDeviceID } | Sort-Object)
+    $r.pnp = "$($ids.Count):" + (H ($ids -join '|'))
+} catch {}
+try {
+    $d = @(Get-CimInstance Win32_DiskDrive -Property Model, Size, SerialNumber -ErrorAction Stop | ForEach-Object { "$($_.Model)|$($_.Size)|$($_.SerialNumber)".Trim() })
+    $d += @(Get-CimInstance Win32_Volume -Property DeviceID, Capacity, SerialNumber -ErrorAction SilentlyContinue | ForEach-Object { "$($_.DeviceID)|$($_.Capacity)|$($_.SerialNumber)" })
+    $r.disks = "$($d.Count):" + (H (($d | Sort-Object) -join '|'))
+} catch {}
+$r | ConvertTo-Json -Compress
+"""
+
+
+def fetch_fingerprints(computer_name=None):
+    """{grupo: impressão} do alvo; grupos que falharam ficam de fora."""
+    from . import _impl
+    out = _impl.run_powershell(FINGERPRINT_SCRIPT, computer_name)
+    try:
+        parsed = json.loads(out) if out else {}
+    except Exception:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    return {grupo: str(valor) for grupo, valor in parsed.items() if valor not in (None, '')}
+
+
+class DeltaCache(_sectioncache.SectionCache):
+    """Último valor de cada seção por host, com a impressão digital da coleta."""
+
+    def __init__(self, directory=None, max_bytes=None, fetch=None):
+        if max_bytes is None:
+            max_bytes = int(_pshost._env_number('CSINFO_DELTA_MAX_MB', 100.0, float) * 1024 * 1024)
+        super(DeltaCache, self).__init__(directory or _state.state_path('delta'),
+                                         ttls={nome: True for nome in GROUPS}, max_bytes=max_bytes)
+        self._fetch = fetch or fetch_fingerprints
+        self._fingerprints = {}
+
+    def fingerprints(self, computer_name=None):
+        """Impressões digitais atuais do alvo (reaproveitadas por FINGERPRINT_TTL)."""
+        key = str(computer_name or '').strip().lower()
+        with self._lock:
+            entry = self._fingerprints.get(key)
+        if entry is not None and time.time() - entry[0] < FINGERPRINT_TTL:
+            return entry[1]
+        try:
+            atuais = self._fetch(computer_name) or {}
+        except Exception:
+            atuais = {}
+        with self._lock:
+            self._fingerprints[key] = (time.time(), atuais)
+        return atuais
+
+    def get(self, host, section, fingerprint=None):
+        """Retorna (valor, instante da coleta) se a impressão gravada for a atual, ou None."""
+        if not fingerprint or not self.cacheable(section):
+            return None
+        path = self._path(host, section)
+        entry = _state.load_json(path)
+        if not isinstance(entry, dict) or 'value' not in entry or entry.get('fp') != fingerprint:
+            return None
+        try:
+            os.utime(path, None)
+        except Exception:
+            pass
+        value = entry['value']
+        if section in _TUPLE_SECTIONS and isinstance(value, list):
+            value = tuple(value)
+        return value, float(entry.get('ts', 0))
+
+    def put(self, host, section, value, fingerprint=None):
+        if not fingerprint or not self.cacheable(section) or _sectioncache._is_empty(value):
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except Exception:
+            return False
+        ok = _state.save_json(self._path(host, section), {'host': str(host), 'section': section, 'ts': time.time(),
+                                                          'fp': fingerprint, 'value': value})
+        if ok:
+            self._evict()
+        return ok
+
+
+_DEFAULT_STATE = None
+_DEFAULT_STATE_LOCK = threading.Lock()
+
+
+def get_default_state():
+    """Estado delta compartilhado do processo."""
+    global _DEFAULT_STATE
+    with _DEFAULT_STATE_LOCK:
+        if _DEFAULT_STATE is None:
+            _DEFAULT_STATE = DeltaCache()
+        return _DEFAULT_STATE
+
+
+def delta_requested(delta):
+    """Indica se a coleta deve ser incremental (parâmetro explícito ou CSINFO_DELTA=1)."""
+    if delta is None:
+        return os.environ.get('CSINFO_DELTA') == '1'
+    return bool(delta)
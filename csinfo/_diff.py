@@ -0,0 +1,260 @@
+"""Diferenças entre duas coletas de um mesmo host.
+
+Comparar dois TXT linha a linha quebra com qualquer mudança de ordem ou de
+formatação (um software novo desloca a numeração de todos os seguintes). Aqui
+a comparação é feita sobre o `Report` (ver csinfo._model), com cada lista
+indexada por uma chave estável:
+
+    software            (nome, editor)
+    pentes de memória   slot (Location)
+    discos              (modelo, tamanho)
+    placas de rede      MAC
+    interfaces de rede  MAC
+    unidades lógicas    letra
+    administradores     nome
+
+Cada lista vira um dicionário chave -> registro e as duas coletas são
+cruzadas uma única vez (tempo linear no número de itens). O resultado é um
+`ChangeSet` compacto: itens adicionados, removidos e alterados (com os campos
+que mudaram) e os campos simples alterados (versão do Windows, RAM total...).
+Campos que mudam a toda coleta (espaço livre, Windows Update, identificação)
+ficam de fora por padrão.
+
+Uso: `diff_reports(antigo, novo)`, `InventoryStore.diff(host)` (ver
+csinfo._store) ou `python -m csinfo._diff antigo.json novo.json`.
+"""
+import argparse
+import json
+import re
+import sys
+
+from . import _model
+
+# campo do Report -> campos do registro que formam a chave
+KEYS = {
+    'sql_servers': ('instance',),
+    'antivirus': ('name',),
+    'memory_modules': ('location',),
+    'processors': ('name',),
+    'disks': ('model', 'size'),
+    'logical_drives': ('drive',),
+    'monitors': ('manufacturer', 'model', 'serial'),
+    'network_adapters': ('mac',),
+    'video_cards': ('name',),
+    'printers': ('name',),
+    'network_interfaces': ('mac',),
+    'firewall': ('profile',),
+    'software': ('name', 'publisher'),
+}
+
+SCALARS = (
+    'os_version', 'windows_status', 'office_version', 'office_status', 'domain',
+    'memory_total', 'keyboard', 'mouse', 'motherboard', 'firewall_controller', 'windows_update',
+)
+
+# campos ignorados por padrão: mudam a cada coleta sem que a máquina mude
+DEFAULT_IGNORE = frozenset((
+    'windows_update',
+    'disks.used', 'disks.free', 'disks.partitions',
+    'logical_drives.used', 'logical_drives.free',
+    'network_adapters.speed',
+))
+
+LABELS = {
+    'os_version': 'Sistema', 'windows_status': 'Ativação do Windows', 'office_version': 'Office',
+    'office_status': 'Ativação do Office', 'domain': 'Domínio', 'memory_total': 'Memória RAM total',
+    'keyboard': 'Teclado', 'mouse': 'Mouse', 'motherboard': 'Placa-mãe',
+    'firewall_controller': 'Firewall controlado por', 'windows_update': 'Windows Update',
+    'sql_servers': 'SQL Server', 'antivirus': 'Antivírus', 'memory_modules': 'Pente de memória',
+    'processors': 'Processador', 'disks': 'Disco', 'logical_drives': 'Unidade',
+    'monitors': 'Monitor', 'network_adapters': 'Placa de rede', 'video_cards': 'Placa de vídeo',
+    'printers': 'Impressora', 'network_interfaces': 'Interface de rede', 'firewall': 'Firewall',
+    'software': 'Software', 'admins': 'Administrador',
+}
+
+_MAC_SEP = re.compile(r'[^0-9a-f]')
+
+
+def _norm(value, field=None):
+    if value is None:
+        return ''
+    text = str(value).strip().lower()
+    if field == 'mac':
+        return _MAC_SEP.sub('', text)
+    return text
+
+
+def _as_report(value):
+    if isinstance(value, _model.Report):
+        return value
+    if isinstance(value, dict) and isinstance(value.get('report'), dict):
+        # JSON por host gravado por csinfo._fleet
+        value = value['report']
+    return _model.Report.from_dict(value or {})
+
+
+def _as_plain(value):
+    return value.as_dict() if isinstance(value, _model.Record) else value
+
+
+class Change(_model.Record):
+    """Uma alteração: kind é 'added', 'removed' ou 'changed'.
+
+    - section: campo do Report (ex.: 'software', 'memory_modules', 'os_version')
+    - key: chave do item (tupla de strings) ou None para campos simples
+    - old/new: registro (dict) ou valor antes/depois
+    - fields: campos alterados ('changed' em listas)
+    """
+
+    __slots__ = ('section', 'kind', 'key', 'old', 'new', 'fields')
+
+    def describe(self):
+        """Linha legível da alteração (usada no CLI e na GUI)."""
+        label = LABELS.get(self.section, self.section)
+        if self.key is None:
+            return f"~ {label}: {_model.padrao(_show(self.old))} -> {_model.padrao(_show(self.new))}"
+        item = _show(self.new if self.kind == 'added' else self.old)
+        if self.kind == 'added':
+            return f"+ {label}: {item}"
+        if self.kind == 'removed':
+            return f"- {label}: {item}"
+        detalhes = ', '.join(f"{f}: {_model.padrao(self.old.get(f))} -> {_model.padrao(self.new.get(f))}" for f in self.fields)
+        return f"~ {label} {item}: {detalhes}"
+
+
+def _show(value):
+    if isinstance(value, dict):
+        return ' | '.join(str(v) for v in value.values() if v not in (None, ''))
+    return value
+
+
+class ChangeSet(object):
+    """Conjunto de alterações entre duas coletas (na ordem do relatório)."""
+
+    def __init__(self, changes, old_at=None, new_at=None):
+        self.changes = list(changes)
+        self.old_at = old_at
+        self.new_at = new_at
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def section(self, name):
+        return [c for c in self.changes if c.section == name]
+
+    def summary(self):
+        """{seção: {'added': n, 'removed': n, 'changed': n}} só com as seções alteradas."""
+        counts = {}
+        for change in self.changes:
+            por_tipo = counts.setdefault(change.section, {'added': 0, 'removed': 0, 'changed': 0})
+            por_tipo[change.kind] += 1
+        return counts
+
+    def lines(self):
+        if not self.changes:
+            return ["Nenhuma alteração"]
+        return [change.describe() for change in self.changes]
+
+    def as_dict(self):
+        return {
+            'old_at': self.old_at,
+            'new_at': self.new_at,
+            'summary': self.summary(),
+            'changes': [dict(c.as_dict(), key=list(c.key) if c.key is not None else None) for c in self.changes],
+        }
+
+
+def _index(items, key_fields):
+    """chave -> dict do registro; chaves repetidas ganham um contador (#2, #3...)."""
+    index = {}
+    for item in items:
+        data = _as_plain(item)
+        key = tuple(_norm(data.get(f), f) for f in key_fields)
+        if not any(key):
+            # sem chave (ex.: pente sem slot): o registro inteiro identifica o item
+            key = tuple(_norm(v) for v in data.values())
+        base, n = key, 1
+        while key in index:
+            n += 1
+            key = base + (f"#{n}",)
+        index[key] = data
+    return index
+
+
+def _diff_list(section, old_items, new_items, ignore):
+    key_fields = KEYS[section]
+    old_index = _index(old_items, key_fields)
+    new_index = _index(new_items, key_fields)
+    changes = []
+    for key, old in old_index.items():
+        new = new_index.get(key)
+        if new is None:
+            changes.append(Change(section, 'removed', key, old, None, ()))
+            continue
+        fields = tuple(f for f in old if f not in key_fields and f"{section}.{f}" not in ignore
+                       and _norm(old.get(f)) != _norm(new.get(f)))
+        if fields:
+            changes.append(Change(section, 'changed', key, old, new, fields))
+    for key, new in new_index.items():
+        if key not in old_index:
+            changes.append(Change(section, 'added', key, None, new, ()))
+    return changes
+
+
+def diff_reports(old, new, ignore=None):
+    """`ChangeSet` de `old` para `new` (Report, dict de `as_dict()` ou JSON por host da frota).
+
+    `ignore`: nomes de campos ('windows_update') ou de campos de registros
+    ('disks.free') a desconsiderar; None usa DEFAULT_IGNORE.
+    """
+    ignore = DEFAULT_IGNORE if ignore is None else frozenset(ignore)
+    old, new = _as_report(old), _as_report(new)
+    changes = []
+    for name in _model.Report.__slots__:
+        if name in ignore:
+            continue
+        if name in KEYS:
+            changes += _diff_list(name, getattr(old, name) or [], getattr(new, name) or [], ignore)
+        elif name == 'admins':
+            antes = {_norm(a): a for a in old.admins or []}
+            depois = {_norm(a): a for a in new.admins or []}
+            changes += [Change('admins', 'removed', (k,), v, None, ()) for k, v in antes.items() if k not in depois]
+            changes += [Change('admins', 'added', (k,), None, v, ()) for k, v in depois.items() if k not in antes]
+        elif name in SCALARS:
+            antes, depois = _as_plain(getattr(old, name)), _as_plain(getattr(new, name))
+            if _norm(antes) != _norm(depois):
+                changes.append(Change(name, 'changed', None, antes, depois, ()))
+    return ChangeSet(changes, _generated_at(old), _generated_at(new))
+
+
+def _generated_at(report):
+    return report.identification.generated_at if report.identification is not None else None
+
+
+def cli(argv=None):
+    """`python -m csinfo._diff antigo.json novo.json`: alterações entre duas coletas."""
+    parser = argparse.ArgumentParser(description='Alterações entre duas coletas (JSON por host da frota ou Report.as_dict()).')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--json', action='store_true', help='saída em JSON')
+    args = parser.parse_args(argv)
+    relatorios = []
+    for path in (args.old, args.new):
+        with open(path, 'r', encoding='utf-8') as fh:
+            relatorios.append(json.load(fh))
+    changes = diff_reports(*relatorios)
+    if args.json:
+        print(json.dumps(changes.as_dict(), ensure_ascii=False, indent=2, default=str))
+    else:
+        print('\n'.join(changes.lines()))
+    return 0 if not changes else 1
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
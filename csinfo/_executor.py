@@ -0,0 +1,189 @@
+"""Backends de execução dos comandos PowerShell dos getters.
+
+Todos os getters passam por `run_powershell`, que entrega a execução efetiva
+ao executor ativo:
+
+- `PowerShellExecutor`: o comportamento normal (pool de hosts, PSSessions,
+  variantes de autenticação, retries);
+- `RecordingExecutor`: delega a outro executor e grava cada chamada
+  (comando, alvo, saída, latência) em um arquivo de fixtures;
+- `ReplayExecutor`: responde a partir de um arquivo de fixtures, com
+  latência configurável, sem executar nada — permite rodar e medir `main()`
+  fora do Windows e simular muitos hosts a partir de uma única captura.
+
+O arquivo de fixtures é JSON Lines (compactado com gzip quando o nome termina
+em `.gz`), um registro por chamada:
+    {"target": "pc01", "command": "...", "output": "...", "latency": 0.42}
+
+Variáveis de ambiente (lidas por `get_executor` na primeira chamada):
+    CSINFO_EXECUTOR=record:<arquivo>    grava as chamadas reais
+    CSINFO_EXECUTOR=replay:<arquivo>    responde a partir das fixtures
+    CSINFO_REPLAY_LATENCY               'recorded' (latência gravada), segundos fixos ou 0 (padrão)
+"""
+import gzip
+import json
+import os
+import threading
+import time
+
+from ._batch import normalize_command, _target_key
+
+
+def _open(path, mode):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class FailedOutput(str):
+    """Saída de um comando que falhou (erro, timeout, host sem resposta).
+
+    É igual a '' para os getters; `reason` descreve a falha. O cache de
+    consultas da coleta não guarda estas saídas (ver csinfo._querycache).
+    """
+
+    def __new__(cls, reason=''):
+        obj = super(FailedOutput, cls).__new__(cls, '')
+        obj.reason = reason
+        return obj
+
+
+def load_fixtures(path):
+    """Lê um arquivo de fixtures e retorna a lista de registros."""
+    records = []
+    with _open(path, 'r') as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(rec, dict) and 'command' in rec:
+                records.append(rec)
+    return records
+
+
+class PowerShellExecutor(object):
+    """Execução real via PowerShell (ver `csinfo._impl._run_powershell`)."""
+
+    real = True
+
+    def run(self, cmd, computer_name=None, timeout=20, retries=2, initial_backoff=0.3, credential=None):
+        from . import _impl
+        return _impl._run_powershell(cmd, computer_name, timeout, retries, initial_backoff, credential)
+
+
+class RecordingExecutor(object):
+    """Delega a `inner` e grava (comando, alvo, saída, latência) em `path`."""
+
+    def __init__(self, path, inner=None):
+        self.path = path
+        self.inner = inner or PowerShellExecutor()
+        self.real = getattr(self.inner, 'real', True)
+        self._lock = threading.Lock()
+
+    def run(self, cmd, computer_name=None, timeout=20, retries=2, initial_backoff=0.3, credential=None):
+        start = time.perf_counter()
+        out = self.inner.run(cmd, computer_name, timeout, retries, initial_backoff, credential)
+        rec = {
+            'target': _target_key(computer_name),
+            'command': normalize_command(cmd),
+            'output': out,
+            'latency': round(time.perf_counter() - start, 4),
+            'ts': time.time(),
+        }
+        line = json.dumps(rec, ensure_ascii=False) + '\n'
+        with self._lock:
+            try:
+                with _open(self.path, 'a') as fh:
+                    fh.write(line)
+            except Exception:
+                pass
+        return out
+
+
+class ReplayExecutor(object):
+    """Serve as saídas gravadas em um arquivo de fixtures.
+
+    - latency: None/0 (instantâneo), 'recorded' (latência gravada × `scale`)
+      ou um número fixo de segundos por comando
+    - any_host: sem fixture para o alvo pedido, usar a do mesmo comando
+      gravada para qualquer outro host (simulação de frota)
+    - missing: saída devolvida para comandos sem fixture
+    """
+
+    real = False
+
+    def __init__(self, path=None, records=None, latency=None, scale=1.0, any_host=True, missing=''):
+        self.latency = latency
+        self.scale = scale
+        self.any_host = any_host
+        self.missing = missing
+        self.misses = 0
+        self._by_target = {}
+        self._by_command = {}
+        for rec in (records if records is not None else load_fixtures(path)):
+            command = normalize_command(rec.get('command', ''))
+            target = _target_key(rec.get('target'))
+            entry = (rec.get('output') or '', float(rec.get('latency') or 0.0))
+            self._by_target[(target, command)] = entry
+            self._by_command.setdefault(command, entry)
+
+    def _delay(self, recorded):
+        if self.latency == 'recorded':
+            return recorded * self.scale
+        try:
+            return float(self.latency or 0)
+        except Exception:
+            return 0.0
+
+    def run(self, cmd, computer_name=None, timeout=20, retries=2, initial_backoff=0.3, credential=None):
+        command = normalize_command(cmd)
+        entry = self._by_target.get((_target_key(computer_name), command))
+        if entry is None and self.any_host:
+            entry = self._by_command.get(command)
+        if entry is None:
+            self.misses += 1
+            return self.missing
+        output, recorded = entry
+        delay = self._delay(recorded)
+        if delay > 0:
+            time.sleep(delay)
+        return output
+
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _from_env():
+    spec = os.environ.get('CSINFO_EXECUTOR', '').strip()
+    kind, _sep, path = spec.partition(':')
+    if kind == 'record' and path:
+        return RecordingExecutor(path)
+    if kind == 'replay' and path:
+        latency = os.environ.get('CSINFO_REPLAY_LATENCY') or None
+        return ReplayExecutor(path, latency=latency)
+    return PowerShellExecutor()
+
+
+def get_executor():
+    """Executor ativo do processo (configurado por `set_executor` ou CSINFO_EXECUTOR)."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = _from_env()
+        return _EXECUTOR
+
+
+def set_executor(executor):
+    """Define o executor ativo; None volta ao padrão (CSINFO_EXECUTOR ou PowerShell).
+
+    Retorna o executor anterior.
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        previous, _EXECUTOR = _EXECUTOR, executor
+    return previous
@@ -0,0 +1,361 @@
+"""Coleta de uma frota de máquinas em paralelo.
+
+`main()` coleta um único `computer_name` por vez; aqui uma lista de hosts (ou
+o arquivo de máquinas da GUI, `machines_history.json`) é coletada com
+concorrência limitada em dois níveis:
+
+- max_hosts: quantos hosts são coletados ao mesmo tempo (global);
+- workers: quantos getters rodam em paralelo dentro de cada host (ver
+  csinfo._dag; None usa CSINFO_WORKERS_REMOTE/LOCAL).
+
+Cada host roda em sua própria thread. Um host lento nunca segura os demais:
+hosts inacessíveis falham rápido na verificação prévia (que também alimenta o
+circuit breaker, ver csinfo._breaker) e, com `host_timeout`, um host que
+passar do limite é dado como falho e a sua coleta é cancelada: os getters
+seguintes não rodam e nada é gravado (relatórios, JSON, inventário). A vaga
+só passa ao próximo da fila quando a thread do host termina o comando em
+andamento, para `max_hosts` continuar valendo.
+
+Para cada host são gravados em `output_dir` o TXT/PDF de `main()` e um JSON
+com as linhas coletadas; ao final, `fleet_summary.json` resume sucessos,
+falhas e durações.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from . import _state
+
+_SUMMARY_NAME = 'fleet_summary.json'
+
+
+def _entry(item):
+    """Normaliza um item da lista para {'name': ..., 'alias': ...}."""
+    if isinstance(item, dict):
+        name = str(item.get('name') or item.get('host') or '').strip()
+        alias = str(item.get('alias') or '').strip() or None
+    else:
+        name, _sep, alias = str(item or '').strip().partition(',')
+        name, alias = name.strip(), (alias.strip() or None)
+    return {'name': name, 'alias': alias} if name else None
+
+
+def load_hosts(source):
+    """Lê a lista de hosts.
+
+    `source` pode ser uma lista (nomes ou dicts {'name', 'alias'}), o JSON de
+    máquinas da GUI ({'machines': [...]} ou lista) ou um arquivo texto com um
+    host por linha (opcionalmente `host,apelido`; linhas com # são ignoradas).
+    Hosts repetidos são coletados uma única vez.
+    """
+    if isinstance(source, (list, tuple)):
+        items = list(source)
+    else:
+        with open(source, 'r', encoding='utf-8') as fh:
+            text = fh.read()
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            items = data.get('machines') if isinstance(data.get('machines'), list) else []
+        elif isinstance(data, list):
+            items = data
+        else:
+            items = [ln for ln in text.splitlines() if ln.strip() and not ln.strip().startswith('#')]
+    hosts = []
+    seen = set()
+    for item in items:
+        entry = _entry(item)
+        if entry is None or entry['name'].lower() in seen:
+            continue
+        seen.add(entry['name'].lower())
+        hosts.append(entry)
+    return hosts
+
+
+class HostResult(object):
+    """Resultado da coleta de um host."""
+
+    def __init__(self, host, alias=None):
+        self.host = host
+        self.alias = alias
+        self.status = 'pendente'     # pendente, coletando, ok, falha
+        self.error = None
+        self.circuit_open = None     # motivo, se o circuito do host abriu durante a coleta
+        self.started = None
+        self.finished = None
+        self.percent = 0
+        self.stage = ''
+        self.txt = None
+        self.pdf = None
+        self.json = None
+
+    @property
+    def ok(self):
+        return self.status == 'ok'
+
+    @property
+    def duration(self):
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+    def as_dict(self):
+        return {
+            'host': self.host,
+            'alias': self.alias,
+            'status': self.status,
+            'error': self.error,
+            'circuit_open': self.circuit_open,
+            'duration': round(self.duration, 2) if self.duration is not None else None,
+            'txt': self.txt,
+            'pdf': self.pdf,
+            'json': self.json,
+        }
+
+
+class FleetRun(object):
+    """Coleta de vários hosts com concorrência limitada.
+
+    - export_type: 'txt', 'pdf', 'ambos' ou 'nenhum' (só o JSON por host)
+    - max_hosts: hosts coletados simultaneamente
+    - workers: getters em paralelo por host (repassado a `main()`)
+    - host_timeout: segundos até um host ser dado como falho (None = sem limite)
+    - precheck: verificar acessibilidade (ping e portas, ver csinfo._probe) antes de coletar
+    - store: inventário SQLite onde cada coleta é gravada (caminho ou
+      `InventoryStore`, ver csinfo._store); None usa CSINFO_STORE
+    - delta: recoletar só as seções que mudaram desde a última coleta de
+      cada host (ver csinfo._delta); None usa CSINFO_DELTA
+    - archive: arquivo deduplicado onde cada coleta é guardada (caminho ou
+      `SnapshotArchive`, ver csinfo._archive); None usa CSINFO_ARCHIVE
+    - progress: `progress(resultado, percentual_geral)` a cada mudança de
+      progresso de qualquer host; chamado de várias threads
+    """
+
+    def __init__(self, hosts, output_dir=None, export_type='ambos', max_hosts=8, workers=None,
+                 host_timeout=None, precheck=True, force_refresh=None, progress=None, store=None, delta=None, archive=None):
+        self.hosts = load_hosts(hosts)
+        self.output_dir = output_dir or os.getcwd()
+        self.export_type = export_type
+        self.max_hosts = max(1, int(max_hosts or 1))
+        self.workers = workers
+        self.host_timeout = host_timeout
+        self.precheck = precheck
+        self.force_refresh = force_refresh
+        self.progress = progress
+        self.store = store
+        self.delta = delta
+        self.archive = archive
+        self.results = [HostResult(h['name'], h['alias']) for h in self.hosts]
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._busy = 0      # threads de coleta vivas, inclusive as de hosts com tempo esgotado
+
+    def overall_percent(self):
+        if not self.results:
+            return 100
+        total = sum(100 if r.status in ('ok', 'falha') else r.percent for r in self.results)
+        return int(total / len(self.results))
+
+    def _notify(self, result):
+        if self.progress is None:
+            return
+        try:
+            self.progress(result, self.overall_percent())
+        except Exception:
+            pass
+
+    def _collect(self, result, cancel):
+        from . import _dag, _impl
+        if self.precheck and not _impl.check_remote_machine(result.host):
+            raise RuntimeError('host inacessível (ping e portas 5985/5986/445)')
+
+        def barra_callback(percent_or_none, line_or_stage):
+            if percent_or_none is None or result.status != 'coletando':
+                return
+            try:
+                result.percent = int(percent_or_none)
+            except Exception:
+                return
+            result.stage = str(line_or_stage)
+            self._notify(result)
+
+        export_type = self.export_type if self.export_type in ('txt', 'pdf', 'ambos') else 'nenhum'
+        dados = _impl.main(export_type=export_type, barra_callback=barra_callback,
+                           computer_name=result.host, machine_alias=result.alias,
+                           workers=self.workers, force_refresh=self.force_refresh,
+                           output_dir=self.output_dir, store=self.store, delta=self.delta, archive=self.archive,
+                           cancel=cancel)
+        if cancel.is_set():
+            raise _dag.CollectionCancelled()
+        json_path = os.path.join(self.output_dir, self._base_name(result) + '.json')
+        _state.save_json(json_path, {
+            'host': result.host,
+            'alias': result.alias,
+            'machine': dados.get('machine'),
+            'user': dados.get('user'),
+            'collected_at': datetime.now().isoformat(timespec='seconds'),
+            'lines': dados.get('lines') or [],
+            'report': dados['report'].as_dict() if dados.get('report') is not None else None,
+        })
+        return dados, json_path
+
+    def _base_name(self, result):
+        from . import _impl
+        safe_name = _impl.safe_filename(result.host)
+        if result.alias:
+            return f"Info_maquina_{_impl.safe_filename(result.alias)}_{safe_name}"
+        return f"Info_maquina_{safe_name}"
+
+    def _worker(self, result, cancel):
+        dados = json_path = None
+        error = None
+        try:
+            dados, json_path = self._collect(result, cancel)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        with self._lock:
+            self._busy -= 1
+            # host já dado como falho por tempo esgotado: só liberar a vaga
+            if result.status != 'coletando':
+                self._done.notify_all()
+                return
+            result.finished = time.time()
+            if error is None:
+                result.txt = dados.get('txt')
+                result.pdf = dados.get('pdf')
+                result.json = json_path if os.path.exists(json_path) else None
+                result.circuit_open = dados.get('circuit_open')
+                if result.circuit_open:
+                    # relatório gerado, mas com as seções recusadas pelo circuito vazias
+                    result.status = 'falha'
+                    result.error = f'circuito aberto: {result.circuit_open}'
+                else:
+                    result.status = 'ok'
+            else:
+                result.status = 'falha'
+                result.error = error
+            # avisar antes de liberar `run()`, para o aviso final não chegar depois do resumo
+            self._notify(result)
+            self._done.notify_all()
+
+    def run(self):
+        """Coleta todos os hosts e retorna o resumo (ver `summary()`)."""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+        except Exception:
+            pass
+        self.started = time.time()
+        pending = list(self.results)
+        running = {}        # resultado -> evento de cancelamento
+        with self._lock:
+            while pending or running:
+                # hosts com tempo esgotado ocupam a vaga até a thread terminar
+                while pending and self._busy < self.max_hosts:
+                    result = pending.pop(0)
+                    result.status = 'coletando'
+                    result.started = time.time()
+                    running[result] = cancel = threading.Event()
+                    self._busy += 1
+                    threading.Thread(target=self._worker, args=(result, cancel), name=f"csinfo-fleet-{result.host}", daemon=True).start()
+                self._done.wait(self._wait_interval(running))
+                now = time.time()
+                for result, cancel in list(running.items()):
+                    if result.status == 'coletando' and self.host_timeout and now - result.started >= self.host_timeout:
+                        result.status = 'falha'
+                        result.finished = now
+                        result.error = f'tempo esgotado ({self.host_timeout:g}s)'
+                        cancel.set()
+                    if result.status != 'coletando':
+                        del running[result]
+        self.finished = time.time()
+        summary = self.summary()
+        _state.save_json(os.path.join(self.output_dir, _SUMMARY_NAME), summary)
+        return summary
+
+    def _wait_interval(self, running):
+        if not self.host_timeout or not running:
+            return None
+        now = time.time()
+        return max(0.05, min(self.host_timeout - (now - r.started) for r in running))
+
+    def summary(self):
+        hosts = [r.as_dict() for r in self.results]
+        durations = [h['duration'] for h in hosts if h['duration'] is not None]
+        return {
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds') if self.started else None,
+            'duration': round((self.finished or time.time()) - self.started, 2) if self.started else None,
+            'total': len(hosts),
+            'ok': sum(1 for h in hosts if h['status'] == 'ok'),
+            'failed': sum(1 for h in hosts if h['status'] == 'falha'),
+            'circuit_open': sum(1 for h in hosts if h['circuit_open']),
+            'slowest': sorted((h for h in hosts if h['duration'] is not None), key=lambda h: -h['duration'])[:5],
+            'mean_duration': round(sum(durations) / len(durations), 2) if durations else None,
+            'hosts': hosts,
+        }
+
+
+def collect_fleet(hosts, output_dir=None, export_type='ambos', max_hosts=8, workers=None,
+                  host_timeout=None, precheck=True, force_refresh=None, progress=None, store=None, delta=None, archive=None):
+    """Atalho para `FleetRun(...).run()`; retorna o resumo."""
+    return FleetRun(hosts, output_dir=output_dir, export_type=export_type, max_hosts=max_hosts,
+                    workers=workers, host_timeout=host_timeout, precheck=precheck,
+                    force_refresh=force_refresh, progress=progress, store=store, delta=delta, archive=archive).run()
+
+
+def format_summary(summary):
+    """Resumo legível de `FleetRun.run()`."""
+    lines = [f"Hosts: {summary['total']} | OK: {summary['ok']} | Falhas: {summary['failed']} | "
+             f"Tempo total: {summary['duration']}s | Média por host: {summary['mean_duration']}s"]
+    for h in summary['hosts']:
+        if h['status'] != 'ok':
+            lines.append(f"  FALHA {h['host']}: {h['error']}")
+    if summary['slowest']:
+        lines.append('Mais lentos: ' + ', '.join(f"{h['host']} ({h['duration']}s)" for h in summary['slowest']))
+    return '\n'.join(lines)
+
+
+def cli(argv=None):
+    """Linha de comando: `python run_fleet.py hosts.txt -o saida -j 8`."""
+    parser = argparse.ArgumentParser(description='Coleta de inventário de várias máquinas em paralelo.')
+    parser.add_argument('hosts', nargs='+', help='arquivo com a lista de hosts (texto ou JSON de máquinas da GUI) ou nomes de host')
+    parser.add_argument('-o', '--output-dir', default=None, help='pasta dos relatórios (padrão: diretório atual)')
+    parser.add_argument('-e', '--export', default='ambos', choices=('txt', 'pdf', 'ambos', 'nenhum'), help='relatórios gerados por host além do JSON')
+    parser.add_argument('-j', '--max-hosts', type=int, default=8, help='hosts coletados ao mesmo tempo')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='getters em paralelo por host')
+    parser.add_argument('-t', '--timeout', type=float, default=None, help='tempo máximo por host, em segundos')
+    parser.add_argument('--no-precheck', action='store_true', help='não verificar acessibilidade antes de coletar')
+    parser.add_argument('--force-refresh', action='store_true', help='ignorar o cache de seções')
+    parser.add_argument('--delta', action='store_true', help='recoletar só as seções que mudaram desde a última coleta')
+    parser.add_argument('--store', default=None, help='gravar cada coleta neste inventário SQLite (ver csinfo-inventory)')
+    parser.add_argument('--archive', default=None, help='guardar cada coleta neste arquivo deduplicado (ver csinfo-archive)')
+    args = parser.parse_args(argv)
+
+    if len(args.hosts) == 1 and os.path.isfile(args.hosts[0]):
+        hosts = args.hosts[0]
+    else:
+        hosts = args.hosts
+
+    def progress(result, geral):
+        if result.status in ('ok', 'falha'):
+            detalhe = f"{result.duration:.1f}s" if result.ok else result.error
+            print(f"[{geral:3d}%] {result.host}: {result.status} ({detalhe})", flush=True)
+
+    summary = collect_fleet(hosts, output_dir=args.output_dir, export_type=args.export,
+                            max_hosts=args.max_hosts, workers=args.workers, host_timeout=args.timeout,
+                            precheck=not args.no_precheck, force_refresh=True if args.force_refresh else None,
+                            progress=progress, store=args.store, delta=True if args.delta else None,
+                            archive=args.archive)
+    print(format_summary(summary))
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
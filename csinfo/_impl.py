@@ -256,17 +256,29 @@ import platform
 import os
 import re
 import sys
-import winreg
+try:
+    import winreg
+except ImportError:
+    # fora do Windows (ex.: replay de fixtures em CI) o registro local não existe
+    winreg = None
 from datetime import datetime
 import time
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfutils
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
+import functools
+from . import _pshost
+from . import _batch
+from . import _psession
+from . import _negotiation
+from . import _breaker
+from . import _dag
+from . import _querycache
+from . import _sectioncache
+from . import _delta
+from . import _winupdate
+from . import _executor
+from . import _model
+from . import _pdfassets
+# reportlab (PDF) e _probe (asyncio) são importados só quando usados, para
+# que `import csinfo` e a exportação TXT não paguem por eles
 
 # --- Helpers para criação de títulos e índice com anchors/links internos ---
 def criar_titulo_pdf(secao, styles=None):
@@ -278,6 +290,9 @@ def criar_titulo_pdf(secao, styles=None):
 
     Isso cria internamente: <a name='INFORMAÇÕES DO SISTEMA'/>INFORMAÇÕES DO SISTEMA
     """
+    from reportlab.platypus import Paragraph
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
     try:
         if styles is None:
             styles = getSampleStyleSheet()
@@ -305,6 +320,9 @@ def criar_indice_pdf(itens, styles=None, indice_style_name='IndiceStyle'):
     Cada item será renderizado como um link interno para o anchor com o mesmo nome.
     Exemplo de tag usado: <a href='#INFORMAÇÕES DO SISTEMA'>INFORMAÇÕES DO SISTEMA</a>
     """
+    from reportlab.platypus import Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
     try:
         if styles is None:
             styles = getSampleStyleSheet()
@@ -323,13 +341,17 @@ def criar_indice_pdf(itens, styles=None, indice_style_name='IndiceStyle'):
         return [Paragraph(i, sheet['Normal']) for i in itens]
 
 
-def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backoff=0.3, credential=None):
-    """Execute um comando PowerShell com retries/backoff e timeout configurável.
+def _record_breaker_failure(breaker, computer_name, exc):
+    """Conta uma falha de conexão no breaker e avisa quando o circuito abre."""
+    opened = breaker.record_failure(computer_name, _breaker.describe_failure(exc))
+    if opened:
+        print(f"csinfo: {computer_name} não responde ({breaker.reason(computer_name)}); "
+              f"demais comandos para este host falharão imediatamente por {breaker.cooldown:g}s.", file=sys.stderr)
+    return opened
 
-    - timeout: segundos por tentativa (pode ser sobrescrito pela variável de ambiente CSINFO_PS_TIMEOUT)
-    - retries: número de tentativas totais (inclui a primeira)
-    - initial_backoff: tempo inicial em segundos para backoff exponencial
-    """
+
+def _normalize_ps_args(computer_name, timeout):
+    """Aplica CSINFO_PS_TIMEOUT e a compatibilidade com o antigo argumento posicional."""
     # permitir override global via env
     try:
         env_to = int(os.environ.get('CSINFO_PS_TIMEOUT', str(timeout)))
@@ -342,7 +364,15 @@ def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backo
         # recebido um número como segundo argumento -> isso na verdade era timeout; ajustar
         timeout = computer_name
         computer_name = None
+    return computer_name, timeout
 
+
+def _prepare_remote_variants(cmd, computer_name, credential):
+    """Resolve a credencial e as variantes remotas (nome, comando) para `cmd`.
+
+    Retorna (credential, remote_variants, negotiation, negotiation_user);
+    remote_variants é None para alvos locais.
+    """
     # guardar comando original para possíveis re-execucoes
     original_cmd = cmd
 
@@ -373,8 +403,10 @@ def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backo
         except Exception:
             is_local = False
 
-    # Construir variantes de comando remoto (serão tentadas ciclicamente nas tentativas)
+    # Construir variantes de comando remoto (nome, comando), tentadas uma por tentativa
     remote_variants = None
+    negotiation = None
+    negotiation_user = _negotiation.credential_user(credential)
     if computer_name and not is_local:
         remote_variants = []
         if credential and isinstance(credential, (list, tuple)) and len(credential) == 2:
@@ -383,21 +415,25 @@ def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backo
             user_esc = str(user).replace("'", "''")
             pwd_esc = str(pwd).replace("'", "''")
             # 1) Tentar Negotiate (NTLM/Kerberos negotiable)
-            remote_variants.append(
+            remote_variants.append(('negotiate',
                 f"$sec = ConvertTo-SecureString '{pwd_esc}' -AsPlainText -Force; $cred = New-Object System.Management.Automation.PSCredential('{user_esc}',$sec); Invoke-Command -ComputerName {computer_name} -Credential $cred -Authentication Negotiate -ScriptBlock {{ {original_cmd} }} -ErrorAction Stop"
-            )
+            ))
             # 2) Tentar padrão com credencial (sem explicit Authentication)
-            remote_variants.append(
+            remote_variants.append(('default',
                 f"$sec = ConvertTo-SecureString '{pwd_esc}' -AsPlainText -Force; $cred = New-Object System.Management.Automation.PSCredential('{user_esc}',$sec); Invoke-Command -ComputerName {computer_name} -Credential $cred -ScriptBlock {{ {original_cmd} }} -ErrorAction Stop"
-            )
+            ))
             # 3) Tentar via SSL (se configurado)
-            remote_variants.append(
+            remote_variants.append(('negotiate_ssl',
                 f"$sec = ConvertTo-SecureString '{pwd_esc}' -AsPlainText -Force; $cred = New-Object System.Management.Automation.PSCredential('{user_esc}',$sec); Invoke-Command -ComputerName {computer_name} -Credential $cred -Authentication Negotiate -UseSSL -ScriptBlock {{ {original_cmd} }} -ErrorAction Stop"
-            )
+            ))
         else:
             # Sem credenciais: tentar Negotiate e padrão
-            remote_variants.append(f"Invoke-Command -ComputerName {computer_name} -ScriptBlock {{ {original_cmd} }} -Authentication Negotiate -ErrorAction Stop")
-            remote_variants.append(f"Invoke-Command -ComputerName {computer_name} -ScriptBlock {{ {original_cmd} }} -ErrorAction Stop")
+            remote_variants.append(('negotiate', f"Invoke-Command -ComputerName {computer_name} -ScriptBlock {{ {original_cmd} }} -Authentication Negotiate -ErrorAction Stop"))
+            remote_variants.append(('default', f"Invoke-Command -ComputerName {computer_name} -ScriptBlock {{ {original_cmd} }} -ErrorAction Stop"))
+        # começar pela variante que já funcionou neste host (cache persistente)
+        negotiation = _negotiation.get_default_cache()
+        if negotiation is not None:
+            remote_variants = negotiation.order(computer_name, negotiation_user, remote_variants)
 
     # Forçar codificação UTF-8 no PowerShell
     # Note: se remote_variants estiver definido, iremos selecionar uma variante com base na tentativa atual
@@ -408,11 +444,13 @@ def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backo
             credential = globals().get('_CSINFO_DEFAULT_CREDENTIAL')
     except Exception:
         pass
+    return credential, remote_variants, negotiation, negotiation_user
 
-    # preparar arquivo de sessão (único por execução) quando CSINFO_DEBUG habilitado
-    debug_enabled = bool(os.environ.get('CSINFO_DEBUG'))
+
+def _debug_session_log():
+    """Arquivo de sessão de debug (único por execução) quando CSINFO_DEBUG habilitado."""
     session_log = None
-    if debug_enabled:
+    if os.environ.get('CSINFO_DEBUG'):
         # se o usuário passou um caminho customizado para o log de sessão via env, usar
         session_log = os.environ.get('CSINFO_DEBUG_SESSION')
         if not session_log:
@@ -424,46 +462,100 @@ def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backo
                 session_log = run_powershell._csinfo_session_log
             except Exception:
                 session_log = os.path.join(tempfile.gettempdir(), f"csinfo_debug_session_{os.getpid()}_{int(time.time())}.log")
+    return session_log
 
-    def _write_debug_entry(full_cmd, computer, to, dur=None, return_code=None, output=None, exc=None):
-        """Escreve uma entrada de debug no arquivo de sessão (append) e opcionalmente cria um arquivo individual."""
-        try:
-            header = "--- CSInfo debug entry ---\n"
-            ts = datetime.utcnow().isoformat() + 'Z'
-            lines = [header, f"TIMESTAMP_UTC: {ts}\n", f"COMMAND: {full_cmd}\n", f"COMPUTER: {computer}\n", f"TIMEOUT: {to}\n"]
-            if dur is not None:
-                lines.append(f"DURATION_SECONDS: {dur}\n")
-            if return_code is not None:
-                lines.append(f"RETURN_CODE: {return_code}\n")
-            if exc is not None:
-                lines.append(f"EXCEPTION: {exc}\n")
-            lines.append("OUTPUT:\n")
-            if output:
-                try:
-                    lines.append(output)
-                    if not output.endswith('\n'):
-                        lines.append('\n')
-                except Exception:
-                    lines.append(str(output) + '\n')
 
-            # anexar ao arquivo de sessão
-            if session_log:
-                try:
-                    with open(session_log, 'a', encoding='utf-8', errors='replace') as sfh:
-                        sfh.writelines(lines)
-                except Exception:
-                    pass
+def _write_ps_debug_entry(session_log, full_cmd, computer, to, dur=None, return_code=None, output=None, exc=None):
+    """Escreve uma entrada de debug no arquivo de sessão (append) e opcionalmente cria um arquivo individual."""
+    try:
+        header = "--- CSInfo debug entry ---\n"
+        ts = datetime.utcnow().isoformat() + 'Z'
+        lines = [header, f"TIMESTAMP_UTC: {ts}\n", f"COMMAND: {full_cmd}\n", f"COMPUTER: {computer}\n", f"TIMEOUT: {to}\n"]
+        if dur is not None:
+            lines.append(f"DURATION_SECONDS: {dur}\n")
+        if return_code is not None:
+            lines.append(f"RETURN_CODE: {return_code}\n")
+        if exc is not None:
+            lines.append(f"EXCEPTION: {exc}\n")
+        lines.append("OUTPUT:\n")
+        if output:
+            try:
+                lines.append(output)
+                if not output.endswith('\n'):
+                    lines.append('\n')
+            except Exception:
+                lines.append(str(output) + '\n')
+
+        # anexar ao arquivo de sessão
+        if session_log:
+            try:
+                with open(session_log, 'a', encoding='utf-8', errors='replace') as sfh:
+                    sfh.writelines(lines)
+            except Exception:
+                pass
+
+        # opcional: manter também arquivos individuais (útil para ferramentas que já esperam esse padrão)
+        if os.environ.get('CSINFO_DEBUG_INDIVIDUAL') == '1':
+            try:
+                indiv = os.path.join(tempfile.gettempdir(), f"csinfo_debug_{os.getpid()}_{int(time.time())}.log")
+                with open(indiv, 'w', encoding='utf-8') as fh:
+                    fh.writelines(lines)
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+
+def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backoff=0.3, credential=None):
+    """Execute um comando PowerShell com retries/backoff e timeout configurável.
+
+    - timeout: segundos por tentativa (pode ser sobrescrito pela variável de ambiente CSINFO_PS_TIMEOUT)
+    - retries: número de tentativas totais (inclui a primeira)
+    - initial_backoff: tempo inicial em segundos para backoff exponencial
+    """
+    computer_name, timeout = _normalize_ps_args(computer_name, timeout)
+
+    # coleta em lote (main(batch=True)): durante a captura apenas registra o
+    # comando; com um plano ativo devolve a fatia já obtida pelo script combinado
+    batched = _batch.lookup(cmd, computer_name, timeout)
+    if batched is not None:
+        return batched
+
+    # execução efetiva pelo executor ativo (PowerShell real, gravação ou replay)
+    executor = _executor.get_executor()
+    run = lambda: executor.run(cmd, computer_name, timeout, retries, initial_backoff, credential)
+
+    # durante uma coleta, cada comando é executado uma única vez por alvo
+    cache = _querycache.active(computer_name)
+    if cache is not None:
+        return cache.fetch(cmd, run)
+    return run()
+
+
+def _run_powershell(cmd, computer_name, timeout, retries, initial_backoff, credential):
+    """Execução efetiva de run_powershell (argumentos já normalizados)."""
+    original_cmd = cmd
+    credential, remote_variants, negotiation, negotiation_user = _prepare_remote_variants(cmd, computer_name, credential)
+
+    debug_enabled = bool(os.environ.get('CSINFO_DEBUG'))
+    session_log = _debug_session_log() if debug_enabled else None
+
+    def _write_debug_entry(full_cmd, computer, to, dur=None, return_code=None, output=None, exc=None):
+        _write_ps_debug_entry(session_log, full_cmd, computer, to, dur=dur, return_code=return_code, output=output, exc=exc)
 
-            # opcional: manter também arquivos individuais (útil para ferramentas que já esperam esse padrão)
-            if os.environ.get('CSINFO_DEBUG_INDIVIDUAL') == '1':
+    # Circuit breaker por host: com o circuito aberto (host inacessível / WinRM
+    # fora do ar) a chamada falha imediatamente em vez de esperar o timeout.
+    breaker = _breaker.get_default_breaker() if remote_variants else None
+    if breaker is not None:
+        try:
+            breaker.before_call(computer_name)
+        except _breaker.CircuitOpenError as exc:
+            if debug_enabled:
                 try:
-                    indiv = os.path.join(tempfile.gettempdir(), f"csinfo_debug_{os.getpid()}_{int(time.time())}.log")
-                    with open(indiv, 'w', encoding='utf-8') as fh:
-                        fh.writelines(lines)
+                    _write_debug_entry(['powershell', '-Command', cmd], computer_name, timeout, exc=exc)
                 except Exception:
                     pass
-        except Exception:
-            pass
+            return _breaker.CircuitOpenOutput(computer_name, exc.reason)
 
     attempt = 0
     backoff = initial_backoff
@@ -471,29 +563,61 @@ def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backo
     while attempt < retries:
         attempt += 1
         ts = time.time()
+        used_variant = None
         try:
-            # selecionar comando: se houver variantes remotas, usar uma variante baseada na tentativa atual
-            if remote_variants:
-                idx = min(len(remote_variants)-1, attempt-1)
-                sel_cmd = remote_variants[idx]
-            else:
-                sel_cmd = cmd
+            out = None
+            # Alvo remoto: reutilizar a PSSession persistente do host (um único
+            # handshake de autenticação por alvo). Sem host PowerShell local
+            # disponível, ou se a sessão não abre (falha lembrada por host, ver
+            # csinfo._psession), seguir com o Invoke-Command por comando abaixo.
+            sessions = _psession.get_default_cache() if remote_variants else None
+            if sessions is not None:
+                full = ['Invoke-Command', '-Session', str(computer_name), '-ScriptBlock', original_cmd]
+                try:
+                    rc, sess_out = sessions.run(computer_name, original_cmd, credential=credential, timeout=timeout)
+                    if rc != 0:
+                        raise subprocess.CalledProcessError(rc, full, output=sess_out)
+                    out = sess_out
+                except (_pshost.PowerShellHostError, _psession.RemoteSessionError):
+                    out = None
+
+            if out is None:
+                # selecionar comando: se houver variantes remotas, usar uma variante baseada na tentativa atual
+                if remote_variants:
+                    idx = min(len(remote_variants)-1, attempt-1)
+                    used_variant, sel_cmd = remote_variants[idx]
+                else:
+                    sel_cmd = cmd
 
-            cmd_with_encoding = f"[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; {sel_cmd}"
-            full = ['powershell', '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass', '-Command', cmd_with_encoding]
+                cmd_with_encoding = f"[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; {sel_cmd}"
+                full = ['powershell', '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass', '-Command', cmd_with_encoding]
 
-            if os.name == 'nt':
-                creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000)
-                raw = subprocess.check_output(full, stderr=subprocess.STDOUT, text=False, timeout=timeout, creationflags=creationflags)
-            else:
-                raw = subprocess.check_output(full, stderr=subprocess.STDOUT, text=False, timeout=timeout)
-            try:
-                out = raw.decode('utf-8', errors='replace')
-            except Exception:
-                try:
-                    out = str(raw)
-                except Exception:
-                    out = ''
+                # Preferir um host PowerShell persistente do pool (evita iniciar um
+                # powershell.exe por comando); se o pool estiver indisponível ou o
+                # host falhar, recorrer ao processo avulso tradicional.
+                pool = _pshost.get_default_pool()
+                if pool is not None:
+                    try:
+                        rc, pooled_out = pool.run(cmd_with_encoding, timeout=timeout)
+                        if rc != 0:
+                            raise subprocess.CalledProcessError(rc, full, output=pooled_out)
+                        out = pooled_out
+                    except _pshost.PowerShellHostError:
+                        out = None
+
+                if out is None:
+                    if os.name == 'nt':
+                        creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000)
+                        raw = subprocess.check_output(full, stderr=subprocess.STDOUT, text=False, timeout=timeout, creationflags=creationflags)
+                    else:
+                        raw = subprocess.check_output(full, stderr=subprocess.STDOUT, text=False, timeout=timeout)
+                    try:
+                        out = raw.decode('utf-8', errors='replace')
+                    except Exception:
+                        try:
+                            out = str(raw)
+                        except Exception:
+                            out = ''
             duration = time.time() - ts
             # debug
             if debug_enabled:
@@ -501,32 +625,60 @@ def run_powershell(cmd, computer_name=None, timeout=20, retries=2, initial_backo
                     _write_debug_entry(full, computer_name, timeout, dur=duration, return_code=0, output=out)
                 except Exception:
                     pass
+            if used_variant and negotiation is not None:
+                negotiation.record_success(computer_name, negotiation_user, used_variant)
+            if breaker is not None:
+                breaker.record_success(computer_name)
             return out.strip()
         except subprocess.CalledProcessError as cpe:
             last_exc = cpe
+            # erro do próprio comando não diz nada sobre a variante de autenticação
+            if used_variant and negotiation is not None and _breaker.is_connection_failure(cpe):
+                negotiation.record_failure(computer_name, negotiation_user, used_variant)
+            if breaker is not None:
+                if _breaker.is_connection_failure(cpe):
+                    _record_breaker_failure(breaker, computer_name, cpe)
+                else:
+                    # o host respondeu (erro do próprio comando)
+                    breaker.record_success(computer_name)
             # gravar debug e sair (erro do comando)
             if debug_enabled:
                 try:
                     _write_debug_entry(full, computer_name, timeout, dur=(time.time()-ts), return_code=getattr(cpe, 'returncode', 'ERR'), output=getattr(cpe, 'output', ''))
                 except Exception:
                     pass
+            # autenticação recusada nesta variante: seguir para a próxima, sem
+            # espera, mesmo que as tentativas pedidas já tenham acabado
+            if (used_variant and _breaker.is_connection_failure(cpe) and idx < len(remote_variants) - 1
+                    and (breaker is None or breaker.state(computer_name) != _breaker.OPEN)):
+                retries = max(retries, attempt + 1)
+                continue
             # não retryar em caso de erro específico de execução (mas permitiremos retry em timeout)
             break
         except Exception as exc:
             last_exc = exc
+            if used_variant and negotiation is not None and _breaker.is_connection_failure(exc):
+                negotiation.record_failure(computer_name, negotiation_user, used_variant)
             # se não for a última tentativa, esperar e retryar
             if debug_enabled:
                 try:
                     _write_debug_entry(full, computer_name, timeout, dur=(time.time()-ts), exc=exc)
                 except Exception:
                     pass
+            if breaker is not None and _breaker.is_connection_failure(exc):
+                # circuito aberto: não insistir nas tentativas restantes
+                _record_breaker_failure(breaker, computer_name, exc)
+                if breaker.state(computer_name) == _breaker.OPEN:
+                    break
             if attempt < retries:
                 time.sleep(backoff)
                 backoff *= 2
                 continue
             break
 
-    return ""
+    if breaker is not None and breaker.state(computer_name) == _breaker.OPEN:
+        return _breaker.CircuitOpenOutput(computer_name, breaker.reason(computer_name))
+    return _executor.FailedOutput(_breaker.describe_failure(last_exc) if last_exc is not None else '')
 
     # Se falhou e estamos executando remotamente sem credencial, oferecer prompt interativo (uma vez)
     # Observação: isso só ocorre se não passamos credential explicitamente
@@ -571,9 +723,12 @@ def get_os_version(computer_name=None):
         return result
     return "NÃO OBTIDO"
 
+# Consulta única de Win32_ComputerSystem compartilhada por get_memory_info e
+# is_domain_computer (o cache da coleta executa-a uma vez por alvo)
+_COMPUTER_SYSTEM_QUERY = "(Get-CimInstance Win32_ComputerSystem | Select-Object -Property TotalPhysicalMemory,PartOfDomain,Domain,Workgroup | ConvertTo-Json -Compress)"
+
 def get_memory_info(computer_name=None):
-    cmd = "(Get-CimInstance Win32_ComputerSystem | Select-Object -Property TotalPhysicalMemory | ConvertTo-Json -Compress)"
-    out = run_powershell(cmd, computer_name=computer_name)
+    out = run_powershell(_COMPUTER_SYSTEM_QUERY, computer_name=computer_name)
     try:
         m_memory = re.search(r'"TotalPhysicalMemory"\s*:\s*(\d+)', out)
         if m_memory:
@@ -802,17 +957,13 @@ def get_office_activation_status(computer_name=None):
 
 def is_domain_computer(computer_name=None):
     try:
-        ps_command = '''
-        $computer = Get-CimInstance -ClassName Win32_ComputerSystem
-        if ($computer.PartOfDomain) {
-            "Domínio: $($computer.Domain)"
-        } else {
-            "Workgroup: $($computer.Workgroup)"
-        }
-        '''
-        
-        result = run_powershell(ps_command, computer_name=computer_name)
-        return result.strip() if result and result.strip() else "NÃO OBTIDO"
+        result = run_powershell(_COMPUTER_SYSTEM_QUERY, computer_name=computer_name)
+        computer = json.loads(result) if result and result.strip() else None
+        if not isinstance(computer, dict):
+            return "NÃO OBTIDO"
+        if computer.get('PartOfDomain'):
+            return f"Domínio: {computer.get('Domain') or ''}"
+        return f"Workgroup: {computer.get('Workgroup') or ''}"
     except:
         return "NÃO OBTIDO"
 
@@ -831,7 +982,7 @@ def get_office_version(computer_name=None):
         r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
     ]
     results = []
-    for base in (winreg.HKEY_LOCAL_MACHINE,):
+    for base in ((winreg.HKEY_LOCAL_MACHINE,) if winreg is not None else ()):
         for key in keys:
             try:
                 reg = winreg.OpenKey(base, key)
@@ -1657,7 +1808,8 @@ def get_installed(computer_name=None):
 
 def get_winupdate(computer_name=None):
     return get_windows_update_status(computer_name=computer_name)
-def is_laptop(computer_name=None):
+def is_laptop(computer_name=None, monitors=None):
+    """Heurística de notebook; `monitors` reaproveita um get_monitor_infos já feito."""
     # 1) verificar Win32_Battery (se existir, provavelmente notebook)
     out = run_powershell("Get-CimInstance Win32_Battery | ConvertTo-Json -Compress", computer_name=computer_name)
     if out and out.strip() != "null":
@@ -1674,7 +1826,7 @@ def is_laptop(computer_name=None):
                 # Para evitar falsos positivos em servidores/headless, só considerar portátil
                 # se houver pelo menos um monitor detectado (notebooks normalmente reportam monitores)
                 try:
-                    mons = get_monitor_infos(computer_name)
+                    mons = monitors if monitors is not None else get_monitor_infos(computer_name)
                     # mons retorna lista de dicts ou lista vazia; considerar portátil apenas se houver monitores válidos
                     if mons and any(m and (m.get('Fabricante') or m.get('Modelo') or m.get('Serial')) for m in mons):
                         return True
@@ -1686,7 +1838,7 @@ def is_laptop(computer_name=None):
         pass
     return False
 
-def get_chassis_type_name(computer_name=None):
+def get_chassis_type_name(computer_name=None, monitors=None):
     """Retorna um nome legível baseado no(s) ChassisTypes retornado(s) pelo WMI.
 
     Mapeamento baseado na tabela comum de ChassisTypes:
@@ -1700,6 +1852,7 @@ def get_chassis_type_name(computer_name=None):
       23 -> Server
     Se vários valores forem retornados, retorna o primeiro que bater no mapeamento.
     Caso não seja possível determinar, retorna 'Desconhecido'.
+    `monitors` (opcional) é repassado à heurística de is_laptop.
     """
     try:
         cmd = "(Get-CimInstance Win32_SystemEnclosure | Select-Object -ExpandProperty ChassisTypes | ConvertTo-Json -Compress)"
@@ -1734,7 +1887,7 @@ def get_chassis_type_name(computer_name=None):
 
     # fallback: se não houver chassi conhecido, tentar heurística antiga
     try:
-        if is_laptop(computer_name):
+        if is_laptop(computer_name, monitors=monitors):
             return 'Notebook'
     except Exception:
         pass
@@ -1763,6 +1916,9 @@ def remove_duplicate_lines(lines):
     return filtered_lines
 
 def write_report(path, lines, include_debug=False):
+    # `lines` pode ser a lista de linhas ou o modelo da coleta (csinfo._model.Report)
+    if isinstance(lines, _model.Report):
+        lines = _model.render_lines(lines)
     # Remove duplicidades antes de escrever
     filtered_lines = remove_duplicate_lines(lines)
     # Sanitizar linhas: remover caracteres de controle como NUL
@@ -1812,123 +1968,33 @@ def write_report(path, lines, include_debug=False):
             except Exception:
                 pass
 
-def organize_pdf_data(lines, computer_name):
-    """Organiza os dados para o PDF conforme a nova estrutura solicitada"""
-    # Remover duplicatas
-    filtered_lines = remove_duplicate_lines(lines)
-    
-    # Dicionários para organizar as informações
-    sistema_info = {}
-    hardware_info = []
-    admin_info = []
-    software_info = []
-    
-    # Variáveis de controle
-    current_section = ""
-    report_date = ""
-    machine_type = ""
-    
-    for line in filtered_lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Cabeçalho e informações básicas
-        if line == "CSInfo - Resumo Técnico do Dispositivo":
-            continue
-        elif line == "CSInfo by CEOsoftware":
-            continue  # Rodapé
-        elif line.startswith("Nome do computador"):
-            continue  # Já temos no computer_name
-        elif line.startswith("Tipo:"):
-            machine_type = line.split(': ')[1] if ': ' in line else ""
-            continue
-        elif line.startswith("Relatório gerado em"):
-            report_date = line
-            continue
-            
-        # Detectar seções
-        if line == "INFORMAÇÕES DO SISTEMA":
-            current_section = "sistema"
-            continue
-        elif line == "INFORMAÇÕES DE HARDWARE":
-            current_section = "hardware"
-            continue
-        elif line == "ADMINISTRADORES":
-            current_section = "admin"
-            continue
-        elif line == "SOFTWARES INSTALADOS":
-            current_section = "software"
-            continue
-            
-        # Processar conteúdo baseado na seção
-        if current_section == "sistema":
-            if ":" in line:
-                sistema_info[line.split(':')[0].strip()] = line
-        elif current_section == "hardware":
-            if ":" in line:  # Agora captura tanto linhas principais quanto indentadas
-                hardware_info.append(line)
-        elif current_section == "admin":
-            if line.startswith("Administrador"):
-                admin_name = line.split(': ')[1] if ': ' in line else line.replace("Administrador", "").strip()
-                admin_info.append(admin_name)
-        elif current_section == "software":
-            if line and not line.startswith("Nenhum software"):
-                # Remover numeração se existir
-                clean_line = re.sub(r'^\s*\d+\.\s*', '', line)
-                software_info.append(clean_line)
-    
-    # Ordenar listas
-    admin_info.sort()
-    software_info.sort()
-    
-    # Organizar hardware por grupos seguindo a nova estrutura
-    hardware_groups = {
-        'Memória': [],
-        'Processador': [],
-        'Disco': [],
-        'Monitor': [],
-        'Teclado': [],
-        'Mouse': [],
-        'Placa mãe': [],
-        'Placa de Rede': [],
-        'Placa de Vídeo': [],
-        'Impressora': []
-    }
-    
-    # Classificar hardware por grupos
-    for info in hardware_info:
-        assigned = False
-        for group_name in hardware_groups.keys():
-            if group_name.lower() in info.lower():
-                hardware_groups[group_name].append(info)
-                assigned = True
-                break
-        if not assigned:
-            # Se não se encaixar em nenhum grupo específico, adicionar a 'Outros'
-            if 'Outros' not in hardware_groups:
-                hardware_groups['Outros'] = []
-            hardware_groups['Outros'].append(info)
-    
-    # Ordenar dentro de cada grupo
-    for group in hardware_groups.values():
-        group.sort()
-    
-    return {
-        'report_date': report_date,
-        'computer_name': computer_name,
-        'machine_type': machine_type,
-        'sistema': sistema_info,
-        'hardware': hardware_groups,
-        'admins': admin_info,
-        'software': software_info
-    }
+def _dump_pdf_links(dump_path, pdf_path, links, destinations):
+    """Grava os links internos do PDF em JSONL (diagnóstico, opt-in).
+
+    `dump_path` '1' usa `<pdf>.annots.jsonl` na pasta temporária do sistema.
+    Cada linha é {'page', 'rect', 'dest', 'tgt_page'}.
+    """
+    try:
+        if dump_path.strip().lower() in ('1', 'true', 'yes', 'sim'):
+            dump_path = os.path.join(tempfile.gettempdir(), os.path.basename(pdf_path) + '.annots.jsonl')
+        with open(dump_path, 'w', encoding='utf-8') as fh:
+            for page, rect, dest in links:
+                payload = {'page': page, 'rect': list(rect), 'dest': dest, 'tgt_page': destinations.get(dest)}
+                fh.write(json.dumps(payload) + '\n')
+        print(f"links do PDF gravados em: {dump_path}", file=sys.stderr)
+        return dump_path
+    except Exception:
+        return None
+
 
 def write_pdf_report(path, lines, computer_name):
     """Gera um relatório em PDF com as informações coletadas - idêntico ao TXT.
 
     Esta versão adiciona um índice lateral (sidebar) com links para os agrupamentos
     principais e cria bookmarks para facilitar a navegação no PDF.
+
+    `lines` pode ser o modelo da coleta (csinfo._model.Report) — os
+    agrupamentos saem de `_model.group_lines` — ou a lista de linhas do TXT.
     """
     if not path:
         return False
@@ -1940,111 +2006,67 @@ def write_pdf_report(path, lines, computer_name):
         from reportlab.lib.units import inch
         from reportlab.platypus.doctemplate import PageBreak
         from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.styles import ParagraphStyle
         from reportlab.lib import colors
         from reportlab.pdfgen import canvas
         import re
 
-        filtered_lines = remove_duplicate_lines(lines)
+        # com o modelo da coleta (csinfo._model.Report) a identificação e os
+        # agrupamentos vêm direto dos campos, sem reinterpretar linhas
+        report = lines if isinstance(lines, _model.Report) else None
+        filtered_lines = remove_duplicate_lines(lines) if report is None else []
 
-        # Canvas numerado com rodapé
+        # Canvas numerado com rodapé. As páginas são emitidas assim que terminam
+        # (os destinos nomeados de bookmarkPage/linkRect ficam com a página
+        # certa e o reportlab os resolve ao salvar); o total de páginas do
+        # "Página X de Y" é um form XObject desenhado só no save().
         class NumberedCanvas(canvas.Canvas):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
-                self._saved_page_states = []
+            TOTAL_FORM = 'csinfoTotalPaginas'
 
             def showPage(self):
-                self._saved_page_states.append(dict(self.__dict__))
-                self._startPage()
+                self.draw_page_number(self._pageNumber)
+                super().showPage()
 
             def save(self):
-                num_pages = len(self._saved_page_states)
-                for page_num, state in enumerate(self._saved_page_states):
-                    self.__dict__.update(state)
-                    self.draw_page_number(page_num + 1, num_pages)
-                    super().showPage()
+                if self._code:
+                    self.showPage()
+                self.beginForm(self.TOTAL_FORM)
+                self.setFont("Helvetica", 7)
+                self.setFillColor(colors.Color(0.25, 0.25, 0.25))
+                self.drawString(0, 0, str(max(1, self._pageNumber - 1)))
+                self.endForm()
                 super().save()
 
-            def draw_page_number(self, page_num, total_pages):
+            def draw_page_number(self, page_num):
+                self.saveState()
                 self.setStrokeColor(colors.Color(0.7, 0.7, 0.7))
                 self.setLineWidth(0.5)
                 self.line(0.5 * inch, 0.5 * inch, A4[0] - 0.5 * inch, 0.5 * inch)
                 self.setFont("Helvetica", 7)
                 self.setFillColor(colors.Color(0.25, 0.25, 0.25))
-                page_text = f"Página {page_num} de {total_pages}"
-                self.drawString(0.5 * inch, 0.3 * inch, page_text)
                 footer_text = "CSInfo by CEOsoftware"
                 text_width = self.stringWidth(footer_text, "Helvetica", 7)
                 x_center = (A4[0] - text_width) / 2
                 self.drawString(x_center, 0.3 * inch, footer_text)
-
-        class MapCollectCanvas(canvas.Canvas):
-            """Canvas usado apenas para coletar bookmarks/destinos criados durante a
-            primeira passagem. Registra nome -> page_number em self.named_map.
-            """
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
-                self.named_map = {}
-                # manter referência da última instância criada para posterior leitura
-                try:
-                    MapCollectCanvas._last_instance = self
-                except Exception:
-                    pass
-
-            def bookmarkPage(self, name):
-                try:
-                    # registrar o número da página atual para este nome
-                    pnum = getattr(self, '_pageNumber', None)
-                    if pnum is None:
-                        pnum = 1
-                    self.named_map[name] = pnum
-                    try:
-                        # debug: log each bookmark observed during collection
-                        print(f"MapCollectCanvas.bookmarkPage: name={name!r} page={pnum}", file=sys.stderr)
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
-                try:
-                    return super().bookmarkPage(name)
-                except Exception:
-                    return None
-            
-            def addOutlineEntry(self, title, key, level=0, closed=None):
-                """Intercepta a criação de entradas de outline (bookmarks) para
-                registrar também o mapeamento nome->página.
-                """
-                try:
-                    pnum = getattr(self, '_pageNumber', None)
-                    if pnum is None:
-                        pnum = 1
-                    if key:
-                        self.named_map[key] = pnum
-                except Exception:
-                    pass
-                try:
-                    return super().addOutlineEntry(title, key, level=level, closed=closed)
-                except Exception:
-                    return None
+                page_text = f"Página {page_num} de "
+                self.drawString(0.5 * inch, 0.3 * inch, page_text)
+                self.translate(0.5 * inch + self.stringWidth(page_text, "Helvetica", 7), 0.3 * inch)
+                self.doForm(self.TOTAL_FORM)
+                self.restoreState()
 
         # document and layout
         tmp_path = path + ".tmp"
-        # Persistir sidecar em pasta temporária do sistema para evitar
-        # vazamento de arquivos .annots.jsonl junto ao diretório de export
-        try:
-            import tempfile, uuid
-            tmp_dir = tempfile.gettempdir()
-            unique = uuid.uuid4().hex
-            # nome legível baseado no nome do pdf final + sufixo único
-            annots_sidecar = os.path.join(tmp_dir, f"{os.path.basename(path)}.tmp.{unique}.annots.jsonl")
-        except Exception:
-            # fallback para colocá-lo ao lado do tmp (comportamento anterior)
-            annots_sidecar = tmp_path + '.annots.jsonl'
-        try:
-            # log curto para diagnóstico: onde o sidecar será escrito
-            print(f"annots_sidecar path: {annots_sidecar}", file=sys.stderr)
-        except Exception:
-            pass
+        # links e destinos internos registrados durante o build (só em memória);
+        # com CSINFO_PDF_LINKS_DUMP são gravados em JSONL para diagnóstico
+        pdf_links = []
+        pdf_destinations = {}
+
+        def register_link(canv, rect, dest):
+            try:
+                pdf_links.append((canv.getPageNumber(), tuple(rect), dest))
+            except Exception:
+                pass
+
         doc = BaseDocTemplate(tmp_path, pagesize=A4)
         sidebar_width = 1.0 * inch
         gap = 8
@@ -2105,21 +2127,8 @@ def write_pdf_report(path, lines, computer_name):
             def draw(self):
                 try:
                     self.canv.bookmarkPage(self.name)
-                    # tentar também registrar diretamente no coletor de mapa (caso bookmarkPage
-                    # não seja interceptado pela MapCollectCanvas por algum motivo)
                     try:
-                        coll = getattr(MapCollectCanvas, '_last_instance', None)
-                        if coll is not None:
-                            pnum = getattr(self.canv, 'getPageNumber', None)
-                            try:
-                                pnum = self.canv.getPageNumber()
-                            except Exception:
-                                pnum = getattr(self.canv, '_pageNumber', None) or 1
-                            coll.named_map[self.name] = pnum
-                            try:
-                                print(f"SectionAnchor.registered directly: name={self.name!r} page={pnum}", file=sys.stderr)
-                            except Exception:
-                                pass
+                        pdf_destinations[self.name] = self.canv.getPageNumber()
                     except Exception:
                         pass
                     try:
@@ -2150,43 +2159,11 @@ def write_pdf_report(path, lines, computer_name):
                     self.para.drawOn(self.canv, 0, 0)
                     if self.dest:
                         try:
-                            # registrar a área do link para criação posterior
                             try:
                                 rect = self.canv._absRect((0, 0, self._w, self._h), relative=1)
                             except Exception:
                                 rect = (0, 0, self._w, self._h)
-                            try:
-                                pnum = getattr(self.canv, 'getPageNumber', None)
-                                if pnum:
-                                    pnum = self.canv.getPageNumber()
-                                else:
-                                    pnum = getattr(self.canv, '_pageNumber', 1)
-                            except Exception:
-                                pnum = getattr(self.canv, '_pageNumber', 1)
-                            try:
-                                # tentar resolver destino para número de página (segunda passagem)
-                                tgt_page = None
-                                try:
-                                    named_map_local = None
-                                    named_map_local = getattr(self.canv, '_named_map', None) or getattr(MapCollectCanvas, '_named_map', None)
-                                    if named_map_local and isinstance(named_map_local, dict):
-                                        if isinstance(self.dest, str) and self.dest in named_map_local:
-                                            tgt_page = named_map_local[self.dest]
-                                except Exception:
-                                    tgt_page = None
-                                annotations_to_create.append((pnum, rect, self.dest))
-                                # persistir em sidecar para pós-processamento confiável
-                                try:
-                                    import json
-                                    payload = {'page': pnum, 'rect': rect, 'dest': self.dest}
-                                    if tgt_page:
-                                        payload['tgt_page'] = int(tgt_page)
-                                    with open(annots_sidecar, 'a', encoding='utf-8') as _af:
-                                        _af.write(json.dumps(payload) + '\n')
-                                except Exception:
-                                    pass
-                            except Exception:
-                                pass
+                            register_link(self.canv, rect, self.dest)
                             # tentar criar a anotação diretamente usando o nome do destino
                             try:
                                 # relative=0 garante coordenadas em coordenadas de página
@@ -2201,68 +2178,14 @@ def write_pdf_report(path, lines, computer_name):
         def draw_header(canvas_obj, doc_obj):
             canvas_obj.saveState()
             y_title = A4[1] - 0.7 * inch if doc_obj.page == 1 else A4[1] - 0.6 * inch
-            # desenhar logotipo pequeno à esquerda, se disponível
+            # desenhar logotipo pequeno à esquerda, se disponível (resolvido e
+            # decodificado uma vez por processo, ver csinfo._pdfassets)
             try:
-                import os, sys
-                from reportlab.lib.utils import ImageReader
-                # Primeiro, preferir um caminho explícito fornecido pelo frontend/backend
-                logo_path = None
-                try:
-                    import csinfo as _cs
-                    lp = getattr(_cs, '__logo_path__', None)
-                    if lp:
-                        # se for relativo e estivermos congelados, tentar resolver em _MEIPASS
-                        try:
-                            if not os.path.isabs(lp) and getattr(sys, 'frozen', False):
-                                meip = getattr(sys, '_MEIPASS', None)
-                                if meip:
-                                    cand_lp = os.path.join(meip, os.path.basename(lp))
-                                    if os.path.exists(cand_lp):
-                                        logo_path = cand_lp
-                        except Exception:
-                            pass
-                        # se não resolvido, aceitar lp absoluto/relativo ao cwd
-                        try:
-                            if not logo_path and os.path.exists(lp):
-                                logo_path = lp
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-
-                # Se não houver logo_path declarado, procurar candidatos conhecidos
-                if not logo_path:
-                    candidates = []
-                    try:
-                        if getattr(sys, 'frozen', False):
-                            meip = getattr(sys, '_MEIPASS', None)
-                            if meip:
-                                candidates.append(os.path.join(meip, 'assets', 'ico.png'))
-                                candidates.append(os.path.join(meip, 'ico.png'))
-                    except Exception:
-                        pass
-                    try:
-                        base_dir = os.path.dirname(__file__)
-                        candidates.append(os.path.join(base_dir, '..', 'assets', 'ico.png'))
-                        candidates.append(os.path.join(base_dir, '..', 'ico.png'))
-                        candidates.append(os.path.join(base_dir, 'assets', 'ico.png'))
-                    except Exception:
-                        pass
-
-                    for c in candidates:
-                        try:
-                            c = os.path.abspath(c)
-                            if os.path.exists(c):
-                                logo_path = c
-                                break
-                        except Exception:
-                            continue
-
-                if logo_path:
+                logo = _pdfassets.get_logo()
+                if logo is not None:
                     try:
                         # desenhar a imagem no cabeçalho com largura pequena
-                        img = ImageReader(logo_path)
-                        iw, ih = img.getSize()
+                        iw, ih = logo.size
                         desired_w = 0.38 * inch
                         scale = desired_w / float(iw) if iw else 1.0
                         desired_h = float(ih) * scale
@@ -2270,8 +2193,7 @@ def write_pdf_report(path, lines, computer_name):
                         # subir levemente o logo para ficar alinhado com o título
                         logo_offset_up = 0.08 * inch
                         y_img = y_title - (desired_h / 2.0) + logo_offset_up
-                        # drawImage aceita caminho ou ImageReader; passar caminho evita problemas
-                        canvas_obj.drawImage(logo_path, x_img, y_img, width=desired_w, height=desired_h, preserveAspectRatio=True, mask='auto')
+                        logo.draw(canvas_obj, x_img, y_img, desired_w, desired_h)
                     except Exception:
                         pass
             except Exception:
@@ -2323,41 +2245,12 @@ def write_pdf_report(path, lines, computer_name):
                     for title, dest in toc_sections:
                         if y - (line_h - 2) < 0.7 * inch:
                             break
-                        # desenhar texto e tentar criar link (registrar para pós-processamento e
-                        # também chamar canvas.linkRect como fallback imediato)
+                        # desenhar texto e criar o link para o destino nomeado
                         try:
                             canvas_obj.drawString(x + 6, y, clean_text(title))
                             txt_w = canvas_obj.stringWidth(clean_text(title), 'Helvetica', 8)
                             rect = (x + 6, y - 2, x + 6 + txt_w, y + 10)
-                            pnum = getattr(canvas_obj, 'getPageNumber', None)
-                            if pnum:
-                                try:
-                                    pnum = canvas_obj.getPageNumber()
-                                except Exception:
-                                    pnum = getattr(canvas_obj, '_pageNumber', 1)
-                            else:
-                                pnum = getattr(canvas_obj, '_pageNumber', 1)
-                                try:
-                                    # tentar resolver destino para número de página
-                                    tgt_page = None
-                                    try:
-                                        named_map_local = getattr(canvas_obj, '_named_map', None) or getattr(MapCollectCanvas, '_named_map', None)
-                                        if named_map_local and isinstance(named_map_local, dict) and isinstance(dest, str) and dest in named_map_local:
-                                            tgt_page = named_map_local[dest]
-                                    except Exception:
-                                        tgt_page = None
-                                    annotations_to_create.append((pnum, rect, dest))
-                                    try:
-                                        import json
-                                        payload = {'page': pnum, 'rect': rect, 'dest': dest}
-                                        if tgt_page:
-                                            payload['tgt_page'] = int(tgt_page)
-                                        with open(annots_sidecar, 'a', encoding='utf-8') as _af:
-                                            _af.write(json.dumps(payload) + '\n')
-                                    except Exception:
-                                        pass
-                                except Exception:
-                                    pass
+                            register_link(canvas_obj, rect, dest)
                             try:
                                 canvas_obj.linkRect('', dest, rect, relative=0)
                             except Exception:
@@ -2382,24 +2275,15 @@ def write_pdf_report(path, lines, computer_name):
             except Exception:
                 pass
 
-        # coletará anotações para criar no pós-processamento: (page_num, rect, destname)
         story = []
-        annotations_to_create = []
-        styles = getSampleStyleSheet()
+        # estilos montados uma vez por processo (csinfo._pdfassets)
+        pdf_styles = _pdfassets.get_styles()
+        styles = pdf_styles['sheet']
         # header para o topo e títulos das seções
-        header_style = ParagraphStyle('CSInfoHeader', parent=styles['Normal'], fontSize=10, textColor=colors.navy, alignment=TA_LEFT, spaceAfter=6, leading=14, fontName='Helvetica-Bold')
+        header_style = pdf_styles['header']
         # padronizar espaçamento/leading e usar cores suaves de fundo por seção
-        TITLE_LEADING = 14
-        TITLE_SPACE_BEFORE = 1
-        TITLE_SPACE_AFTER = 1
-        section_title_styles = {
-            "INFORMAÇÕES DO SISTEMA": ParagraphStyle('SectionTitleSistema', parent=styles['Heading2'], fontSize=10, spaceAfter=TITLE_SPACE_AFTER, spaceBefore=TITLE_SPACE_BEFORE, leading=TITLE_LEADING, textColor=colors.whitesmoke, fontName='Helvetica-Bold', alignment=TA_LEFT),
-            "INFORMAÇÕES DE HARDWARE": ParagraphStyle('SectionTitleHardware', parent=styles['Heading2'], fontSize=10, spaceAfter=TITLE_SPACE_AFTER, spaceBefore=TITLE_SPACE_BEFORE, leading=TITLE_LEADING, textColor=colors.whitesmoke, fontName='Helvetica-Bold', alignment=TA_LEFT),
-            "ADMINISTRADORES": ParagraphStyle('SectionTitleAdmin', parent=styles['Heading2'], fontSize=10, spaceAfter=TITLE_SPACE_AFTER, spaceBefore=TITLE_SPACE_BEFORE, leading=TITLE_LEADING, textColor=colors.whitesmoke, fontName='Helvetica-Bold', alignment=TA_LEFT),
-            "SOFTWARES INSTALADOS": ParagraphStyle('SectionTitleSoft', parent=styles['Heading2'], fontSize=10, spaceAfter=TITLE_SPACE_AFTER, spaceBefore=TITLE_SPACE_BEFORE, leading=TITLE_LEADING, textColor=colors.whitesmoke, fontName='Helvetica-Bold', alignment=TA_LEFT),
-            "INFORMAÇÕES DE REDE": ParagraphStyle('SectionTitleNet', parent=styles['Heading2'], fontSize=10, spaceAfter=TITLE_SPACE_AFTER, spaceBefore=TITLE_SPACE_BEFORE, leading=TITLE_LEADING, textColor=colors.whitesmoke, fontName='Helvetica-Bold', alignment=TA_LEFT),
-            "SEGURANÇA DO SISTEMA": ParagraphStyle('SectionTitleSec', parent=styles['Heading2'], fontSize=10, spaceAfter=TITLE_SPACE_AFTER, spaceBefore=TITLE_SPACE_BEFORE, leading=TITLE_LEADING, textColor=colors.whitesmoke, fontName='Helvetica-Bold', alignment=TA_LEFT),
-        }
+        TITLE_LEADING = _pdfassets.TITLE_LEADING
+        section_title_styles = pdf_styles['section_titles']
         # cores mais saturadas/escurecidas para contraste com texto branco
         section_bg_colors = {
             "IDENTIFICAÇÃO": colors.Color(0.20, 0.30, 0.40),  
@@ -2420,9 +2304,9 @@ def write_pdf_report(path, lines, computer_name):
         # Small gap specifically used after certain titles to tighten spacing
         # Reduced to 0 to remove extra spacing between certain consecutive sections
         SMALL_TITLE_GAP = 0
-        normal_style = ParagraphStyle('CustomNormal', parent=styles['Normal'], fontSize=9, spaceAfter=2, leading=11, textColor=colors.black, fontName='Helvetica')
-        indented_style = ParagraphStyle('IndentedNormal', parent=styles['Normal'], fontSize=9, spaceAfter=2, leading=11, textColor=colors.black, fontName='Helvetica', leftIndent=12)
-        double_indented_style = ParagraphStyle('DoubleIndentedNormal', parent=styles['Normal'], fontSize=9, spaceAfter=2, leading=11, textColor=colors.black, fontName='Helvetica', leftIndent=24)
+        normal_style = pdf_styles['normal']
+        indented_style = pdf_styles['indented']
+        double_indented_style = pdf_styles['double_indented']
 
         def clean_text(text):
             if text is None:
@@ -2436,6 +2320,8 @@ def write_pdf_report(path, lines, computer_name):
         try:
             id_keys = {'Nome do computador': None, 'Tipo': None, 'Gerado por': None, 'Relatório gerado em': None}
             matched_indices = set()
+            if report is not None:
+                id_keys.update(_model.identification_fields(report))
             for idx, ln in enumerate(filtered_lines):
                 if not ln:
                     continue
@@ -2450,9 +2336,9 @@ def write_pdf_report(path, lines, computer_name):
                             id_keys[k] = ''
                         matched_indices.add(idx)
                         break
-            # ajustar Tipo se for linha de disco
+            # ajustar Tipo se for linha de disco (só ao reinterpretar linhas)
             try:
-                tipo_val = id_keys.get('Tipo')
+                tipo_val = id_keys.get('Tipo') if report is None else None
                 if tipo_val and re.search(r'\bHDD\b|\bSSD\b|Interface:|\|', tipo_val, flags=re.IGNORECASE):
                     tipo_chassi = None
                     try:
@@ -2469,7 +2355,7 @@ def write_pdf_report(path, lines, computer_name):
             except Exception:
                 pass
 
-            id_title_style = ParagraphStyle('IdTitle', parent=styles['Normal'], fontSize=10, leading=12, alignment=TA_LEFT, fontName='Helvetica-Bold', textColor=colors.white)
+            id_title_style = pdf_styles['id_title']
             id_dest = 'sec_IDENTIFICACAO'
             add_toc_section('IDENTIFICAÇÃO', id_dest)
             # garantir anchor literal também: criar_titulo_pdf insere <a name='IDENTIFICAÇÃO'/>
@@ -2563,6 +2449,90 @@ def write_pdf_report(path, lines, computer_name):
         current_group = None
         collecting_group = False
 
+        def add_group_title(title, prev_title=None, next_title=None):
+            """Título-resumo de um agrupamento no corpo, com link para os detalhes.
+
+            `prev_title`/`next_title`: título imediatamente antes/depois no
+            corpo, se houver (ajuste de espaçamento SISTEMA -> HARDWARE).
+            Retorna o destino do agrupamento.
+            """
+            # iniciar novo agrupamento: registrar destino e criar resumo
+            destname = 'sec_' + re.sub(r'[^0-9a-zA-Z_]', '_', title).upper()
+            detail_dest = 'detail_' + destname
+            # âncora do título-resumo (bookmark)
+            story.append(SectionAnchor(destname, title))
+            try:
+                add_toc_section(title, destname)
+            except Exception:
+                pass
+            try:
+                # criar título com link para a seção de detalhes
+                link_text = f"{clean_text(title)} [ver detalhes]"
+                # usar LinkedParagraph para garantir área de link funcional
+                title_para = LinkedParagraph(link_text, section_title_styles.get(title, header_style), destname=detail_dest)
+                table_width = A4[0] - inch
+                tbl = Table([[title_para]], colWidths=[table_width])
+                try:
+                    bg = section_bg_colors.get(title, colors.Color(0.5, 0.5, 0.5))
+                except Exception:
+                    bg = colors.Color(0.5, 0.5, 0.5)
+                # ajustar paddings para títulos consecutivos específicos
+                try:
+                    pad_top = TITLE_TOPPAD
+                    pad_bottom = TITLE_BOTTOMPAD
+                    # reduzir padding quando for o par SISTEMA -> HARDWARE
+                    if str(title).strip().upper() == 'INFORMAÇÕES DO SISTEMA' and next_title and str(next_title).strip().upper() == 'INFORMAÇÕES DE HARDWARE':
+                        pad_bottom = 0
+                    # também reduzir o top padding do HARDWARE se o anterior foi SISTEMA
+                    if str(title).strip().upper() == 'INFORMAÇÕES DE HARDWARE':
+                        if prev_title and str(prev_title).strip().upper() == 'INFORMAÇÕES DO SISTEMA':
+                            pad_top = 0
+                except Exception:
+                    pad_top = TITLE_TOPPAD
+                    pad_bottom = TITLE_BOTTOMPAD
+                tbl.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (0, 0), bg),
+                    ('LEFTPADDING', (0, 0), (0, 0), TITLE_LEFTPAD),
+                    ('RIGHTPADDING', (0, 0), (0, 0), TITLE_RIGHTPAD),
+                    ('TOPPADDING', (0, 0), (0, 0), pad_top),
+                    ('BOTTOMPADDING', (0, 0), (0, 0), pad_bottom),
+                ]))
+                story.append(tbl)
+                try:
+                    # Para o par INFORMAÇÕES DO SISTEMA -> INFORMAÇÕES DE HARDWARE,
+                    # usar um Spacer negativo para sobrepor levemente os blocos
+                    if str(title).strip().upper() == 'INFORMAÇÕES DO SISTEMA' and next_title and str(next_title).strip().upper() == 'INFORMAÇÕES DE HARDWARE':
+                        # usar gap pequeno de 2 pontos entre os blocos
+                        story.append(Spacer(1, 2))
+                    else:
+                        gap = SMALL_TITLE_GAP if str(title).strip().upper() == 'INFORMAÇÕES DO SISTEMA' else TITLE_GAP
+                        story.append(Spacer(1, gap))
+                except Exception:
+                    story.append(Spacer(1, TITLE_GAP))
+            except Exception:
+                try:
+                    story.append(Paragraph(clean_text(title), section_title_styles.get(title, header_style)))
+                    try:
+                        gap = SMALL_TITLE_GAP if str(title).strip().upper() == 'INFORMAÇÕES DO SISTEMA' else TITLE_GAP
+                        story.append(Spacer(1, gap))
+                    except Exception:
+                        pass
+                except Exception:
+                    pass
+            return destname
+
+        # com o modelo, os agrupamentos saem direto das seções (csinfo._model.GROUPS)
+        if report is not None:
+            grupos = _model.group_lines(report)
+            for i, (titulo, glines) in enumerate(grupos):
+                # títulos só ficam colados quando não há linhas entre eles
+                prev_title = grupos[i - 1][0] if i and not any(ln.strip() for ln in grupos[i - 1][1]) else None
+                next_title = grupos[i + 1][0] if i + 1 < len(grupos) and not any(ln.strip() for ln in glines) else None
+                destname = add_group_title(titulo, prev_title, next_title)
+                # as linhas em branco do grupo espaçam os resumos no corpo
+                story.extend(Spacer(1, 6) for ln in glines if not ln.strip())
+                group_contents[destname] = list(glines)
+
         for idx, line in enumerate(iter_lines):
             line_stripped = line.strip()
             if not line_stripped:
@@ -2588,87 +2558,24 @@ def write_pdf_report(path, lines, computer_name):
             if any(alias in _normalize(line_stripped) for alias in index_aliases):
                 continue
             if line_stripped in section_title_styles:
-                # iniciar novo agrupamento: registrar destino e criar resumo
-                destname = 'sec_' + re.sub(r'[^0-9a-zA-Z_]', '_', line_stripped).upper()
-                detail_dest = 'detail_' + destname
-                # âncora do título-resumo (bookmark)
-                story.append(SectionAnchor(destname, line_stripped))
-                try:
-                    add_toc_section(line_stripped, destname)
-                except Exception:
-                    pass
-                try:
-                    # criar título com link para a seção de detalhes
-                    link_text = f"{clean_text(line_stripped)} [ver detalhes]"
-                    # usar LinkedParagraph para garantir área de link funcional
-                    title_para = LinkedParagraph(link_text, section_title_styles.get(line_stripped, header_style), destname=detail_dest)
-                    table_width = A4[0] - inch
-                    tbl = Table([[title_para]], colWidths=[table_width])
-                    try:
-                        bg = section_bg_colors.get(line_stripped, colors.Color(0.5, 0.5, 0.5))
-                    except Exception:
-                        bg = colors.Color(0.5, 0.5, 0.5)
-                    # ajustar paddings para títulos consecutivos específicos
-                    try:
-                        pad_top = TITLE_TOPPAD
-                        pad_bottom = TITLE_BOTTOMPAD
-                        # olhar próxima linha não-vazia para detectar título seguinte
-                        next_title = None
-                        for k in range(idx+1, len(iter_lines)):
-                            nxt = iter_lines[k].strip() if iter_lines[k] else ''
-                            if not nxt:
-                                continue
-                            if nxt in section_title_styles:
-                                next_title = nxt
-                            break
-                        # reduzir padding quando for o par SISTEMA -> HARDWARE
-                        if str(line_stripped).strip().upper() == 'INFORMAÇÕES DO SISTEMA' and next_title and str(next_title).strip().upper() == 'INFORMAÇÕES DE HARDWARE':
-                            pad_bottom = 0
-                        # também reduzir o top padding do HARDWARE se o anterior foi SISTEMA
-                        if str(line_stripped).strip().upper() == 'INFORMAÇÕES DE HARDWARE':
-                            # checar o título anterior simples (procura reversa)
-                            prev_title = None
-                            for k in range(idx-1, -1, -1):
-                                prv = iter_lines[k].strip() if iter_lines[k] else ''
-                                if not prv:
-                                    continue
-                                if prv in section_title_styles:
-                                    prev_title = prv
-                                break
-                            if prev_title and str(prev_title).strip().upper() == 'INFORMAÇÕES DO SISTEMA':
-                                pad_top = 0
-                    except Exception:
-                        pad_top = TITLE_TOPPAD
-                        pad_bottom = TITLE_BOTTOMPAD
-                    tbl.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (0, 0), bg),
-                        ('LEFTPADDING', (0, 0), (0, 0), TITLE_LEFTPAD),
-                        ('RIGHTPADDING', (0, 0), (0, 0), TITLE_RIGHTPAD),
-                        ('TOPPADDING', (0, 0), (0, 0), pad_top),
-                        ('BOTTOMPADDING', (0, 0), (0, 0), pad_bottom),
-                    ]))
-                    story.append(tbl)
-                    try:
-                        # Para o par INFORMAÇÕES DO SISTEMA -> INFORMAÇÕES DE HARDWARE,
-                        # usar um Spacer negativo para sobrepor levemente os blocos
-                        if str(line_stripped).strip().upper() == 'INFORMAÇÕES DO SISTEMA' and next_title and str(next_title).strip().upper() == 'INFORMAÇÕES DE HARDWARE':
-                            # usar gap pequeno de 2 pontos entre os blocos
-                            story.append(Spacer(1, 2))
-                        else:
-                            gap = SMALL_TITLE_GAP if str(line_stripped).strip().upper() == 'INFORMAÇÕES DO SISTEMA' else TITLE_GAP
-                            story.append(Spacer(1, gap))
-                    except Exception:
-                        story.append(Spacer(1, TITLE_GAP))
-                except Exception:
-                    try:
-                        story.append(Paragraph(clean_text(line_stripped), section_title_styles.get(line_stripped, header_style)))
-                        try:
-                            gap = SMALL_TITLE_GAP if str(line_stripped).strip().upper() == 'INFORMAÇÕES DO SISTEMA' else TITLE_GAP
-                            story.append(Spacer(1, gap))
-                        except Exception:
-                            pass
-                    except Exception:
-                        pass
+                # títulos vizinhos: a linha não-vazia imediatamente antes/depois
+                next_title = None
+                for k in range(idx+1, len(iter_lines)):
+                    nxt = iter_lines[k].strip() if iter_lines[k] else ''
+                    if not nxt:
+                        continue
+                    if nxt in section_title_styles:
+                        next_title = nxt
+                    break
+                prev_title = None
+                for k in range(idx-1, -1, -1):
+                    prv = iter_lines[k].strip() if iter_lines[k] else ''
+                    if not prv:
+                        continue
+                    if prv in section_title_styles:
+                        prev_title = prv
+                    break
+                destname = add_group_title(line_stripped, prev_title, next_title)
                 # iniciar coleta de linhas do grupo (não inserir conteúdo no corpo)
                 current_group = destname
                 collecting_group = True
@@ -2778,7 +2685,7 @@ def write_pdf_report(path, lines, computer_name):
                 # de "undefined destination target" quando o link apontar
                 # para um nome que não existe como bookmark.
                 if toc_sections:
-                    indice_estilo = ParagraphStyle('IndiceInline', parent=styles['Normal'], fontSize=9, textColor=colors.whitesmoke, leftIndent=4, leading=11)
+                    indice_estilo = pdf_styles['indice']
                     idx_flow = []
                     for title, dest in toc_sections:
                         try:
@@ -2885,11 +2792,11 @@ def write_pdf_report(path, lines, computer_name):
                                 detail_text = f"Detalhes: {clean_text(title_text)} [voltar]"
                                 # criar um estilo de detalhe baseado em header_style com texto branco
                                 try:
-                                    detail_style = ParagraphStyle(f"Detail_{title_text}", parent=header_style, textColor=colors.whitesmoke, leading=TITLE_LEADING)
+                                    detail_style = _pdfassets.detail_style(title_text)
                                 except Exception:
                                     detail_style = ParagraphStyle('DetailFallback', parent=header_style, textColor=colors.whitesmoke)
-                                # Use LinkedParagraph so the '[voltar]' clickable area is recorded
-                                # and later turned into a GoTo annotation in post-processing.
+                                # Use LinkedParagraph so the '[voltar]' clickable area becomes
+                                # a link to the section title.
                                 title_para = LinkedParagraph(f"<b>{detail_text}</b>", detail_style, destname=sec_dest)
                                 # selecionar a cor de fundo correspondente ao título principal (sem 'Detalhes: ' prefix)
                                 base_title = title_text
@@ -2979,208 +2886,21 @@ def write_pdf_report(path, lines, computer_name):
             except Exception:
                 pass
 
-            # primeira passagem: coletar mapa de nomes -> página
+            # passagem única: os links internos apontam para destinos nomeados
+            # (bookmarkPage/linkRect) que o próprio reportlab resolve no save
             try:
-                try:
-                    MapCollectCanvas._last_instance = None
-                except Exception:
-                    pass
-                # limpar sidecar antes da primeira passagem
-                try:
-                    if os.path.exists(annots_sidecar):
-                        os.remove(annots_sidecar)
-                except Exception:
-                    pass
-                try:
-                    doc.build(story, canvasmaker=MapCollectCanvas)
-                except Exception:
-                    pass
-                try:
-                    coll = getattr(MapCollectCanvas, '_last_instance', None)
-                    named_map = coll.named_map if coll is not None else {}
-                    try:
-                        print('collected_named_map:', named_map, file=sys.stderr)
-                    except Exception:
-                        pass
-                except Exception:
-                    named_map = {}
-            except Exception:
-                named_map = {}
-
-            # segunda passagem: build final com canvas numerado
-            try:
-                # anexar o mapa coletado às classes/canvas para que os flowables
-                # possam criar anotações paginadas na segunda passagem
-                try:
-                    NumberedCanvas._named_map = named_map
-                except Exception:
-                    pass
-                try:
-                    MapCollectCanvas._named_map = named_map
-                except Exception:
-                    pass
-                # limpar sidecar antes da segunda passagem para gravar posições reais
-                try:
-                    if os.path.exists(annots_sidecar):
-                        os.remove(annots_sidecar)
-                except Exception:
-                    pass
                 try:
                     doc.build(story, canvasmaker=NumberedCanvas)
                 except Exception:
                     # fallback: tentar uma build simples
                     doc.build(story)
             except Exception:
-                # fallback handled above
                 pass
+            dump_path = os.environ.get('CSINFO_PDF_LINKS_DUMP')
+            if dump_path:
+                _dump_pdf_links(dump_path, path, pdf_links, pdf_destinations)
             # move temp file to final path atomically
             try:
-                # tentar corrigir anotações internas pós-processando o PDF temporário
-                def _fix_annotation_destinations(pdf_path, name_map=None, annotations_list=None):
-                    try:
-                        from pypdf import PdfReader, PdfWriter
-                        from pypdf.generic import DictionaryObject, NameObject, ArrayObject, FloatObject, NumberObject
-                    except Exception:
-                        return False
-
-                    try:
-                        rdr = PdfReader(pdf_path)
-                        # carregar sidecar se necessário
-                        if not annotations_list:
-                            annotations_list = []
-                            try:
-                                import json
-                                if os.path.exists(annots_sidecar):
-                                    with open(annots_sidecar, 'r', encoding='utf-8') as _af:
-                                        for ln in _af:
-                                            try:
-                                                obj = json.loads(ln)
-                                                annotations_list.append((obj.get('page'), tuple(obj.get('rect')), obj.get('dest')))
-                                            except Exception:
-                                                pass
-                            except Exception:
-                                annotations_list = annotations_list or []
-
-                        nd = getattr(rdr, 'named_destinations', None) or {}
-
-                        writer = PdfWriter()
-                        # append all pages first so writer has its own page objects/refs
-                        writer.append_pages_from_reader(rdr)
-
-                        # collect existing annots from writer pages and preserve non-Link ones
-                        num_pages = len(writer.pages)
-                        page_new_annots = {i: [] for i in range(num_pages)}
-                        for i in range(num_pages):
-                            try:
-                                existing = writer.pages[i].get('/Annots') or []
-                            except Exception:
-                                existing = []
-                            kept = []
-                            for a in existing:
-                                try:
-                                    obj = a.get_object()
-                                    subtype = obj.get('/Subtype')
-                                    if subtype != '/Link':
-                                        kept.append(a)
-                                except Exception:
-                                    kept.append(a)
-                            page_new_annots[i] = kept
-
-                        # create named destinations in writer for every target used
-                        dest_to_index = {}
-                        for (_pnum, _rect, destname) in (annotations_list or []):
-                            if destname in dest_to_index:
-                                continue
-                            # try to resolve the target page
-                            tgt_page = None
-                            if name_map and destname in name_map:
-                                tgt_page = name_map[destname]
-                            elif destname in nd:
-                                try:
-                                    tgt_page = rdr.get_destination_page_number(nd[destname]) + 1
-                                except Exception:
-                                    tgt_page = None
-                            if not tgt_page:
-                                continue
-                            tgt_index = int(tgt_page) - 1
-                            if tgt_index < 0 or tgt_index >= num_pages:
-                                continue
-                            dest_to_index[destname] = tgt_index
-
-                        # register named destinations in writer
-                        for destname, tgt_index in dest_to_index.items():
-                            try:
-                                # pypdf expects a name and a page (object or index)
-                                writer.add_named_destination(destname, writer.pages[tgt_index])
-                            except Exception:
-                                try:
-                                    writer.add_named_destination(destname, tgt_index)
-                                except Exception:
-                                    pass
-
-                        # create new annotations and append to the appropriate writer page
-                        for (pnum, rect, destname) in (annotations_list or []):
-                            try:
-                                page_index = int(pnum) - 1
-                                if page_index < 0 or page_index >= num_pages:
-                                    continue
-                                # create an annotation that performs a GoTo to the named destination
-                                if destname not in dest_to_index:
-                                    continue
-                                ann = DictionaryObject()
-                                ann[NameObject('/Type')] = NameObject('/Annot')
-                                ann[NameObject('/Subtype')] = NameObject('/Link')
-                                x0, y0, x1, y1 = rect
-                                ann[NameObject('/Rect')] = ArrayObject([FloatObject(x0), FloatObject(y0), FloatObject(x1), FloatObject(y1)])
-                                ann[NameObject('/Border')] = ArrayObject([NumberObject(0), NumberObject(0), NumberObject(0)])
-                                # action dictionary: /S /GoTo, /D <name>
-                                action = DictionaryObject()
-                                action[NameObject('/S')] = NameObject('/GoTo')
-                                # Named destination should be a Name or string; use NameObject with leading slash
-                                try:
-                                    action[NameObject('/D')] = NameObject('/' + destname)
-                                except Exception:
-                                    try:
-                                        from pypdf.generic import TextStringObject
-                                        action[NameObject('/D')] = TextStringObject(destname)
-                                    except Exception:
-                                        action[NameObject('/D')] = NameObject('/' + destname)
-                                ann[NameObject('/A')] = action
-                                try:
-                                    newref = writer._add_object(ann)
-                                    page_new_annots[page_index].append(newref)
-                                except Exception:
-                                    page_new_annots[page_index].append(ann)
-                            except Exception:
-                                pass
-
-                        # assign updated Annots arrays back to writer pages
-                        from collections import defaultdict
-                        for i in range(num_pages):
-                            try:
-                                writer.pages[i][NameObject('/Annots')] = ArrayObject(page_new_annots[i])
-                            except Exception:
-                                pass
-
-                        outp = pdf_path + '.fixed'
-                        with open(outp, 'wb') as f:
-                            writer.write(f)
-                        try:
-                            os.replace(outp, pdf_path)
-                        except Exception:
-                            try:
-                                os.remove(pdf_path)
-                                os.replace(outp, pdf_path)
-                            except Exception:
-                                pass
-                        return True
-                    except Exception:
-                        return False
-
-                try:
-                    _fix_annotation_destinations(tmp_path, name_map=named_map, annotations_list=annotations_to_create)
-                except Exception:
-                    pass
                 if os.path.exists(tmp_path):
                     os.replace(tmp_path, path)
             except Exception:
@@ -3214,41 +2934,25 @@ def write_pdf_report(path, lines, computer_name):
 def check_remote_machine(computer_name):
     if not computer_name:
         return True
-    import subprocess, os, socket, time
+    # o resultado alimenta o circuit breaker do host (ver csinfo._breaker)
+    ok = _check_remote_machine(computer_name)
+    breaker = _breaker.get_default_breaker()
+    if breaker is not None:
+        if ok:
+            breaker.record_success(computer_name)
+        else:
+            breaker.trip(computer_name, 'host inacessível (ping e portas 5985/5986/445)')
+    return ok
+
+def _check_remote_machine(computer_name):
+    # ping e portas 5985/5986/445 (WinRM HTTP/HTTPS, SMB) disparados ao mesmo
+    # tempo; a primeira sonda que responder basta (ver csinfo._probe). O WinRM
+    # usa as portas 5985/5986, então uma tentativa extra via PowerShell não
+    # alcançaria um host em que nenhuma sonda respondeu.
     try:
-        # 1) Ping com algumas tentativas (sem abrir janela no Windows)
-        creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000) if os.name == 'nt' else 0
-        def try_ping():
-            try:
-                p = subprocess.run(["ping", "-n", "1", computer_name], capture_output=True, text=True, timeout=3, creationflags=creationflags)
-                return p.returncode == 0
-            except Exception:
-                return False
-
-        for _ in range(2):
-            if try_ping():
-                return True
-            time.sleep(0.4)
-
-        # 2) Tentar conectar em portas comuns (WinRM HTTP/HTTPS, SMB) - se qualquer uma responder, consideramos acessível
-        ports = [5985, 5986, 445]
-        for port in ports:
-            try:
-                sock = socket.create_connection((computer_name, port), timeout=2)
-                sock.close()
-                return True
-            except Exception:
-                pass
-
-        # 3) Tentativa final via WinRM/PowerShell (pode falhar se WinRM não estiver configurado)
-        try:
-            out = run_powershell('Write-Output $env:COMPUTERNAME', computer_name=computer_name)
-            if out and str(out).strip():
-                return True
-        except Exception:
-            pass
-
-        return False
+        timeout = _pshost._env_number('CSINFO_PROBE_TIMEOUT', 2.0, float)
+        from . import _probe
+        return _probe.probe_host(computer_name, timeout=timeout).reachable
     except Exception:
         return False
 
@@ -3274,14 +2978,154 @@ def is_remote_admin(computer_name=None):
     out = run_powershell(ps, computer_name=computer_name)
     return str(out).strip().lower() in ("true", "1")
 
-def main(export_type=None, barra_callback=None, computer_name=None, include_debug_on_export=False, machine_alias=None):
-    # --- COLETA DE INFORMAÇÕES AVANÇADAS ---
-    network_details = get_network_details(computer_name)
-    firewall_status = get_firewall_status(computer_name)
-    windows_update_status = get_windows_update_status(computer_name)
-    running_processes = get_running_processes(computer_name)
-    critical_services = get_critical_services(computer_name)
-    firewall_controller = get_firewall_controller(computer_name)
+def _windows_update_for_report(computer_name=None):
+    """Windows Update para o relatório: último valor conhecido e nova busca em
+    segundo plano (ver csinfo._winupdate); CSINFO_WU_BACKGROUND=0 busca na hora."""
+    if os.environ.get('CSINFO_WU_BACKGROUND', '1') == '0':
+        return get_windows_update_status(computer_name)
+    return _winupdate.status_for_report(computer_name)
+
+# Grafo de coleta usado por main(): (nome, getter, dependências), na ordem do
+# relatório. As dependências recebem o resultado como argumento nomeado
+# (ver csinfo._dag); o tipo de chassi reaproveita os monitores na heurística
+# de notebook.
+_COLLECTION_GRAPH = (
+    ('get_network_details', get_network_details, ()),
+    ('get_firewall_status', get_firewall_status, ()),
+    ('get_windows_update_status', _windows_update_for_report, ()),
+    ('get_running_processes', get_running_processes, ()),
+    ('get_critical_services', get_critical_services, ()),
+    ('get_firewall_controller', get_firewall_controller, ()),
+    ('monitors', get_monitor_infos, ()),
+    ('get_chassis_type_name', get_chassis_type_name, ('monitors',)),
+    ('get_os_version', get_os_version, ()),
+    ('get_windows_activation_status', get_windows_activation_status, ()),
+    ('get_office_version', get_office_version, ()),
+    ('get_office_activation_status', get_office_activation_status, ()),
+    ('get_sql_server_info', get_sql_server_info, ()),
+    ('get_antivirus_info', get_antivirus_info, ()),
+    ('is_domain_computer', is_domain_computer, ()),
+    ('get_memory_info', get_memory_info, ()),
+    ('get_memory_modules_info', get_memory_modules_info, ()),
+    ('get_processor_info', get_processor_info, ()),
+    ('get_disk_info', get_disk_info, ()),
+    ('get_logical_drives_info', get_logical_drives_info, ()),
+    ('get_keyboard_mouse_status', get_keyboard_mouse_status, ()),
+    ('get_motherboard_info', get_motherboard_info, ()),
+    ('get_network_adapters_info', get_network_adapters_info, ()),
+    ('get_video_cards_info', get_video_cards_info, ()),
+    ('get_printers', get_printers, ()),
+    ('get_admin_users', get_admin_users, ()),
+    ('get_installed_software', get_installed_software, ()),
+)
+
+# Nós que não entram no script em lote: a busca do Windows Update roda em
+# segundo plano, fora do relatório.
+_FORA_DO_LOTE = ('get_windows_update_status',)
+
+# Getters chamados por main(), na ordem do relatório. Usados pela coleta em
+# lote para montar o script combinado (ver csinfo._batch).
+_REPORT_GETTERS = tuple(getter for nome, getter, _deps in _COLLECTION_GRAPH if nome not in _FORA_DO_LOTE)
+
+
+def _collection_graph(computer_name, force_refresh=None, delta=None):
+    """_COLLECTION_GRAPH com as seções estáveis servidas pelo cache persistente.
+
+    Retorna (nós, {seção: instante da coleta em cache}); seções fora do TTL
+    (ou com recoleta forçada) são coletadas e gravadas no cache. No modo
+    delta, seções cuja impressão digital não mudou desde a última coleta
+    também são servidas do valor gravado (ver csinfo._delta).
+    """
+    cache = _sectioncache.get_default_cache()
+    estado = _delta.get_default_state() if _delta.delta_requested(delta) else None
+    if cache is None and estado is None:
+        return _COLLECTION_GRAPH, {}
+    host = get_machine_name(computer_name)
+    digitais = estado.fingerprints(computer_name) if estado is not None else {}
+    nodes = []
+    servidos = {}
+    for nome, getter, deps in _COLLECTION_GRAPH:
+        forcar = _sectioncache.refresh_requested(force_refresh, nome)
+        digital = digitais.get(_delta.GROUPS.get(nome))
+        hit = None
+        if cache is not None and cache.cacheable(nome) and not forcar:
+            hit = cache.get(host, nome)
+        if hit is None and digital and not forcar:
+            hit = estado.get(host, nome, digital)
+        if hit is not None:
+            servidos[nome] = hit[1]
+            getter = (lambda valor: lambda computer_name, **_deps: valor)(hit[0])
+        else:
+            if cache is not None and cache.cacheable(nome):
+                getter = _store_section(cache.put, host, nome, getter)
+            if digital:
+                getter = _store_section(functools.partial(estado.put, fingerprint=digital), host, nome, getter)
+        nodes.append((nome, getter, deps))
+    return tuple(nodes), servidos
+
+
+def _store_section(gravar, host, nome, getter):
+    def coletar(computer_name, **deps):
+        valor = getter(computer_name, **deps)
+        try:
+            gravar(host, nome, valor)
+        except Exception:
+            pass
+        return valor
+    coletar.__name__ = getattr(getter, '__name__', nome)
+    return coletar
+
+
+def _collection_workers(computer_name, workers=None):
+    """Threads para os getters: explícito, ou CSINFO_WORKERS_LOCAL/_REMOTE."""
+    if workers is not None:
+        try:
+            return max(1, int(workers))
+        except Exception:
+            return 1
+    local_names = {'localhost', '127.0.0.1', '::1', (platform.node() or '').lower(), os.environ.get('COMPUTERNAME', '').lower()}
+    if not computer_name or str(computer_name).strip().lower() in local_names:
+        return max(1, _pshost._env_number('CSINFO_WORKERS_LOCAL', 4))
+    return max(1, _pshost._env_number('CSINFO_WORKERS_REMOTE', 2))
+
+def main(export_type=None, barra_callback=None, computer_name=None, include_debug_on_export=False, machine_alias=None, batch=None, workers=None, force_refresh=None, output_dir=None, store=None, delta=None, archive=None, cancel=None):
+    """Coleta as informações da máquina e opcionalmente exporta TXT/PDF.
+
+    - batch: se True, os scripts de todos os getters são combinados em um único
+      script (uma única chamada/Invoke-Command por alvo); se None, usa a variável
+      de ambiente CSINFO_BATCH=1. Ver csinfo._batch.
+    - workers: quantidade de getters executados em paralelo (1 = sequencial);
+      se None, usa CSINFO_WORKERS_LOCAL (padrão 4) ou CSINFO_WORKERS_REMOTE
+      (padrão 2) conforme o alvo. Ver csinfo._dag.
+    - force_refresh: True (ou uma coleção de nomes de seção) ignora o cache
+      persistente das seções estáveis (habilitado com CSINFO_SECTION_CACHE=1);
+      se None, usa CSINFO_FORCE_REFRESH=1.
+      Seções servidas do cache são marcadas no relatório. Ver csinfo._sectioncache.
+    - delta: True busca antes impressões digitais baratas (registro Uninstall,
+      boot, dispositivos PnP, discos) e só recoleta as seções cujo grupo
+      mudou desde a última coleta do host; se None, usa CSINFO_DELTA=1.
+      Ver csinfo._delta.
+    - output_dir: pasta onde o TXT/PDF é gravado (padrão: diretório atual).
+    - store: inventário SQLite onde o snapshot é gravado (caminho ou
+      `InventoryStore`); se None, usa a variável CSINFO_STORE (sem ela, não
+      grava); False desativa. O id do snapshot volta em 'snapshot_id'.
+      Ver csinfo._store.
+    - archive: arquivo deduplicado de coletas onde a coleta é guardada
+      (caminho ou `SnapshotArchive`); se None, usa CSINFO_ARCHIVE (sem ela,
+      não arquiva); False desativa. O id da coleta volta em 'archive_id'.
+      Ver csinfo._archive.
+
+    Se o circuito do host abriu durante a coleta (ver csinfo._breaker), o
+    motivo volta em 'circuit_open' e a coleta não é gravada em `store` nem
+    em `archive`.
+
+    - cancel: `threading.Event`; quando sinalizado, os getters seguintes não
+      são executados e `main()` levanta `CollectionCancelled` sem exportar
+      nem gravar nada (usado pelo tempo limite da frota e por `acollect`).
+
+    As linhas chegam ao `barra_callback` seção a seção, à medida que
+    `iter_collect` as entrega.
+    """
     modo_gui = export_type is not None or barra_callback is not None
     # Inicializar flags de geração
     gerar_txt = False
@@ -3310,6 +3154,194 @@ def main(export_type=None, barra_callback=None, computer_name=None, include_debu
             gerar_txt = escolha in ('1', '3')
             gerar_pdf = escolha in ('2', '3')
 
+    secoes = iter_collect(computer_name, batch=batch, workers=workers, force_refresh=force_refresh, delta=delta, cancel=cancel)
+    try:
+        resultado = _collect_report(secoes, export_type, barra_callback, computer_name, include_debug_on_export, machine_alias, modo_gui, gerar_txt, gerar_pdf, output_dir, cancel)
+    finally:
+        secoes.close()
+    _check_cancel(cancel)
+    # circuito do host aberto durante a coleta: seções vazias por recusa, não
+    # por falta de dados; o relatório não entra no inventário nem no arquivo
+    breaker = _breaker.get_default_breaker() if computer_name else None
+    resultado['circuit_open'] = (breaker.reason(computer_name) or None) if breaker is not None else None
+    resultado['snapshot_id'] = None
+    resultado['archive_id'] = None
+    if resultado['circuit_open']:
+        return resultado
+    if store is not False and (store is not None or os.environ.get('CSINFO_STORE', '0') not in ('', '0')):
+        from . import _store
+        resultado['snapshot_id'] = _store.record(resultado.get('report'), store, host=computer_name or resultado.get('machine'),
+                                                 alias=machine_alias, user=resultado.get('user'))
+    if archive is not False and (archive is not None or os.environ.get('CSINFO_ARCHIVE', '0') not in ('', '0')):
+        from . import _archive
+        resultado['archive_id'] = _archive.record(resultado.get('report'), archive, host=computer_name or resultado.get('machine'),
+                                                  alias=machine_alias, user=resultado.get('user'))
+    return resultado
+
+
+def _identify(computer_name):
+    """(nome da máquina, usuário logado) do alvo."""
+    machine = get_machine_name(computer_name)
+    import getpass
+    if not computer_name or computer_name.lower() == machine.lower():
+        return machine, getpass.getuser()
+    import importlib.util, sys
+    mod_name = "network_discovery"
+    mod_path = os.path.join(os.path.dirname(__file__), "network_discovery.py")
+    spec = importlib.util.spec_from_file_location(mod_name, mod_path)
+    network_discovery = importlib.util.module_from_spec(spec)
+    sys.modules[mod_name] = network_discovery
+    spec.loader.exec_module(network_discovery)
+    return machine, network_discovery.get_logged_user(machine)
+
+
+def _registros(tipo, brutos):
+    return [tipo.from_raw(item) for item in (brutos or [])]
+
+
+def _campo(atributo, no, tipo=None):
+    """Preenchedor de seção: `report.<atributo>` a partir do resultado do nó."""
+    def preencher(report, resultado, computer_name):
+        valor = resultado(no)
+        setattr(report, atributo, _registros(tipo, valor) if tipo is not None else valor)
+    return preencher
+
+
+def _campos(*preenchedores):
+    def preencher(report, resultado, computer_name):
+        for p in preenchedores:
+            p(report, resultado, computer_name)
+    return preencher
+
+
+def _preencher_identificacao(report, resultado, computer_name):
+    machine, usuario_logado = _identify(computer_name)
+    # Determinar tipo com base no ChassisTypes quando possível
+    tipo_chassi = resultado('get_chassis_type_name')
+    if not tipo_chassi or tipo_chassi == 'Desconhecido':
+        # fallback conservador: usar heurística de is_laptop
+        tipo_chassi = 'Notebook' if is_laptop(computer_name, monitors=resultado('monitors')) else 'Desktop'
+    report.identification = _model.Identification(machine, tipo_chassi, usuario_logado, time.time())
+
+
+def _preencher_teclado_mouse(report, resultado, computer_name):
+    report.keyboard, report.mouse = resultado('get_keyboard_mouse_status')
+
+
+def _preencher_placa_mae(report, resultado, computer_name):
+    report.motherboard = _model.Motherboard.from_raw(resultado('get_motherboard_info'))
+
+
+def _preencher_admins(report, resultado, computer_name):
+    # get_admin_users retorna apenas strings (nomes)
+    report.admins = [user if isinstance(user, str) else user.get('Name', '') for user in (resultado('get_admin_users') or [])]
+
+
+# Seções do relatório (mesma ordem de csinfo._model.SECTIONS): (seção, nós de
+# _COLLECTION_GRAPH usados, preenchedor do Report)
+_REPORT_SECTIONS = (
+    ('identification', ('get_chassis_type_name',), _preencher_identificacao),
+    ('windows', ('get_os_version', 'get_windows_activation_status'),
+     _campos(_campo('os_version', 'get_os_version'), _campo('windows_status', 'get_windows_activation_status'))),
+    ('office', ('get_office_version', 'get_office_activation_status'),
+     _campos(_campo('office_version', 'get_office_version'), _campo('office_status', 'get_office_activation_status'))),
+    ('sql_servers', ('get_sql_server_info',), _campo('sql_servers', 'get_sql_server_info', _model.SqlInstance)),
+    ('antivirus', ('get_antivirus_info',), _campo('antivirus', 'get_antivirus_info', _model.Antivirus)),
+    ('domain', ('is_domain_computer',), _campo('domain', 'is_domain_computer')),
+    ('memory', ('get_memory_info', 'get_memory_modules_info'),
+     _campos(_campo('memory_total', 'get_memory_info'), _campo('memory_modules', 'get_memory_modules_info', _model.MemoryModule))),
+    ('processors', ('get_processor_info',), _campo('processors', 'get_processor_info', _model.Processor)),
+    ('disks', ('get_disk_info',), _campo('disks', 'get_disk_info', _model.Disk)),
+    ('logical_drives', ('get_logical_drives_info',), _campo('logical_drives', 'get_logical_drives_info', _model.LogicalDrive)),
+    ('monitors', ('monitors',), _campo('monitors', 'monitors', _model.Monitor)),
+    ('keyboard_mouse', ('get_keyboard_mouse_status',), _preencher_teclado_mouse),
+    ('motherboard', ('get_motherboard_info',), _preencher_placa_mae),
+    ('network_adapters', ('get_network_adapters_info',), _campo('network_adapters', 'get_network_adapters_info', _model.NetworkAdapter)),
+    ('video_cards', ('get_video_cards_info',), _campo('video_cards', 'get_video_cards_info', _model.VideoCard)),
+    ('printers', ('get_printers',), _campo('printers', 'get_printers', _model.Printer)),
+    ('network_interfaces', ('get_network_details',), _campo('network_interfaces', 'get_network_details', _model.NetworkInterface)),
+    ('security', ('get_firewall_status', 'get_firewall_controller', 'get_windows_update_status'),
+     _campos(_campo('firewall', 'get_firewall_status', _model.FirewallProfile),
+             _campo('firewall_controller', 'get_firewall_controller'),
+             _campo('windows_update', 'get_windows_update_status'))),
+    ('footer', (), _campos()),
+    ('admins', ('get_admin_users',), _preencher_admins),
+    ('software', ('get_installed_software',), _campo('software', 'get_installed_software', _model.Software)),
+)
+assert tuple(secao for secao, _nos, _p in _REPORT_SECTIONS) == tuple(secao for secao, _r in _model.SECTIONS)
+
+
+def iter_collect(computer_name=None, batch=None, workers=None, force_refresh=None, ordered=True, delta=None, cancel=None):
+    """Coleta o alvo entregando cada seção do relatório assim que fica pronta.
+
+    Gera `csinfo._model.SectionResult` (linhas formatadas, status, tempos); o
+    `Report` completo fica em `.report` de qualquer seção. Com `ordered=True`
+    as seções saem na ordem do relatório; com `ordered=False`, na ordem em que
+    os getters terminam. `batch`, `workers`, `force_refresh`, `delta` e
+    `cancel` como em `main()`. Uma falha em um getter não interrompe a coleta:
+    a seção sai com status 'erro' e os campos vazios. Com `cancel` sinalizado
+    a próxima seção levanta `CollectionCancelled`.
+    """
+    if batch is None:
+        batch = os.environ.get('CSINFO_BATCH') == '1'
+    inicio = time.perf_counter()
+    grafo, secoes_cache = _collection_graph(computer_name, force_refresh, delta)
+    # seções já servidas pelo cache persistente ficam fora do script em lote
+    getters_lote = tuple(getter for nome, getter, _deps in _COLLECTION_GRAPH if nome not in secoes_cache and nome not in _FORA_DO_LOTE)
+    plano_lote = _batch.prefetch(getters_lote, computer_name) if batch else None
+    consultas = _querycache.begin(computer_name)
+    coleta = _dag.GetterRun(grafo, computer_name, max_workers=_collection_workers(computer_name, workers), cancel=cancel)
+    report = _model.Report(cached=dict(secoes_cache))
+    try:
+        pendentes = list(_REPORT_SECTIONS)
+        while pendentes:
+            _check_cancel(cancel)
+            # seções sem getters (rodapé) só saem depois das demais pendentes
+            idx = 0 if ordered else coleta.wait_ready([nos or ('',) for _secao, nos, _p in pendentes])
+            secao, nos, preencher = pendentes.pop(idx)
+            status, erro = 'ok', None
+            try:
+                preencher(report, coleta.result, computer_name)
+            except Exception as e:
+                status, erro = 'erro', str(e) or e.__class__.__name__
+            # getter recusado pelo cancelamento: não é um erro da seção
+            _check_cancel(cancel)
+            tempos = [coleta.timings[no] for no in nos if no in coleta.timings]
+            cache_ts = [secoes_cache[no] for no in nos if no in secoes_cache]
+            if status == 'ok' and nos and len(cache_ts) == len(nos):
+                status = 'cache'
+            yield _model.SectionResult(
+                secao, _model.section_lines(report, secao), status, erro,
+                max(fim for _i, fim in tempos) - min(ini for ini, _f in tempos) if tempos else 0.0,
+                time.perf_counter() - inicio,
+                max(cache_ts) if cache_ts else None,
+                report,
+            )
+    finally:
+        coleta.close()
+        consultas.release()
+        if plano_lote is not None:
+            plano_lote.release()
+
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise _dag.CollectionCancelled()
+
+
+# etapas de progresso de main() concluídas com cada seção (a mesma sequência
+# de antes da coleta por seções: versão e ativação do Windows/Office e a
+# memória total e os pentes contam cada um a sua etapa)
+_SECTION_STEPS = {
+    'identification': (2,), 'windows': (4, 5), 'office': (6, 7), 'sql_servers': (8,), 'antivirus': (9,),
+    'domain': (10,), 'memory': (11, 12), 'processors': (13,), 'disks': (14,), 'logical_drives': (15,),
+    'monitors': (16,), 'keyboard_mouse': (17,), 'motherboard': (18,), 'network_adapters': (19,),
+    'video_cards': (20,), 'printers': (21,), 'admins': (22,), 'software': (23,),
+}
+
+
+def _collect_report(secoes, export_type, barra_callback, computer_name, include_debug_on_export, machine_alias, modo_gui, gerar_txt, gerar_pdf, output_dir=None, cancel=None):
+    # As seções chegam de iter_collect na ordem do relatório.
     etapas = [
         "Obtendo nome do computador",
         "Verificando tipo (Notebook/Desktop)",
@@ -3353,32 +3385,28 @@ def main(export_type=None, barra_callback=None, computer_name=None, include_debu
     if barra_callback and callable(barra_callback):
         barra_progresso.callback = barra_callback
 
+    lines = []
     # Adiciona callback para cada linha apurada
     def add_line(line):
         lines.append(line)
-        try:
-            emitted_lines.append(line)
-        except Exception:
-            pass
         if barra_callback:
             try:
                 barra_callback(None, line)
             except Exception:
                 pass
 
-    machine = get_machine_name(computer_name); barra_progresso(1)
-    import getpass
-    if not computer_name or computer_name.lower() == machine.lower():
-        usuario_logado = getpass.getuser()
-    else:
-        import importlib.util, sys
-        mod_name = "network_discovery"
-        mod_path = os.path.join(os.path.dirname(__file__), "network_discovery.py")
-        spec = importlib.util.spec_from_file_location(mod_name, mod_path)
-        network_discovery = importlib.util.module_from_spec(spec)
-        sys.modules[mod_name] = network_discovery
-        spec.loader.exec_module(network_discovery)
-        usuario_logado = network_discovery.get_logged_user(machine)
+    barra_progresso(1)
+    report = None
+    for secao in secoes:
+        report = secao.report
+        for line in secao.lines:
+            add_line(line)
+        for etapa in _SECTION_STEPS.get(secao.name, ()):
+            barra_progresso(etapa)
+    _check_cancel(cancel)
+
+    machine = report.identification.computer_name
+    usuario_logado = report.identification.generated_by
     safe_name = safe_filename(machine)
     # Se houver apelido (machine_alias), use o padrão Info_maquina_<apelido>_<nomemaquina>.txt
     if machine_alias and str(machine_alias).strip():
@@ -3386,291 +3414,7 @@ def main(export_type=None, barra_callback=None, computer_name=None, include_debu
         filename = f"Info_maquina_{safe_alias}_{safe_name}.txt"
     else:
         filename = f"Info_maquina_{safe_name}.txt"
-    path = os.path.join(os.getcwd(), filename)
-
-    lines = []
-    emitted_lines = []
-    def padrao(valor):
-        return valor if valor and str(valor).strip() else "NÃO OBTIDO"
-    
-    # LINHAS INICIAIS SOLICITADAS: Nome, Tipo, Gerado por
-    # Inserir título textual para exportações em TXT quando o PDF não for gerado
-    try:
-        add_line("IDENTIFICAÇÃO")
-    except Exception:
-        pass
-    add_line(f"Nome do computador: {machine}")
-    # Determinar tipo com base no ChassisTypes quando possível
-    tipo_chassi = get_chassis_type_name(computer_name)
-    if tipo_chassi and tipo_chassi != 'Desconhecido':
-        add_line(f"Tipo: {tipo_chassi}")
-    else:
-        # fallback conservador: usar heurística de is_laptop
-        add_line(f"Tipo: {'Notebook' if is_laptop(computer_name) else 'Desktop'}")
-    add_line(f"Gerado por: {usuario_logado}")
-    add_line("")
-    # (Cabeçalho visual será desenhado pelo template do PDF; não adicionamos essas linhas ao corpo)
-    # DATA DE GERAÇÃO
-    add_line(f"Relatório gerado em: {datetime.now().strftime('%d/%m/%Y - %H:%M')}")
-    add_line("")
-    barra_progresso(2)
-    
-    # INFORMAÇÕES DO SISTEMA
-    add_line("INFORMAÇÕES DO SISTEMA")
-    add_line(f"Versão do sistema operacional: {get_os_version(computer_name)}"); barra_progresso(4)
-    add_line(f"  Status do sistema operacional: {get_windows_activation_status(computer_name)}"); barra_progresso(5)
-    add_line("")  # Linha em branco após Windows
-    add_line(f"Versão do Office: {get_office_version(computer_name)}"); barra_progresso(6)
-    add_line(f"  Status do Office: {get_office_activation_status(computer_name)}"); barra_progresso(7)
-    add_line("")  # Linha em branco após Office
-    
-    # SQL Server
-    sql_instances = get_sql_server_info(computer_name)
-    if sql_instances:
-        for idx, instance in enumerate(sql_instances, start=1):
-            instance_name = padrao(instance.get('Instance', ''))
-            version = padrao(instance.get('Version', ''))
-            status = padrao(instance.get('Status', ''))
-            add_line(f"SQL Server {idx}: Instância: {instance_name} | Versão: {version} | Status: {status}")
-    else:
-        add_line("SQL Server: NÃO INSTALADO")
-    add_line("")  # Linha em branco após SQL Server
-    barra_progresso(8)
-    
-    # Antivírus
-    antivirus_list = get_antivirus_info(computer_name)
-    if antivirus_list:
-        for idx, av in enumerate(antivirus_list, start=1):
-            name = padrao(av.get('Name', ''))
-            enabled = padrao(av.get('Enabled', ''))
-            add_line(f"Antivírus {idx}: {name} | Status: {enabled}")
-    else:
-        add_line("Antivírus: NÃO DETECTADO")
-    add_line("")  # Linha em branco após Antivírus
-    barra_progresso(9)
-    
-    add_line(f"Rede: {is_domain_computer(computer_name)}"); barra_progresso(10)
-    add_line("")
-    
-    # INFORMAÇÕES DE HARDWARE
-    add_line("INFORMAÇÕES DE HARDWARE")
-    
-    # MEMÓRIA RAM
-    add_line(f"Memória RAM total: {get_memory_info(computer_name)}"); barra_progresso(11)
-    
-    # Pentes de memória
-    memory_modules = get_memory_modules_info(computer_name)
-    if memory_modules:
-        for idx, module in enumerate(memory_modules, start=1):
-            manufacturer = padrao(module.get('Manufacturer', ''))
-            part_number = padrao(module.get('PartNumber', ''))
-            capacity = padrao(module.get('Capacity', ''))
-            speed = padrao(module.get('Speed', ''))
-            mem_type = padrao(module.get('MemoryType', ''))
-            form_factor = padrao(module.get('FormFactor', ''))
-            location = padrao(module.get('Location', ''))
-            add_line(f"  Pente de Memória {idx}: {capacity} | {mem_type} | {speed} | {form_factor}")
-            add_line(f"    Fabricante: {manufacturer}")
-    else:
-        add_line("  Pentes de Memória: NÃO OBTIDO")
-    add_line("")  # Linha em branco após Memória
-    barra_progresso(12)
-    
-    # PROCESSADOR
-    processors = get_processor_info(computer_name)
-    if processors:
-        for idx, cpu in enumerate(processors, start=1):
-            name = padrao(cpu.get('Name', ''))
-            manufacturer = padrao(cpu.get('Manufacturer', ''))
-            cores = padrao(cpu.get('Cores', ''))
-            logical = padrao(cpu.get('LogicalProcessors', ''))
-            max_speed = padrao(cpu.get('MaxSpeed', ''))
-            arch = padrao(cpu.get('Architecture', ''))
-            l2_cache = padrao(cpu.get('L2Cache', ''))
-            l3_cache = padrao(cpu.get('L3Cache', ''))
-            add_line(f"Processador {idx}: {name}")
-            add_line(f"  Cores: {cores} físicos | {logical} lógicos")
-            add_line(f"  Cache: L2: {l2_cache} | L3: {l3_cache}")
-            add_line(f"  Fabricante: {manufacturer}")
-    else:
-        add_line("Processador: NÃO OBTIDO")
-    add_line("")  # Linha em branco após Processador
-    barra_progresso(13)
-    
-    # DISCOS
-    disks = get_disk_info(computer_name)
-    if disks:
-        for idx, (modelo, tamanho, espaco_usado, espaco_livre, particoes, tipo, interface) in enumerate(disks, start=1):
-            add_line(f"Disco {idx}: {padrao(modelo)} | Tamanho: {padrao(tamanho)}")
-            add_line(f"  Tipo: {padrao(tipo)} | Interface: {padrao(interface)}")
-    else:
-        add_line("Disco: NÃO OBTIDO")
-    barra_progresso(14)
-
-    # Unidades (após todos os discos)
-    logical_drives = get_logical_drives_info(computer_name)
-    if logical_drives:
-        for drive in logical_drives:
-            drive_letter = padrao(drive.get('Drive', ''))
-            size = padrao(drive.get('Size', ''))
-            used = padrao(drive.get('Used', ''))
-            free = padrao(drive.get('Free', ''))
-            file_system = padrao(drive.get('FileSystem', ''))
-            label = padrao(drive.get('Label', ''))
-            # Truncar espaço usado para 2 casas decimais
-            try:
-                used_float = float(used)
-                used = f"{used_float:.2f}"
-            except:
-                pass
-            try:
-                size_float = float(size)
-                size = f"{size_float:.2f}"
-            except:
-                pass
-            try:
-                free_float = float(free)
-                free = f"{free_float:.2f}"
-            except:
-                pass
-            lines.append(f"Unidade {drive_letter} ({label}) | Total: {size} GB | Usado: {used} GB | Livre: {free} GB | Sistema: {file_system}")
-    else:
-        lines.append("Unidades lógicas: NÃO OBTIDO")
-    lines.append("")  # Linha em branco após unidades lógicas
-    barra_progresso(15)
-
-    # MONITORES
-    monitors = get_monitor_infos(computer_name)
-    if monitors:
-        for idx, m in enumerate(monitors, start=1):
-            lines.append(f"Monitor {idx}: {padrao(m.get('Fabricante',''))} | Modelo: {padrao(m.get('Modelo',''))} | Serial: {padrao(m.get('Serial',''))}")
-    else:
-        lines.append("Monitor 1: NÃO OBTIDO")
-    lines.append("")  # Linha em branco após monitores
-    barra_progresso(16)
-
-    # TECLADO
-    has_keyboard, has_mouse = get_keyboard_mouse_status(computer_name)
-    lines.append(f"Teclado conectado: {'SIM' if has_keyboard else 'NÃO'}")
-    
-    # MOUSE
-    lines.append(f"Mouse conectado: {'SIM' if has_mouse else 'NÃO'}")
-    lines.append("")  # Linha em branco após teclado/mouse
-    barra_progresso(17)
-
-    # PLACA MÃE
-    fabricante_mb, modelo_mb, serial_mb = get_motherboard_info(computer_name)
-    lines.append(f"Placa mãe: {padrao(fabricante_mb)} | Modelo: {padrao(modelo_mb)} | Serial: {padrao(serial_mb)}")
-    lines.append("")  # Linha em branco após placa mãe
-    barra_progresso(18)
-
-    # PLACA DE REDE
-    network_adapters = get_network_adapters_info(computer_name)
-    if network_adapters:
-        for idx, adapter in enumerate(network_adapters, start=1):
-            name = padrao(adapter.get('Name', ''))
-            manufacturer = padrao(adapter.get('Manufacturer', ''))
-            speed = padrao(adapter.get('Speed', ''))
-            mac = padrao(adapter.get('MACAddress', ''))
-            lines.append(f"Placa de Rede {idx}: {name} | Fabricante: {manufacturer} | Velocidade: {speed} | MAC: {mac}")
-    else:
-        lines.append("Placa de Rede: NÃO OBTIDO")
-    lines.append("")  # Linha em branco após placa de rede
-    barra_progresso(19)
-
-    # PLACA DE VÍDEO
-    video_cards = get_video_cards_info(computer_name)
-    if video_cards:
-        for idx, card in enumerate(video_cards, start=1):
-            name = padrao(card.get('Name', ''))
-            manufacturer = padrao(card.get('Manufacturer', ''))
-           
-            memory = padrao(card.get('Memory', ''))
-
-            card_type = padrao(card.get('Type', ''))
-            lines.append(f"Placa de Vídeo {idx}: {name} | Fabricante: {manufacturer} | Memória: {memory} | Tipo: {card_type}")
-    else:
-        lines.append("Placa de Vídeo: NÃO OBTIDO")
-    lines.append("")  # Linha em branco após placa de vídeo
-    barra_progresso(20)
-
-    # IMPRESSORAS
-    printers = get_printers(computer_name)
-    if printers:
-        for idx, (name, serial, fabricante, modelo) in enumerate(printers, start=1):
-            lines.append(f"Impressora {idx}: {padrao(name)} | Serial/ID: {padrao(serial)} | Fabricante: {padrao(fabricante)} | Modelo: {padrao(modelo)}")
-    else:
-        lines.append("Impressora: NÃO OBTIDO")
-    lines.append("")
-    barra_progresso(21)
-    # --- INFORMAÇÕES DE REDE (moveram para cá) ---
-    lines.append("")
-    lines.append("INFORMAÇÕES DE REDE")
-    if network_details:
-        for idx, net in enumerate(network_details, start=1):
-            ip = padrao(net.get('IP', ''))
-            gw = padrao(net.get('Gateway', ''))
-            dns = padrao(net.get('DNS', ''))
-            mac = padrao(net.get('MAC', ''))
-            desc = padrao(net.get('Descricao', ''))
-            lines.append(f"Adaptador {idx}: {desc}")
-            lines.append(f"  IP: {ip} | Gateway: {gw} | DNS: {dns} | MAC: {mac}")
-    else:
-        lines.append("Informações de rede: NÃO OBTIDO")
-
-    lines.append("")
-    lines.append("SEGURANÇA DO SISTEMA")
-    # Firewall
-    lines.append("Firewall:")
-    if firewall_status:
-        for fw in firewall_status:
-            perfil = padrao(fw.get('Perfil', ''))
-            ativado = 'Ativado' if fw.get('Ativado', False) else 'Desativado'
-            lines.append(f"  Perfil: {perfil} | Status: {ativado}")
-    else:
-        lines.append("  Status: NÃO OBTIDO")
-    # Controle externo do firewall
-    if firewall_controller and firewall_controller != "Windows Firewall (padrão)" and firewall_controller != "NÃO OBTIDO":
-        lines.append(f"Firewall controlado por: {firewall_controller}")
-    # Espaço de uma linha antes do Windows Update
-    lines.append("")
-    # Windows Update
-    if windows_update_status:
-        lines.append("Windows Update:")
-        lines.append(f"  {windows_update_status}")
-    else:
-        lines.append("Windows Update: NÃO OBTIDO")
-
-    # RODAPÉ (mantido mais adiante)
-    lines.append("")
-    lines.append("")
-    lines.append("CSInfo by CEOsoftware")
-
-    # ADMINISTRADORES (mantém como está)
-    lines.append("ADMINISTRADORES")
-    admin_users = get_admin_users(computer_name)
-    if admin_users:
-        for idx, user in enumerate(admin_users, start=1):
-            # Como agora get_admin_users retorna apenas strings (nomes)
-            name = padrao(user if isinstance(user, str) else user.get('Name', ''))
-            lines.append(f"Administrador {idx}: {name}")
-    else:
-        lines.append("Usuários Administradores: NÃO OBTIDO")
-    barra_progresso(22)
-
-    # SOFTWARES INSTALADOS (mantém como está)
-    lines.append("")  # Linha em branco para separar
-    lines.append("SOFTWARES INSTALADOS")
-    installed_software = get_installed_software(computer_name)
-    if installed_software:
-        for idx, software in enumerate(installed_software, start=1):
-            name = padrao(software.get('Name', ''))
-            version = padrao(software.get('Version', ''))
-            publisher = padrao(software.get('Publisher', ''))
-            lines.append(f"{idx}. {name} | Versão: {version} | Editor: {publisher}")
-    else:
-        lines.append("Nenhum software detectado")
-    barra_progresso(23)
+    path = os.path.join(output_dir or os.getcwd(), filename)
 
     # Só gera TXT/PDF se export_type for passado explicitamente e for um dos valores esperados
     pdf_path = path.replace('.txt', '.pdf')
@@ -3687,7 +3431,7 @@ def main(export_type=None, barra_callback=None, computer_name=None, include_debu
         if export_type in ('pdf', 'ambos'):
             try:
                 print("Gerando arquivo PDF...")
-                ok = write_pdf_report(pdf_path, lines, machine)
+                ok = write_pdf_report(pdf_path, report, machine)
                 if ok:
                     print(f"Arquivo PDF gerado com sucesso: {pdf_path}")
                 else:
@@ -3711,24 +3455,8 @@ def main(export_type=None, barra_callback=None, computer_name=None, include_debu
         'txt': path if export_type in ('txt', 'ambos') and os.path.exists(path) else None,
         'pdf': pdf_path if pdf_path and os.path.exists(pdf_path) else None,
         'lines': lines,
+        'report': report,
         'machine': machine,
         'user': usuario_logado
     }
-    # Se em modo GUI e foi passado um barra_callback, enviar qualquer linha
-    # que tenha sido adicionada diretamente a `lines` mas não foi encaminhada
-    # via add_line durante a execução.
-    if barra_callback:
-        try:
-            for l in lines:
-                try:
-                    if l not in emitted_lines:
-                        barra_callback(None, l)
-                except Exception:
-                    try:
-                        barra_callback(None, str(l))
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-
     return resultado
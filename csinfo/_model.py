@@ -0,0 +1,504 @@
+"""Modelo estruturado do resultado de uma coleta.
+
+`main()` montava diretamente uma lista de linhas já formatadas em português e
+o PDF (`write_pdf_report`) precisava reinterpretar essas linhas com
+`startswith`/`split(':')` para reconstruir as seções. Agora a
+coleta produz um `Report` com registros compactos (`__slots__`) por seção —
+processadores, pentes de memória, discos, unidades, placas de rede,
+softwares etc. — e cada formato é gerado a partir dele:
+
+- `render_lines(report)`: as linhas do relatório (TXT e painel da GUI),
+  idênticas às geradas antes;
+- `section_lines(report, secao)`: as linhas de uma seção, usadas por
+  `iter_collect` para entregar cada seção assim que fica pronta;
+- `group_lines(report)`: os agrupamentos do PDF (sistema, hardware, rede...),
+  montados seção a seção; a identificação vem de `identification_fields`.
+
+Os registros guardam os valores como os getters os devolvem (vazios ficam
+vazios); o "NÃO OBTIDO" e os arredondamentos são aplicados na formatação.
+`Report.as_dict()`/`Report.from_dict()` convertem de/para estruturas JSON,
+para gravar, cachear e comparar coletas.
+"""
+from datetime import datetime
+
+NAO_OBTIDO = "NÃO OBTIDO"
+
+
+def padrao(valor):
+    return valor if valor and str(valor).strip() else NAO_OBTIDO
+
+
+class Record(object):
+    """Registro com campos fixos (`__slots__`), comparável e serializável."""
+
+    __slots__ = ()
+    # chaves do dicionário devolvido pelo getter, na ordem de __slots__
+    RAW_KEYS = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name in self.__slots__[len(args):]:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"{self.__class__.__name__}: campos desconhecidos {sorted(kwargs)}")
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Cria o registro a partir do dict (ou tupla) devolvido pelo getter."""
+        if isinstance(raw, dict):
+            return cls(*[raw.get(key, '') for key in cls.RAW_KEYS])
+        return cls(*raw)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        campos = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({campos})"
+
+
+class Identification(Record):
+    __slots__ = ('computer_name', 'machine_type', 'generated_by', 'generated_at')
+
+
+class SqlInstance(Record):
+    __slots__ = ('instance', 'version', 'status')
+    RAW_KEYS = ('Instance', 'Version', 'Status')
+
+
+class Antivirus(Record):
+    __slots__ = ('name', 'enabled')
+    RAW_KEYS = ('Name', 'Enabled')
+
+
+class MemoryModule(Record):
+    __slots__ = ('capacity', 'memory_type', 'speed', 'form_factor', 'manufacturer', 'part_number', 'location')
+    RAW_KEYS = ('Capacity', 'MemoryType', 'Speed', 'FormFactor', 'Manufacturer', 'PartNumber', 'Location')
+
+
+class Processor(Record):
+    __slots__ = ('name', 'manufacturer', 'cores', 'logical_processors', 'max_speed', 'architecture', 'l2_cache', 'l3_cache')
+    RAW_KEYS = ('Name', 'Manufacturer', 'Cores', 'LogicalProcessors', 'MaxSpeed', 'Architecture', 'L2Cache', 'L3Cache')
+
+
+class Disk(Record):
+    # tupla de get_disk_info: (modelo, tamanho, usado, livre, partições, tipo, interface)
+    __slots__ = ('model', 'size', 'used', 'free', 'partitions', 'disk_type', 'interface')
+
+
+class LogicalDrive(Record):
+    __slots__ = ('drive', 'label', 'size', 'used', 'free', 'file_system')
+    RAW_KEYS = ('Drive', 'Label', 'Size', 'Used', 'Free', 'FileSystem')
+
+
+class Monitor(Record):
+    __slots__ = ('manufacturer', 'model', 'serial')
+    RAW_KEYS = ('Fabricante', 'Modelo', 'Serial')
+
+
+class Motherboard(Record):
+    # tupla de get_motherboard_info: (fabricante, modelo, serial)
+    __slots__ = ('manufacturer', 'model', 'serial')
+
+
+class NetworkAdapter(Record):
+    __slots__ = ('name', 'manufacturer', 'speed', 'mac')
+    RAW_KEYS = ('Name', 'Manufacturer', 'Speed', 'MACAddress')
+
+
+class VideoCard(Record):
+    __slots__ = ('name', 'manufacturer', 'memory', 'card_type')
+    RAW_KEYS = ('Name', 'Manufacturer', 'Memory', 'Type')
+
+
+class Printer(Record):
+    # tupla de get_printers: (nome, serial, fabricante, modelo)
+    __slots__ = ('name', 'serial', 'manufacturer', 'model')
+
+
+class NetworkInterface(Record):
+    __slots__ = ('description', 'ip', 'gateway', 'dns', 'mac')
+    RAW_KEYS = ('Descricao', 'IP', 'Gateway', 'DNS', 'MAC')
+
+
+class FirewallProfile(Record):
+    __slots__ = ('profile', 'enabled')
+
+    @classmethod
+    def from_raw(cls, raw):
+        return cls(raw.get('Perfil', ''), bool(raw.get('Ativado', False)))
+
+
+class Software(Record):
+    __slots__ = ('name', 'version', 'publisher')
+    RAW_KEYS = ('Name', 'Version', 'Publisher')
+
+
+# campo do Report -> tipo dos itens (listas de registros)
+_LIST_FIELDS = {
+    'sql_servers': SqlInstance,
+    'antivirus': Antivirus,
+    'memory_modules': MemoryModule,
+    'processors': Processor,
+    'disks': Disk,
+    'logical_drives': LogicalDrive,
+    'monitors': Monitor,
+    'network_adapters': NetworkAdapter,
+    'video_cards': VideoCard,
+    'printers': Printer,
+    'network_interfaces': NetworkInterface,
+    'firewall': FirewallProfile,
+    'software': Software,
+}
+_RECORD_FIELDS = {
+    'identification': Identification,
+    'motherboard': Motherboard,
+}
+
+
+class Report(Record):
+    """Resultado completo de uma coleta.
+
+    `cached` mapeia seções servidas pelo cache persistente (nomes dos nós de
+    `_COLLECTION_GRAPH`) para o instante em que foram coletadas.
+    """
+
+    __slots__ = (
+        'identification',
+        'os_version', 'windows_status', 'office_version', 'office_status',
+        'sql_servers', 'antivirus', 'domain',
+        'memory_total', 'memory_modules', 'processors', 'disks', 'logical_drives',
+        'monitors', 'keyboard', 'mouse', 'motherboard', 'network_adapters',
+        'video_cards', 'printers', 'network_interfaces', 'firewall',
+        'firewall_controller', 'windows_update', 'admins', 'software', 'cached',
+    )
+
+    def __init__(self, *args, **kwargs):
+        super(Report, self).__init__(*args, **kwargs)
+        for name in _LIST_FIELDS:
+            if getattr(self, name) is None:
+                setattr(self, name, [])
+        if self.admins is None:
+            self.admins = []
+        if self.cached is None:
+            self.cached = {}
+
+    def as_dict(self):
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if name in _LIST_FIELDS:
+                value = [item.as_dict() for item in value]
+            elif isinstance(value, Record):
+                value = value.as_dict()
+            elif name in ('admins',):
+                value = list(value)
+            elif name == 'cached':
+                value = dict(value)
+            data[name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        kwargs = {}
+        for name in cls.__slots__:
+            value = data.get(name)
+            if name in _LIST_FIELDS:
+                value = [_LIST_FIELDS[name].from_dict(item) for item in (value or [])]
+            elif name in _RECORD_FIELDS and isinstance(value, dict):
+                value = _RECORD_FIELDS[name].from_dict(value)
+            kwargs[name] = value
+        return cls(**kwargs)
+
+
+class SectionResult(Record):
+    """Seção concluída, produzida por `csinfo.iter_collect`.
+
+    - name: nome da seção (ver SECTIONS); lines: linhas já formatadas
+    - status: 'ok', 'cache' (servida pelo cache persistente) ou 'erro'
+    - error: mensagem da falha quando status == 'erro'
+    - duration: segundos gastos pelos getters da seção
+    - ready_at: segundos desde o início da coleta até a seção ficar pronta
+    - cached_at: instante da coleta em cache (status 'cache')
+    - report: o `Report` em construção (o mesmo objeto em todas as seções)
+    """
+
+    __slots__ = ('name', 'lines', 'status', 'error', 'duration', 'ready_at', 'cached_at', 'report')
+
+    def as_dict(self):
+        data = super(SectionResult, self).as_dict()
+        data.pop('report', None)
+        return data
+
+
+# --- formatação em linhas (TXT / GUI) ---------------------------------------
+
+def _cache_lines(report, node):
+    ts = report.cached.get(node)
+    if ts:
+        return [f"  (dados em cache, coletados em {datetime.fromtimestamp(ts).strftime('%d/%m/%Y %H:%M')})"]
+    return []
+
+
+def identification_fields(report):
+    """Pares (rótulo, valor) da identificação, na ordem do relatório."""
+    ident = report.identification or Identification()
+    return [
+        ('Nome do computador', ident.computer_name),
+        ('Tipo', ident.machine_type),
+        ('Gerado por', ident.generated_by),
+        ('Relatório gerado em', datetime.fromtimestamp(ident.generated_at or 0).strftime('%d/%m/%Y - %H:%M')),
+    ]
+
+
+def _identification(report, fields=True):
+    pares = [f"{rotulo}: {valor}" for rotulo, valor in identification_fields(report)] if fields else []
+    return ["IDENTIFICAÇÃO"] + pares[:3] + [""] + pares[3:] + [""]
+
+
+def _windows(report, title=True):
+    return (["INFORMAÇÕES DO SISTEMA"] if title else []) + [
+        f"Versão do sistema operacional: {report.os_version}",
+        f"  Status do sistema operacional: {report.windows_status}",
+        "",
+    ]
+
+
+def _office(report):
+    return [
+        f"Versão do Office: {report.office_version}",
+        f"  Status do Office: {report.office_status}",
+        "",
+    ]
+
+
+def _sql(report):
+    lines = [f"SQL Server {idx}: Instância: {padrao(s.instance)} | Versão: {padrao(s.version)} | Status: {padrao(s.status)}"
+             for idx, s in enumerate(report.sql_servers, start=1)]
+    return (lines or ["SQL Server: NÃO INSTALADO"]) + [""]
+
+
+def _antivirus(report):
+    lines = [f"Antivírus {idx}: {padrao(av.name)} | Status: {padrao(av.enabled)}"
+             for idx, av in enumerate(report.antivirus, start=1)]
+    return (lines or ["Antivírus: NÃO DETECTADO"]) + [""]
+
+
+def _domain(report):
+    return [f"Rede: {report.domain}", ""]
+
+
+def _memory(report, title=True):
+    lines = (["INFORMAÇÕES DE HARDWARE"] if title else []) + [f"Memória RAM total: {report.memory_total}"]
+    for idx, m in enumerate(report.memory_modules, start=1):
+        lines.append(f"  Pente de Memória {idx}: {padrao(m.capacity)} | {padrao(m.memory_type)} | {padrao(m.speed)} | {padrao(m.form_factor)}")
+        lines.append(f"    Fabricante: {padrao(m.manufacturer)}")
+    if not report.memory_modules:
+        lines.append("  Pentes de Memória: NÃO OBTIDO")
+    return lines + _cache_lines(report, 'get_memory_modules_info') + [""]
+
+
+def _processors(report):
+    lines = []
+    for idx, cpu in enumerate(report.processors, start=1):
+        lines.append(f"Processador {idx}: {padrao(cpu.name)}")
+        lines.append(f"  Cores: {padrao(cpu.cores)} físicos | {padrao(cpu.logical_processors)} lógicos")
+        lines.append(f"  Cache: L2: {padrao(cpu.l2_cache)} | L3: {padrao(cpu.l3_cache)}")
+        lines.append(f"  Fabricante: {padrao(cpu.manufacturer)}")
+    if not report.processors:
+        lines.append("Processador: NÃO OBTIDO")
+    return lines + _cache_lines(report, 'get_processor_info') + [""]
+
+
+def _disks(report):
+    lines = []
+    for idx, d in enumerate(report.disks, start=1):
+        lines.append(f"Disco {idx}: {padrao(d.model)} | Tamanho: {padrao(d.size)}")
+        lines.append(f"  Tipo: {padrao(d.disk_type)} | Interface: {padrao(d.interface)}")
+    return lines or ["Disco: NÃO OBTIDO"]
+
+
+def _gb(valor):
+    # truncar para 2 casas decimais quando numérico
+    valor = padrao(valor)
+    try:
+        return f"{float(valor):.2f}"
+    except Exception:
+        return valor
+
+
+def _logical_drives(report):
+    lines = [f"Unidade {padrao(d.drive)} ({padrao(d.label)}) | Total: {_gb(d.size)} GB | Usado: {_gb(d.used)} GB | Livre: {_gb(d.free)} GB | Sistema: {padrao(d.file_system)}"
+             for d in report.logical_drives]
+    return (lines or ["Unidades lógicas: NÃO OBTIDO"]) + [""]
+
+
+def _monitors(report):
+    lines = [f"Monitor {idx}: {padrao(m.manufacturer)} | Modelo: {padrao(m.model)} | Serial: {padrao(m.serial)}"
+             for idx, m in enumerate(report.monitors, start=1)]
+    return (lines or ["Monitor 1: NÃO OBTIDO"]) + _cache_lines(report, 'monitors') + [""]
+
+
+def _keyboard_mouse(report):
+    return [
+        f"Teclado conectado: {'SIM' if report.keyboard else 'NÃO'}",
+        f"Mouse conectado: {'SIM' if report.mouse else 'NÃO'}",
+        "",
+    ]
+
+
+def _motherboard(report):
+    mb = report.motherboard or Motherboard()
+    return ([f"Placa mãe: {padrao(mb.manufacturer)} | Modelo: {padrao(mb.model)} | Serial: {padrao(mb.serial)}"]
+            + _cache_lines(report, 'get_motherboard_info') + [""])
+
+
+def _network_adapters(report):
+    lines = [f"Placa de Rede {idx}: {padrao(a.name)} | Fabricante: {padrao(a.manufacturer)} | Velocidade: {padrao(a.speed)} | MAC: {padrao(a.mac)}"
+             for idx, a in enumerate(report.network_adapters, start=1)]
+    return (lines or ["Placa de Rede: NÃO OBTIDO"]) + [""]
+
+
+def _video_cards(report):
+    lines = [f"Placa de Vídeo {idx}: {padrao(c.name)} | Fabricante: {padrao(c.manufacturer)} | Memória: {padrao(c.memory)} | Tipo: {padrao(c.card_type)}"
+             for idx, c in enumerate(report.video_cards, start=1)]
+    return (lines or ["Placa de Vídeo: NÃO OBTIDO"]) + _cache_lines(report, 'get_video_cards_info') + [""]
+
+
+def _printers(report):
+    lines = [f"Impressora {idx}: {padrao(p.name)} | Serial/ID: {padrao(p.serial)} | Fabricante: {padrao(p.manufacturer)} | Modelo: {padrao(p.model)}"
+             for idx, p in enumerate(report.printers, start=1)]
+    return (lines or ["Impressora: NÃO OBTIDO"]) + [""]
+
+
+def _network_interfaces(report, title=True):
+    lines = ["", "INFORMAÇÕES DE REDE"] if title else []
+    for idx, n in enumerate(report.network_interfaces, start=1):
+        lines.append(f"Adaptador {idx}: {padrao(n.description)}")
+        lines.append(f"  IP: {padrao(n.ip)} | Gateway: {padrao(n.gateway)} | DNS: {padrao(n.dns)} | MAC: {padrao(n.mac)}")
+    if not report.network_interfaces:
+        lines.append("Informações de rede: NÃO OBTIDO")
+    return lines
+
+
+def _security(report, title=True):
+    lines = (["", "SEGURANÇA DO SISTEMA"] if title else []) + ["Firewall:"]
+    for fw in report.firewall:
+        lines.append(f"  Perfil: {padrao(fw.profile)} | Status: {'Ativado' if fw.enabled else 'Desativado'}")
+    if not report.firewall:
+        lines.append("  Status: NÃO OBTIDO")
+    controller = report.firewall_controller
+    if controller and controller != "Windows Firewall (padrão)" and controller != NAO_OBTIDO:
+        lines.append(f"Firewall controlado por: {controller}")
+    # Espaço de uma linha antes do Windows Update
+    lines.append("")
+    if report.windows_update:
+        lines += ["Windows Update:", f"  {report.windows_update}"]
+    else:
+        lines.append("Windows Update: NÃO OBTIDO")
+    return lines
+
+
+def _footer(report):
+    return ["", "", "CSInfo by CEOsoftware"]
+
+
+def _admins(report, title=True):
+    lines = ["ADMINISTRADORES"] if title else []
+    lines += [f"Administrador {idx}: {padrao(name)}" for idx, name in enumerate(report.admins, start=1)]
+    if not report.admins:
+        lines.append("Usuários Administradores: NÃO OBTIDO")
+    return lines
+
+
+def _software(report, title=True):
+    lines = ["", "SOFTWARES INSTALADOS"] if title else []
+    lines += [f"{idx}. {padrao(s.name)} | Versão: {padrao(s.version)} | Editor: {padrao(s.publisher)}"
+              for idx, s in enumerate(report.software, start=1)]
+    if not report.software:
+        lines.append("Nenhum software detectado")
+    return lines + _cache_lines(report, 'get_installed_software')
+
+
+# seções na ordem do relatório
+SECTIONS = (
+    ('identification', _identification),
+    ('windows', _windows),
+    ('office', _office),
+    ('sql_servers', _sql),
+    ('antivirus', _antivirus),
+    ('domain', _domain),
+    ('memory', _memory),
+    ('processors', _processors),
+    ('disks', _disks),
+    ('logical_drives', _logical_drives),
+    ('monitors', _monitors),
+    ('keyboard_mouse', _keyboard_mouse),
+    ('motherboard', _motherboard),
+    ('network_adapters', _network_adapters),
+    ('video_cards', _video_cards),
+    ('printers', _printers),
+    ('network_interfaces', _network_interfaces),
+    ('security', _security),
+    ('footer', _footer),
+    ('admins', _admins),
+    ('software', _software),
+)
+_RENDERERS = dict(SECTIONS)
+
+# agrupamentos do PDF: (título, seções); a primeira seção de cada grupo é a
+# que traz o título nas linhas do relatório
+GROUPS = (
+    ('INFORMAÇÕES DO SISTEMA', ('windows', 'office', 'sql_servers', 'antivirus', 'domain')),
+    ('INFORMAÇÕES DE HARDWARE', ('memory', 'processors', 'disks', 'logical_drives', 'monitors',
+                                 'keyboard_mouse', 'motherboard', 'network_adapters', 'video_cards', 'printers')),
+    ('INFORMAÇÕES DE REDE', ('network_interfaces',)),
+    ('SEGURANÇA DO SISTEMA', ('security',)),
+    ('ADMINISTRADORES', ('admins',)),
+    ('SOFTWARES INSTALADOS', ('software',)),
+)
+
+
+def section_lines(report, section):
+    """Linhas de uma seção do relatório (ver SECTIONS)."""
+    return _RENDERERS[section](report)
+
+
+def group_lines(report):
+    """Lista (título, linhas) de cada agrupamento do PDF (ver GROUPS).
+
+    As linhas são as do relatório, sem a linha de título do agrupamento.
+    """
+    grupos = []
+    for titulo, secoes in GROUPS:
+        lines = _RENDERERS[secoes[0]](report, title=False)
+        for secao in secoes[1:]:
+            lines += section_lines(report, secao)
+        grupos.append((titulo, lines))
+    return grupos
+
+
+def render_lines(report, identification_fields=True):
+    """Linhas completas do relatório, na ordem de SECTIONS.
+
+    Com `identification_fields=False` os campos da identificação (nome, tipo,
+    gerado por, data) são omitidos — o PDF os desenha a partir do modelo.
+    """
+    lines = []
+    for name, render in SECTIONS:
+        if name == 'identification':
+            lines += _identification(report, fields=identification_fields)
+        else:
+            lines += render(report)
+    return lines
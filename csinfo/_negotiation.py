@@ -0,0 +1,114 @@
+"""Cache persistente da variante de autenticação remota que funcionou por host.
+
+`run_powershell` (e a abertura de PSSessions) tenta, em ordem, Negotiate,
+o padrão do WinRM e Negotiate+SSL. Em um host que só aceita a segunda
+variante, toda chamada queimava uma tentativa inteira (mais o backoff)
+antes de acertar. Este cache registra a variante vencedora por
+(host, usuário), coloca-a em primeiro lugar nas próximas chamadas e persiste
+o resultado em disco entre execuções.
+
+A entrada expira quando a variante lembrada falha `max_failures` vezes
+seguidas (o host mudou de configuração) ou após `ttl` segundos.
+
+Variáveis de ambiente:
+    CSINFO_AUTH_CACHE=0     desabilita o cache (ordem fixa das variantes)
+"""
+import os
+import threading
+import time
+
+from . import _state
+
+
+class NegotiationCache(object):
+    def __init__(self, path=None, ttl=30 * 24 * 3600, max_failures=2):
+        self.path = path or _state.state_path('auth_variants.json')
+        self.ttl = ttl
+        self.max_failures = max_failures
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(computer_name, user=None):
+        return f"{str(computer_name or '').strip().lower()}|{str(user or '').strip().lower()}"
+
+    def _load_locked(self):
+        if self._entries is None:
+            data = _state.load_json(self.path, {})
+            self._entries = data if isinstance(data, dict) else {}
+        return self._entries
+
+    def _save_locked(self):
+        _state.save_json(self.path, self._entries or {})
+
+    def preferred(self, computer_name, user=None):
+        """Nome da variante lembrada para o host, ou None."""
+        with self._lock:
+            entry = self._load_locked().get(self._key(computer_name, user))
+        if not isinstance(entry, dict):
+            return None
+        if self.ttl and time.time() - float(entry.get('ts', 0)) > self.ttl:
+            return None
+        return entry.get('variant')
+
+    def order(self, computer_name, user, variants):
+        """Reordena `variants` [(nome, valor), ...] colocando a lembrada primeiro."""
+        pref = self.preferred(computer_name, user)
+        if not pref:
+            return list(variants)
+        first = [v for v in variants if v[0] == pref]
+        return first + [v for v in variants if v[0] != pref]
+
+    def record_success(self, computer_name, user, variant):
+        key = self._key(computer_name, user)
+        with self._lock:
+            entries = self._load_locked()
+            entry = entries.get(key) or {}
+            changed = entry.get('variant') != variant or entry.get('failures')
+            # regravar também quando o registro está perto de expirar
+            stale = bool(self.ttl) and time.time() - float(entry.get('ts', 0)) > self.ttl / 2.0
+            if changed or stale:
+                entries[key] = {'variant': variant, 'ts': time.time(), 'failures': 0}
+                self._save_locked()
+
+    def record_failure(self, computer_name, user, variant=None):
+        """Conta uma falha da variante lembrada; expira a entrada após `max_failures`."""
+        key = self._key(computer_name, user)
+        with self._lock:
+            entries = self._load_locked()
+            entry = entries.get(key)
+            if not isinstance(entry, dict):
+                return
+            if variant is not None and entry.get('variant') != variant:
+                return
+            entry['failures'] = int(entry.get('failures', 0)) + 1
+            if entry['failures'] >= self.max_failures:
+                del entries[key]
+            self._save_locked()
+
+    def forget(self, computer_name, user=None):
+        with self._lock:
+            if self._load_locked().pop(self._key(computer_name, user), None) is not None:
+                self._save_locked()
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_cache():
+    """Cache compartilhado do processo, ou None se desabilitado por env."""
+    global _DEFAULT_CACHE
+    if os.environ.get('CSINFO_AUTH_CACHE', '1') == '0':
+        return None
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = NegotiationCache()
+        return _DEFAULT_CACHE
+
+
+def credential_user(credential):
+    """Usuário de uma credencial (usuário, senha), ou '' quando ausente."""
+    if credential and isinstance(credential, (list, tuple)) and len(credential) == 2:
+        return str(credential[0])
+    return ''
@@ -0,0 +1,202 @@
+"""Recursos do PDF (logotipo e estilos) compartilhados entre relatórios.
+
+`write_pdf_report` procurava o logotipo em cada página (import de `csinfo`,
+vários `os.path.exists`, incluindo `_MEIPASS`) e o reportlab decodificava e
+recodificava a imagem (zlib + ASCII85 em Python puro) uma vez por documento;
+os `ParagraphStyle` também eram recriados a cada relatório. Ao exportar uma
+frota inteira no mesmo processo isso se repete para cada PDF.
+
+Aqui o caminho do logotipo é resolvido uma vez por valor de
+`csinfo.__logo_path__`, a imagem é codificada uma única vez por processo
+(chave: caminho + mtime) e cada documento recebe uma cópia rasa desse image
+XObject, registrada uma vez e referenciada em todas as páginas. Os estilos são
+montados uma vez e reutilizados (o reportlab não altera os estilos ao
+desenhar).
+"""
+import copy
+import os
+import sys
+import threading
+
+_LOCK = threading.Lock()
+_LOGO_PATHS = {}
+_LOGOS = {}
+_STYLES = None
+
+# espaçamento padrão dos títulos de seção
+TITLE_LEADING = 14
+TITLE_SPACE_BEFORE = 1
+TITLE_SPACE_AFTER = 1
+
+_SECTION_TITLE_NAMES = (
+    ("INFORMAÇÕES DO SISTEMA", 'SectionTitleSistema'),
+    ("INFORMAÇÕES DE HARDWARE", 'SectionTitleHardware'),
+    ("ADMINISTRADORES", 'SectionTitleAdmin'),
+    ("SOFTWARES INSTALADOS", 'SectionTitleSoft'),
+    ("INFORMAÇÕES DE REDE", 'SectionTitleNet'),
+    ("SEGURANÇA DO SISTEMA", 'SectionTitleSec'),
+)
+
+
+def _logo_candidates(declared):
+    if declared:
+        # relativo e congelado: tentar em _MEIPASS; depois absoluto/relativo ao cwd
+        if not os.path.isabs(declared) and getattr(sys, 'frozen', False):
+            meip = getattr(sys, '_MEIPASS', None)
+            if meip:
+                yield os.path.join(meip, os.path.basename(declared))
+        yield declared
+        return
+    if getattr(sys, 'frozen', False):
+        meip = getattr(sys, '_MEIPASS', None)
+        if meip:
+            yield os.path.join(meip, 'assets', 'ico.png')
+            yield os.path.join(meip, 'ico.png')
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    yield os.path.join(base_dir, '..', 'assets', 'ico.png')
+    yield os.path.join(base_dir, '..', 'ico.png')
+    yield os.path.join(base_dir, 'assets', 'ico.png')
+
+
+def logo_path():
+    """Caminho do logotipo (ou None), resolvido uma vez por `__logo_path__`."""
+    try:
+        import csinfo as _cs
+        declared = getattr(_cs, '__logo_path__', None) or None
+    except Exception:
+        declared = None
+    try:
+        return _LOGO_PATHS[declared]
+    except KeyError:
+        pass
+    found = None
+    for cand in _logo_candidates(declared):
+        try:
+            if os.path.exists(cand):
+                found = cand if cand == declared else os.path.abspath(cand)
+                break
+        except Exception:
+            continue
+    with _LOCK:
+        _LOGO_PATHS[declared] = found
+    return found
+
+
+class LogoAsset(object):
+    """Logotipo decodificado: tamanho em pixels e o image XObject já codificado."""
+
+    MASK = 'auto'
+
+    def __init__(self, path):
+        from reportlab.pdfbase import pdfdoc
+        from reportlab.pdfgen.canvas import _digester
+        self.path = path
+        # mesmo nome que canvas.drawImage(path, mask='auto') calcularia
+        self.name = _digester('%s%s' % (path, self.MASK))
+        self.template = pdfdoc.PDFImageXObject(self.name, path, mask=self.MASK)
+        self.size = (self.template.width, self.template.height)
+        # o conteúdo ASCII85 vira bytes uma vez; senão cada documento o recodifica ao salvar
+        for obj in (self.template, getattr(self.template, '_smask', None)):
+            if obj is not None and isinstance(obj.streamContent, str):
+                obj.streamContent = obj.streamContent.encode('latin-1')
+
+    def _register(self, canvas_obj):
+        doc = canvas_obj._doc
+        reg_name = doc.getXObjectName(self.name)
+        if doc.idToObject.get(reg_name) is not None:
+            return
+        img = copy.copy(self.template)
+        canvas_obj._setXObjects(img)
+        doc.Reference(img, reg_name)
+        doc.addForm(self.name, img)
+        smask = getattr(self.template, '_smask', None)
+        if smask is not None:
+            del img._smask
+            smask = copy.copy(smask)
+            m_reg_name = doc.getXObjectName(smask.name)
+            if doc.idToObject.get(m_reg_name) is None:
+                canvas_obj._setXObjects(smask)
+                img.smask = doc.Reference(smask, m_reg_name)
+            else:
+                from reportlab.pdfbase import pdfdoc
+                img.smask = pdfdoc.PDFObjectReference(m_reg_name)
+
+    def draw(self, canvas_obj, x, y, width, height):
+        """Desenha o logotipo; o XObject é registrado no documento só na primeira vez."""
+        try:
+            self._register(canvas_obj)
+        except Exception:
+            # sem o registro o drawImage abaixo decodifica a imagem como antes
+            pass
+        canvas_obj.drawImage(self.path, x, y, width=width, height=height, preserveAspectRatio=True, mask=self.MASK)
+
+
+def get_logo():
+    """`LogoAsset` do logotipo atual (ou None), decodificado uma vez por processo."""
+    path = logo_path()
+    if not path:
+        return None
+    try:
+        key = (path, os.path.getmtime(path))
+    except Exception:
+        key = (path, None)
+    logo = _LOGOS.get(key)
+    if logo is None:
+        with _LOCK:
+            logo = _LOGOS.get(key)
+            if logo is None:
+                logo = LogoAsset(path)
+                _LOGOS[key] = logo
+    return logo
+
+
+def _build_styles():
+    from reportlab.lib.enums import TA_LEFT
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    sheet = getSampleStyleSheet()
+    normal = sheet['Normal']
+    header = ParagraphStyle('CSInfoHeader', parent=normal, fontSize=10, textColor=colors.navy, alignment=TA_LEFT, spaceAfter=6, leading=14, fontName='Helvetica-Bold')
+    section_titles = {}
+    for title, name in _SECTION_TITLE_NAMES:
+        section_titles[title] = ParagraphStyle(name, parent=sheet['Heading2'], fontSize=10, spaceAfter=TITLE_SPACE_AFTER, spaceBefore=TITLE_SPACE_BEFORE, leading=TITLE_LEADING, textColor=colors.whitesmoke, fontName='Helvetica-Bold', alignment=TA_LEFT)
+    return {
+        'sheet': sheet,
+        'header': header,
+        'section_titles': section_titles,
+        'normal': ParagraphStyle('CustomNormal', parent=normal, fontSize=9, spaceAfter=2, leading=11, textColor=colors.black, fontName='Helvetica'),
+        'indented': ParagraphStyle('IndentedNormal', parent=normal, fontSize=9, spaceAfter=2, leading=11, textColor=colors.black, fontName='Helvetica', leftIndent=12),
+        'double_indented': ParagraphStyle('DoubleIndentedNormal', parent=normal, fontSize=9, spaceAfter=2, leading=11, textColor=colors.black, fontName='Helvetica', leftIndent=24),
+        'id_title': ParagraphStyle('IdTitle', parent=normal, fontSize=10, leading=12, alignment=TA_LEFT, fontName='Helvetica-Bold', textColor=colors.white),
+        'indice': ParagraphStyle('IndiceInline', parent=normal, fontSize=9, textColor=colors.whitesmoke, leftIndent=4, leading=11),
+        'detail': {},
+    }
+
+
+def get_styles():
+    """Estilos do relatório PDF, montados uma vez por processo.
+
+    Os estilos são compartilhados: quem precisar de uma variação deve criar
+    um novo `ParagraphStyle` com `parent=` em vez de alterar estes.
+    """
+    global _STYLES
+    styles = _STYLES
+    if styles is None:
+        with _LOCK:
+            if _STYLES is None:
+                _STYLES = _build_styles()
+            styles = _STYLES
+    return styles
+
+
+def detail_style(title):
+    """Estilo do título "Detalhes: <seção>" (um por seção, reutilizado)."""
+    styles = get_styles()
+    style = styles['detail'].get(title)
+    if style is None:
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib import colors
+        style = ParagraphStyle(f"Detail_{title}", parent=styles['header'], textColor=colors.whitesmoke, leading=TITLE_LEADING)
+        with _LOCK:
+            style = styles['detail'].setdefault(title, style)
+    return style
@@ -0,0 +1,213 @@
+"""Verificação de acessibilidade de hosts com sondas concorrentes (asyncio).
+
+`check_remote_machine` pingava duas vezes (com pausas de 0,4 s) e depois
+tentava as portas 5985, 5986 e 445 uma após a outra, com 2 s de timeout cada;
+um host desligado custava cerca de 10 s. Aqui o ICMP e todas as portas TCP
+são disparados ao mesmo tempo e o resultado sai assim que a primeira sonda
+responde (as demais são canceladas). `aprobe_hosts` verifica uma lista
+inteira de hosts em paralelo, com limite de concorrência.
+
+Cada `ProbeResult` traz a latência de cada sonda que respondeu (em segundos),
+o que permite ordenar os hosts (ver `rank`). Com `wait_all=True` todas as
+sondas são aguardadas, para ter a latência de cada uma.
+"""
+import asyncio
+import os
+import re
+import subprocess
+import threading
+import time
+
+DEFAULT_PORTS = (5985, 5986, 445)
+
+_PING_TIME_RE = re.compile(r'(?:time|tempo)\s*[=<]\s*([\d.,]+)\s*ms', re.IGNORECASE)
+
+
+class ProbeResult(object):
+    """Resultado da verificação de um host.
+
+    - reachable: alguma sonda respondeu
+    - first: sonda que respondeu primeiro ('icmp' ou o número da porta)
+    - latencies: {'icmp' | porta: segundos} das sondas que responderam
+    - elapsed: tempo total da verificação
+    """
+
+    __slots__ = ('host', 'reachable', 'first', 'latencies', 'elapsed')
+
+    def __init__(self, host):
+        self.host = host
+        self.reachable = False
+        self.first = None
+        self.latencies = {}
+        self.elapsed = None
+
+    @property
+    def best_latency(self):
+        return min(self.latencies.values()) if self.latencies else None
+
+    def as_dict(self):
+        return {
+            'host': self.host,
+            'reachable': self.reachable,
+            'first': self.first,
+            'latencies': {str(k): round(v, 4) for k, v in self.latencies.items()},
+            'elapsed': round(self.elapsed, 4) if self.elapsed is not None else None,
+        }
+
+    def __repr__(self):
+        return f"ProbeResult({self.host!r}, reachable={self.reachable}, first={self.first!r}, best={self.best_latency})"
+
+
+def _ping_argv(host, timeout):
+    if os.name == 'nt':
+        return ['ping', '-n', '1', '-w', str(max(1, int(timeout * 1000))), host]
+    return ['ping', '-c', '1', '-W', str(max(1, int(round(timeout)))), host]
+
+
+async def _icmp(host, timeout):
+    """Latência do ping (o tempo informado pelo próprio ping, se houver) ou None."""
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000)
+    start = time.perf_counter()
+    try:
+        proc = await asyncio.create_subprocess_exec(*_ping_argv(host, timeout), stdin=asyncio.subprocess.DEVNULL,
+                                                    stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.DEVNULL, **kwargs)
+    except Exception:
+        return None
+    try:
+        raw, _ = await asyncio.wait_for(proc.communicate(), timeout + 1)
+    except BaseException as exc:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+        if isinstance(exc, asyncio.TimeoutError):
+            return None
+        raise
+    elapsed = time.perf_counter() - start
+    text = raw.decode('utf-8', 'ignore')
+    # no Windows "Host de destino inacessível" também sai com código 0; só vale com TTL
+    if proc.returncode != 0 or (os.name == 'nt' and 'TTL=' not in text.upper()):
+        return None
+    m = _PING_TIME_RE.search(text)
+    if m:
+        try:
+            return float(m.group(1).replace(',', '.')) / 1000.0
+        except ValueError:
+            pass
+    return elapsed
+
+
+async def _tcp(host, port, timeout):
+    """Latência da conexão TCP em `port` ou None."""
+    start = time.perf_counter()
+    try:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        return None
+    elapsed = time.perf_counter() - start
+    try:
+        writer.close()
+    except Exception:
+        pass
+    return elapsed
+
+
+async def aprobe_host(host, ports=DEFAULT_PORTS, timeout=2.0, icmp=True, wait_all=False):
+    """Dispara o ping e as conexões TCP ao mesmo tempo e retorna um `ProbeResult`.
+
+    Retorna assim que uma sonda responder (ou todas falharem); com
+    `wait_all=True` aguarda todas para registrar todas as latências.
+    """
+    result = ProbeResult(host)
+    start = time.perf_counter()
+    tasks = {}
+    if icmp:
+        tasks[asyncio.ensure_future(_icmp(host, timeout))] = 'icmp'
+    for port in ports or ():
+        tasks[asyncio.ensure_future(_tcp(host, port, timeout))] = port
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                latency = task.result() if not task.cancelled() else None
+                if latency is None:
+                    continue
+                result.latencies[tasks[task]] = latency
+                if not result.reachable:
+                    result.reachable = True
+                    result.first = tasks[task]
+            if result.reachable and not wait_all:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def aprobe_hosts(hosts, concurrency=64, on_result=None, **kwargs):
+    """Verifica vários hosts em paralelo (no máximo `concurrency` ao mesmo tempo).
+
+    Retorna a lista de `ProbeResult` na ordem de `hosts`; `on_result(resultado)`,
+    se informado, é chamado para cada host assim que ele termina. `kwargs` vão
+    para `aprobe_host`.
+    """
+    sem = asyncio.Semaphore(max(1, int(concurrency or 1)))
+
+    async def one(host):
+        async with sem:
+            result = await aprobe_host(host, **kwargs)
+        if on_result is not None:
+            try:
+                on_result(result)
+            except Exception:
+                pass
+        return result
+
+    return list(await asyncio.gather(*(one(h) for h in hosts)))
+
+
+def _run(coro):
+    """Executa a corrotina; dentro de um loop já ativo usa uma thread própria."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    box = {}
+
+    def target():
+        try:
+            box['value'] = asyncio.run(coro)
+        except BaseException as exc:
+            box['error'] = exc
+
+    t = threading.Thread(target=target, name='csinfo-probe', daemon=True)
+    t.start()
+    t.join()
+    if 'error' in box:
+        raise box['error']
+    return box['value']
+
+
+def probe_host(host, **kwargs):
+    """Versão síncrona de `aprobe_host`."""
+    return _run(aprobe_host(host, **kwargs))
+
+
+def probe_hosts(hosts, concurrency=64, on_result=None, **kwargs):
+    """Versão síncrona de `aprobe_hosts`."""
+    return _run(aprobe_hosts(list(hosts), concurrency=concurrency, on_result=on_result, **kwargs))
+
+
+def rank(results):
+    """Ordena resultados: acessíveis primeiro, pela menor latência."""
+    return sorted(results, key=lambda r: (not r.reachable, r.best_latency if r.best_latency is not None else float('inf')))
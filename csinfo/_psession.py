@@ -0,0 +1,329 @@
+"""Cache de PSSessions remotas reutilizáveis, uma por (host, usuário).
+
+Sem este cache, cada getter remoto embrulhava seu comando em
+`Invoke-Command -ComputerName ... -Credential $cred`, recriando o
+SecureString/PSCredential e renegociando a autenticação WinRM a cada
+chamada. Aqui cada alvo ganha um host PowerShell persistente dedicado
+(ver `csinfo._pshost`) que guarda uma PSSession em `$global:CSInfoSession`;
+os comandos seguintes usam `Invoke-Command -Session`, pagando um único
+handshake de autenticação por host.
+
+Sessões são reutilizadas entre coletas do mesmo processo enquanto estiverem
+dentro do TTL e são descartadas quando ficam ociosas, quebradas (estado
+diferente de 'Opened') ou quando o host PowerShell local morre. Cada sessão
+prende um processo PowerShell local: acima de CSINFO_PS_SESSION_MAX sessões
+a usada há mais tempo é encerrada.
+
+Se a sessão de um host não abre (autenticação recusada ou timeout), novas
+tentativas de abri-la falham na hora durante CSINFO_PS_SESSION_RETRY
+segundos, e `run_powershell` segue pelo Invoke-Command por comando.
+
+Variáveis de ambiente:
+    CSINFO_PS_SESSIONS=0        desabilita o cache (volta ao Invoke-Command por comando)
+    CSINFO_PS_SESSION_TTL       idade máxima de uma sessão em segundos (padrão 900)
+    CSINFO_PS_SESSION_IDLE      segundos ociosa antes de ser encerrada (padrão 300)
+    CSINFO_PS_SESSION_MAX       máximo de sessões abertas (padrão 16)
+    CSINFO_PS_SESSION_RETRY     segundos até tentar de novo abrir uma sessão que falhou (padrão 300)
+"""
+import atexit
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+
+from . import _negotiation
+from . import _pshost
+
+
+# Variantes de autenticação tentadas ao criar a sessão, na mesma ordem das
+# variantes usadas por run_powershell (Negotiate, padrão, Negotiate+SSL).
+AUTH_VARIANTS = (
+    ('negotiate', '-Authentication Negotiate'),
+    ('default', ''),
+    ('negotiate_ssl', '-Authentication Negotiate -UseSSL'),
+)
+
+_OK_MARKER = 'CSINFO_SESSION_OK'
+
+
+class RemoteSessionError(Exception):
+    """Não foi possível abrir (ou manter) a PSSession com o host remoto."""
+
+
+def sessions_enabled():
+    return os.environ.get('CSINFO_PS_SESSIONS', '1') != '0'
+
+
+def _ps_quote(text):
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+def _credential_prelude(credential):
+    """Trecho PowerShell que cria `$cred` (vazio se não houver credencial)."""
+    if credential and isinstance(credential, (list, tuple)) and len(credential) == 2:
+        user, pwd = credential
+        return (f"$sec = ConvertTo-SecureString {_ps_quote(pwd)} -AsPlainText -Force; "
+                f"$cred = New-Object System.Management.Automation.PSCredential({_ps_quote(user)},$sec); ")
+    return ''
+
+
+class RemoteSession(object):
+    """Uma PSSession aberta em um host PowerShell local dedicado."""
+
+    def __init__(self, computer_name, credential=None, variants=None, timeout=30):
+        self.computer_name = computer_name
+        self.variant = None
+        self.host = _pshost.PowerShellHost(_pshost.host_argv())
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.last_check = self.created
+        self.lock = threading.Lock()
+        try:
+            self._open(credential, variants or AUTH_VARIANTS, timeout)
+        except Exception:
+            self.host.close()
+            raise
+
+    def _open(self, credential, variants, timeout):
+        prelude = _credential_prelude(credential)
+        cred_arg = '-Credential $cred ' if prelude else ''
+        errors = []
+        for name, auth_args in variants:
+            script = (f"{prelude}$global:CSInfoSession = New-PSSession -ComputerName {_ps_quote(self.computer_name)} "
+                      f"{cred_arg}{auth_args} -ErrorAction Stop; '{_OK_MARKER}'")
+            rc, out = self.host.run(script, timeout=timeout)
+            if rc == 0 and _OK_MARKER in (out or ''):
+                self.variant = name
+                return
+            errors.append(f"{name}: {(out or '').strip()[:200]}")
+        raise RemoteSessionError(f"não foi possível abrir PSSession com {self.computer_name}: " + ' | '.join(errors))
+
+    def is_healthy(self, timeout=10):
+        """Confere se o host local está vivo e a sessão continua 'Opened'."""
+        if not self.host.is_alive():
+            return False
+        try:
+            rc, out = self.host.run("if ($global:CSInfoSession -and $global:CSInfoSession.State -eq 'Opened') { 'OPENED' } else { 'BROKEN' }", timeout=timeout)
+            ok = rc == 0 and 'OPENED' in (out or '')
+        except Exception:
+            ok = False
+        self.last_check = time.monotonic()
+        return ok
+
+    def run(self, cmd, timeout=None):
+        """Executa `cmd` na sessão remota e retorna (código de retorno, saída)."""
+        script = f"Invoke-Command -Session $global:CSInfoSession -ScriptBlock {{ {cmd} }} -ErrorAction Stop"
+        rc, out = self.host.run(script, timeout=timeout)
+        self.last_used = time.monotonic()
+        return rc, out
+
+    def close(self):
+        try:
+            if self.host.is_alive():
+                self.host.run("if ($global:CSInfoSession) { Remove-PSSession $global:CSInfoSession -ErrorAction SilentlyContinue }", timeout=5)
+        except Exception:
+            pass
+        self.host.close()
+
+
+class RemoteSessionCache(object):
+    """Sessões por (host, usuário) com TTL, expiração por ociosidade e health check.
+
+    Guarda no máximo `max_sessions` sessões (a usada há mais tempo sai
+    primeiro) e lembra por `retry_after` segundos os hosts cuja sessão não abriu.
+    """
+
+    MAX_START_FAILURES = 3
+
+    def __init__(self, ttl=None, idle_timeout=None, health_interval=60.0, max_sessions=None, retry_after=None):
+        self.ttl = ttl if ttl is not None else _pshost._env_number('CSINFO_PS_SESSION_TTL', 900.0, float)
+        self.idle_timeout = idle_timeout if idle_timeout is not None else _pshost._env_number('CSINFO_PS_SESSION_IDLE', 300.0, float)
+        self.health_interval = health_interval
+        self.max_sessions = max(1, max_sessions or _pshost._env_number('CSINFO_PS_SESSION_MAX', 16))
+        self.retry_after = retry_after if retry_after is not None else _pshost._env_number('CSINFO_PS_SESSION_RETRY', 300.0, float)
+        self.disabled = False
+        self._sessions = OrderedDict()     # (host, usuário) -> sessão, da usada há mais tempo à mais recente
+        self._open_failures = {}           # (host, usuário) -> instante da última falha ao abrir
+        self._key_locks = {}
+        self._start_failures = 0
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    @staticmethod
+    def _key(computer_name, credential):
+        user = ''
+        if credential and isinstance(credential, (list, tuple)) and len(credential) == 2:
+            user = str(credential[0]).lower()
+        return (str(computer_name).strip().lower(), user)
+
+    def _expired(self, sess, now):
+        return (now - sess.created > self.ttl) or (now - sess.last_used > self.idle_timeout)
+
+    def _key_lock(self, key):
+        with self._lock:
+            lk = self._key_locks.get(key)
+            if lk is None:
+                lk = self._key_locks[key] = threading.Lock()
+            return lk
+
+    def _get(self, key, computer_name, credential, timeout):
+        now = time.monotonic()
+        with self._lock:
+            sess = self._sessions.get(key)
+            if sess is not None:
+                self._sessions.move_to_end(key)
+            falhou = self._open_failures.get(key)
+        if sess is None and falhou is not None and now - falhou < self.retry_after:
+            raise RemoteSessionError(f"PSSession com {computer_name} falhou há {int(now - falhou)}s; usando Invoke-Command")
+        if sess is not None:
+            stale = now - sess.last_check > self.health_interval
+            if self._expired(sess, now) or (stale and not sess.is_healthy()):
+                self.evict(computer_name, credential)
+                sess = None
+        if sess is None:
+            # abrir primeiro com a variante de autenticação que já funcionou neste host
+            negotiation = _negotiation.get_default_cache()
+            user = _negotiation.credential_user(credential)
+            variants = negotiation.order(computer_name, user, AUTH_VARIANTS) if negotiation is not None else AUTH_VARIANTS
+            try:
+                sess = RemoteSession(computer_name, credential=credential, variants=variants, timeout=timeout)
+            except _pshost.PowerShellHostError:
+                with self._lock:
+                    self._start_failures += 1
+                    if self._start_failures >= self.MAX_START_FAILURES:
+                        self.disabled = True
+                raise
+            except (RemoteSessionError, subprocess.TimeoutExpired) as exc:
+                with self._lock:
+                    self._open_failures[key] = time.monotonic()
+                if isinstance(exc, RemoteSessionError):
+                    if negotiation is not None:
+                        negotiation.record_failure(computer_name, user)
+                    raise
+                raise RemoteSessionError(f"timeout ao abrir PSSession com {computer_name}") from exc
+            if negotiation is not None:
+                negotiation.record_success(computer_name, user, sess.variant)
+            with self._lock:
+                self._start_failures = 0
+                self._open_failures.pop(key, None)
+                self._sessions[key] = sess
+                self._ensure_reaper()
+            self._trim(key)
+        return sess
+
+    def _trim(self, keep):
+        """Encerra as sessões usadas há mais tempo até caber em `max_sessions`.
+
+        Sessões com comando em andamento (lock do alvo ocupado) são puladas.
+        """
+        while True:
+            with self._lock:
+                if len(self._sessions) <= self.max_sessions:
+                    return
+                candidates = [k for k in self._sessions if k != keep]
+            for key in candidates:
+                lk = self._key_lock(key)
+                if not lk.acquire(blocking=False):
+                    continue
+                try:
+                    with self._lock:
+                        sess = self._sessions.pop(key, None)
+                    if sess is not None:
+                        sess.close()
+                finally:
+                    lk.release()
+                break
+            else:
+                return
+
+    def run(self, computer_name, cmd, credential=None, timeout=None):
+        """Executa `cmd` no host remoto reutilizando (ou abrindo) a sua sessão.
+
+        Levanta `RemoteSessionError` se a sessão não puder ser aberta (inclusive
+        por timeout, ou enquanto uma falha recente ao abri-la for lembrada),
+        `subprocess.TimeoutExpired` em timeout do comando e `_pshost.PowerShellHostError`
+        quando o host PowerShell local não está disponível.
+        """
+        if self.disabled:
+            raise _pshost.PowerShellHostError("cache de sessões remotas indisponível")
+        key = self._key(computer_name, credential)
+        # uma PSSession executa um comando por vez: serializar por alvo
+        with self._key_lock(key):
+            sess = self._get(key, computer_name, credential, timeout)
+            try:
+                with sess.lock:
+                    rc, out = sess.run(cmd, timeout=timeout)
+            except Exception:
+                self.evict(computer_name, credential)
+                raise
+            if rc != 0 and not sess.is_healthy():
+                # a sessão caiu no meio do comando: descartar; a próxima chamada reabre
+                self.evict(computer_name, credential)
+            return rc, out
+
+    def evict(self, computer_name, credential=None):
+        key = self._key(computer_name, credential)
+        with self._lock:
+            sess = self._sessions.pop(key, None)
+        if sess is not None:
+            sess.close()
+
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, s in self._sessions.items() if self._expired(s, now) or not s.host.is_alive()]
+            victims = [self._sessions.pop(k) for k in expired]
+        for sess in victims:
+            sess.close()
+
+    def _ensure_reaper(self):
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(0.05, min(30.0, self.idle_timeout / 2.0))
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+            with self._lock:
+                if not self._sessions:
+                    self._reaper = None
+                    return
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = OrderedDict()
+        for sess in sessions:
+            sess.close()
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_cache():
+    """Retorna o cache compartilhado do processo, ou None se desabilitado."""
+    global _DEFAULT_CACHE
+    if not sessions_enabled():
+        return None
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = RemoteSessionCache()
+        cache = _DEFAULT_CACHE
+    return None if cache.disabled else cache
+
+
+def shutdown_default_cache():
+    """Fecha todas as PSSessions abertas (chamado também no atexit)."""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        cache, _DEFAULT_CACHE = _DEFAULT_CACHE, None
+    if cache is not None:
+        cache.close()
+
+
+atexit.register(shutdown_default_cache)
@@ -0,0 +1,417 @@
+"""Pool de hosts PowerShell persistentes usado por `run_powershell`.
+
+Cada getter de `csinfo._impl` executava um `powershell.exe` novo, pagando a
+inicialização do interpretador a cada chamada. Este módulo mantém alguns
+processos PowerShell de longa duração que recebem comandos enquadrados via
+stdin e devolvem o resultado delimitado via stdout.
+
+Protocolo (uma linha por mensagem, campos separados por espaço):
+
+    pedido:   RUN <id> <script em base64 UTF-8>
+              PING <id>
+              QUIT
+    resposta: <id> <código de retorno> <saída em base64 UTF-8>
+
+Linhas que não correspondem ao id aguardado são descartadas, de modo que
+qualquer saída "solta" do host não corrompe o enquadramento.
+
+Variáveis de ambiente:
+    CSINFO_PS_POOL=0                desabilita o pool (volta a um processo por comando)
+    CSINFO_PS_POOL_SIZE             número máximo de hosts simultâneos (padrão 4)
+    CSINFO_PS_POOL_MAX_COMMANDS     comandos por host antes da reciclagem (padrão 100)
+    CSINFO_PS_POOL_IDLE             segundos ocioso antes de encerrar o host (padrão 300)
+    CSINFO_PS_HOST=stub             usa o host substituto em Python (testes fora do Windows)
+"""
+import atexit
+import base64
+import itertools
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+
+# Script executado dentro de cada host: lê pedidos de stdin, executa cada
+# script em um escopo filho (variáveis não vazam entre comandos) e responde
+# com a saída completa (todos os streams) codificada em base64.
+_BOOTSTRAP = r'''
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+$utf8 = New-Object System.Text.UTF8Encoding($false)
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line.Split(' ')
+    $kind = $parts[0]
+    if ($kind -eq 'QUIT') { break }
+    $id = $parts[1]
+    if ($kind -eq 'PING') {
+        [Console]::Out.WriteLine("$id 0 ")
+        [Console]::Out.Flush()
+        continue
+    }
+    $rc = 0
+    try {
+        $script = $utf8.GetString([Convert]::FromBase64String($parts[2]))
+        $out = (& ([scriptblock]::Create($script)) *>&1 | Out-String -Width 4096)
+    } catch {
+        $out = ($_ | Out-String)
+        $rc = 1
+    }
+    if ($out -eq $null) { $out = '' }
+    $b64 = [Convert]::ToBase64String($utf8.GetBytes($out))
+    [Console]::Out.WriteLine("$id $rc $b64")
+    [Console]::Out.Flush()
+}
+'''
+
+
+class PowerShellHostError(Exception):
+    """Falha do host (não iniciou, morreu ou quebrou o protocolo).
+
+    Diferente de um timeout: indica que o chamador deve recorrer ao caminho
+    tradicional (um processo por comando) para esta tentativa.
+    """
+
+
+def _env_number(name, default, cast=int):
+    try:
+        return cast(os.environ.get(name, default))
+    except Exception:
+        return default
+
+
+def default_host_argv():
+    """Linha de comando do host PowerShell real (bootstrap via -EncodedCommand)."""
+    encoded = base64.b64encode(_BOOTSTRAP.encode('utf-16-le')).decode('ascii')
+    return ['powershell', '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass', '-EncodedCommand', encoded]
+
+
+def stub_host_argv():
+    """Linha de comando do host substituto (ver `csinfo._pshost_stub`)."""
+    return [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), '_pshost_stub.py')]
+
+
+def host_argv():
+    """Linha de comando a usar para novos hosts (respeita CSINFO_PS_HOST=stub)."""
+    return stub_host_argv() if os.environ.get('CSINFO_PS_HOST') == 'stub' else default_host_argv()
+
+
+class PowerShellHost(object):
+    """Um processo PowerShell persistente que fala o protocolo enquadrado."""
+
+    def __init__(self, argv, startup_timeout=15):
+        self.argv = list(argv)
+        self.commands = 0
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.last_check = self.created
+        self._ids = itertools.count(1)
+        self._replies = queue.Queue()
+        kwargs = {'stdin': subprocess.PIPE, 'stdout': subprocess.PIPE, 'stderr': subprocess.DEVNULL}
+        if os.name == 'nt':
+            kwargs['creationflags'] = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000)
+        try:
+            self.proc = subprocess.Popen(self.argv, **kwargs)
+        except Exception as exc:
+            raise PowerShellHostError(f"não foi possível iniciar o host: {exc}")
+        reader = threading.Thread(target=self._reader, args=(self.proc.stdout, self._replies), daemon=True)
+        reader.start()
+        # handshake: garante que o bootstrap está de fato respondendo
+        if not self.ping(timeout=startup_timeout):
+            self.close()
+            raise PowerShellHostError("host não respondeu ao handshake inicial")
+
+    @property
+    def pid(self):
+        return getattr(self.proc, 'pid', None)
+
+    @staticmethod
+    def _reader(stream, replies):
+        try:
+            for raw in iter(stream.readline, b''):
+                replies.put(raw)
+        except Exception:
+            pass
+        replies.put(None)
+
+    def is_alive(self):
+        try:
+            return self.proc.poll() is None
+        except Exception:
+            return False
+
+    def _send(self, text):
+        try:
+            self.proc.stdin.write(text.encode('ascii'))
+            self.proc.stdin.flush()
+        except Exception as exc:
+            raise PowerShellHostError(f"falha ao enviar comando ao host: {exc}")
+
+    def _wait(self, rid, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(self.argv[:1], timeout)
+            try:
+                raw = self._replies.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.argv[:1], timeout)
+            if raw is None:
+                raise PowerShellHostError("host encerrou durante a execução do comando")
+            parts = raw.decode('ascii', errors='replace').strip().split(' ')
+            if len(parts) < 2 or parts[0] != rid:
+                # saída fora do protocolo ou resposta antiga: ignorar
+                continue
+            try:
+                rc = int(parts[1])
+            except ValueError:
+                continue
+            payload = parts[2] if len(parts) > 2 else ''
+            try:
+                out = base64.b64decode(payload).decode('utf-8', errors='replace') if payload else ''
+            except Exception:
+                raise PowerShellHostError("resposta do host com payload inválido")
+            return rc, out
+
+    def run(self, script, timeout=None):
+        """Executa `script` no host e retorna (código de retorno, saída)."""
+        rid = str(next(self._ids))
+        payload = base64.b64encode(script.encode('utf-8')).decode('ascii')
+        self._send(f"RUN {rid} {payload}\n")
+        rc, out = self._wait(rid, timeout)
+        self.commands += 1
+        self.last_used = self.last_check = time.monotonic()
+        return rc, out
+
+    def ping(self, timeout=5):
+        """Health check: True se o host responde ao protocolo dentro do timeout."""
+        if not self.is_alive():
+            return False
+        rid = str(next(self._ids))
+        try:
+            self._send(f"PING {rid}\n")
+            self._wait(rid, timeout)
+            self.last_check = time.monotonic()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            if self.is_alive():
+                try:
+                    self.proc.stdin.write(b"QUIT\n")
+                    self.proc.stdin.flush()
+                except Exception:
+                    pass
+                try:
+                    self.proc.wait(timeout=1)
+                except Exception:
+                    self.proc.kill()
+        except Exception:
+            pass
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+class PowerShellHostPool(object):
+    """Pool limitado de `PowerShellHost` com health check, reciclagem e expiração por ociosidade.
+
+    - max_hosts: limite de processos simultâneos; chamadas excedentes aguardam um host livre
+    - max_commands: após N comandos o host é encerrado e substituído (evita vazamentos)
+    - idle_timeout: hosts ociosos por mais que isso são encerrados
+    - health_interval: hosts ociosos há mais que isso recebem um PING antes de serem reutilizados
+    """
+
+    # após esse número de falhas consecutivas de inicialização o pool se desabilita
+    MAX_START_FAILURES = 3
+
+    def __init__(self, argv=None, max_hosts=None, max_commands=None, idle_timeout=None, health_interval=30.0):
+        self.argv = list(argv) if argv else default_host_argv()
+        self.max_hosts = max(1, max_hosts or _env_number('CSINFO_PS_POOL_SIZE', 4))
+        self.max_commands = max(1, max_commands or _env_number('CSINFO_PS_POOL_MAX_COMMANDS', 100))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else _env_number('CSINFO_PS_POOL_IDLE', 300.0, float)
+        self.health_interval = health_interval
+        self.disabled = False
+        self._idle = []
+        self._busy = set()
+        self._starting = 0
+        self._start_failures = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._reaper = None
+
+    # --- estado ---
+    def size(self):
+        with self._cond:
+            return len(self._idle) + len(self._busy)
+
+    def _capacity_left(self):
+        return self.max_hosts - (len(self._idle) + len(self._busy) + self._starting)
+
+    # --- ciclo de vida ---
+    def _spawn(self):
+        try:
+            host = PowerShellHost(self.argv)
+        except PowerShellHostError:
+            with self._cond:
+                self._starting -= 1
+                self._start_failures += 1
+                if self._start_failures >= self.MAX_START_FAILURES:
+                    self.disabled = True
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._starting -= 1
+            self._start_failures = 0
+            self._busy.add(host)
+            self._ensure_reaper()
+        return host
+
+    def _acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed or self.disabled:
+                    raise PowerShellHostError("pool de hosts PowerShell indisponível")
+                self._evict_idle_locked()
+                host = self._idle.pop() if self._idle else None
+                if host is not None:
+                    self._busy.add(host)
+                elif self._capacity_left() > 0:
+                    self._starting += 1
+                else:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise subprocess.TimeoutExpired(self.argv[:1], timeout)
+                    self._cond.wait(remaining)
+                    continue
+            if host is None:
+                return self._spawn()
+            # health check fora do lock para não bloquear outras threads
+            stale = time.monotonic() - host.last_check > self.health_interval
+            if host.is_alive() and (not stale or host.ping()):
+                return host
+            self._discard(host)
+
+    def _release(self, host, healthy=True):
+        recycle = (not healthy) or host.commands >= self.max_commands or not host.is_alive()
+        with self._cond:
+            self._busy.discard(host)
+            if not recycle and not self._closed:
+                self._idle.append(host)
+            self._cond.notify()
+        if recycle or self._closed:
+            host.close()
+
+    def _discard(self, host):
+        with self._cond:
+            self._busy.discard(host)
+            self._cond.notify()
+        host.close()
+
+    def _evict_idle_locked(self):
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        keep = []
+        for host in self._idle:
+            if now - host.last_used > self.idle_timeout or not host.is_alive():
+                threading.Thread(target=host.close, daemon=True).start()
+            else:
+                keep.append(host)
+        self._idle = keep
+
+    def evict_idle(self):
+        """Encerra imediatamente os hosts ociosos além do `idle_timeout`."""
+        with self._cond:
+            self._evict_idle_locked()
+
+    def _ensure_reaper(self):
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        if not self.idle_timeout:
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(0.05, min(30.0, self.idle_timeout / 2.0))
+        while True:
+            time.sleep(interval)
+            with self._cond:
+                if self._closed:
+                    return
+                self._evict_idle_locked()
+                if not self._idle and not self._busy and not self._starting:
+                    self._reaper = None
+                    return
+
+    def run(self, script, timeout=None):
+        """Executa `script` em um host do pool e retorna (código de retorno, saída).
+
+        Levanta `subprocess.TimeoutExpired` em timeout (o host é descartado) e
+        `PowerShellHostError` quando o host não pôde ser obtido ou morreu.
+        """
+        host = self._acquire(timeout)
+        ok = False
+        try:
+            result = host.run(script, timeout=timeout)
+            ok = True
+            return result
+        finally:
+            self._release(host, healthy=ok)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            hosts = list(self._idle) + list(self._busy)
+            self._idle = []
+            self._busy = set()
+            self._cond.notify_all()
+        for host in hosts:
+            host.close()
+
+
+_DEFAULT_POOL = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def pool_enabled():
+    return os.environ.get('CSINFO_PS_POOL', '1') != '0'
+
+
+def get_default_pool():
+    """Retorna o pool compartilhado do processo (criado na primeira chamada).
+
+    Retorna None se o pool estiver desabilitado por env ou após falhas
+    repetidas de inicialização (ex.: PowerShell indisponível).
+    """
+    global _DEFAULT_POOL
+    if not pool_enabled():
+        return None
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            _DEFAULT_POOL = PowerShellHostPool(argv=host_argv())
+        pool = _DEFAULT_POOL
+    return None if pool.disabled else pool
+
+
+def shutdown_default_pool():
+    """Encerra todos os hosts do pool compartilhado."""
+    global _DEFAULT_POOL
+    with _DEFAULT_POOL_LOCK:
+        pool, _DEFAULT_POOL = _DEFAULT_POOL, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(shutdown_default_pool)
@@ -0,0 +1,69 @@
+"""Host substituto (stand-in) que fala o protocolo de `csinfo._pshost` sem PowerShell.
+
+Permite exercitar o pool de hosts em máquinas Linux/CI. Não interpreta
+PowerShell: reconhece apenas alguns comandos usados pelos testes e ecoa
+qualquer outro script de volta como saída.
+
+    $PID                       -> pid do processo host
+    Start-Sleep -Seconds <n>   -> dorme n segundos e não produz saída
+    exit                       -> encerra o host sem responder (simula queda)
+    throw <mensagem>           -> código de retorno 1 com a mensagem como saída
+
+Uso: python _pshost_stub.py  (ou CSINFO_PS_HOST=stub para o pool padrão)
+"""
+import base64
+import os
+import re
+import sys
+import time
+
+_ENCODING_PREFIX = '[Console]::OutputEncoding = [System.Text.Encoding]::UTF8;'
+
+
+def _execute(script):
+    s = script.strip()
+    if s.startswith(_ENCODING_PREFIX):
+        s = s[len(_ENCODING_PREFIX):].strip()
+    if s == '$PID':
+        return 0, str(os.getpid())
+    m = re.match(r'^Start-Sleep\s+-Seconds\s+([\d.]+)$', s)
+    if m:
+        time.sleep(float(m.group(1)))
+        return 0, ''
+    if s == 'exit':
+        sys.exit(0)
+    if s.startswith('throw'):
+        return 1, s[len('throw'):].strip()
+    return 0, s
+
+
+def _reply(rid, rc, out):
+    payload = base64.b64encode(out.encode('utf-8')).decode('ascii')
+    sys.stdout.write(f"{rid} {rc} {payload}\n")
+    sys.stdout.flush()
+
+
+def main():
+    for line in sys.stdin:
+        parts = line.strip().split(' ')
+        kind = parts[0]
+        if kind == 'QUIT':
+            break
+        if len(parts) < 2:
+            continue
+        rid = parts[1]
+        if kind == 'PING':
+            _reply(rid, 0, '')
+            continue
+        try:
+            script = base64.b64decode(parts[2]).decode('utf-8') if len(parts) > 2 else ''
+            rc, out = _execute(script)
+        except SystemExit:
+            raise
+        except Exception as exc:
+            rc, out = 1, str(exc)
+        _reply(rid, rc, out)
+
+
+if __name__ == '__main__':
+    main()
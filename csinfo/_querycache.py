@@ -0,0 +1,90 @@
+"""Cache de consultas válido durante uma coleta (um `main()`) por alvo.
+
+Vários getters repetem exatamente a mesma consulta no mesmo relatório (ex.:
+`get_chassis_type_name` e `is_laptop` consultam Win32_SystemEnclosure com o
+mesmo comando; `is_laptop` chamava `get_monitor_infos` de novo). Enquanto uma
+coleta estiver em andamento, `run_powershell` consulta este cache pela chave
+(alvo, comando normalizado) e executa cada comando uma única vez; chamadas
+concorrentes do mesmo comando aguardam a primeira execução.
+
+O cache é criado por `begin()` no início da coleta e descartado por
+`release()` ao final; coletas simultâneas do mesmo alvo compartilham a mesma
+instância (contagem de referências). Falhas (exceção ou `FailedOutput`, ver
+csinfo._executor) não são guardadas: a próxima chamada tenta de novo.
+"""
+import threading
+
+from ._batch import normalize_command, _target_key
+from ._executor import FailedOutput
+
+_LOCK = threading.Lock()
+_ACTIVE = {}
+
+
+class QueryCache(object):
+    def __init__(self, computer_name=None):
+        self.key = _target_key(computer_name)
+        self.refs = 0
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, cmd, runner):
+        """Resultado de `cmd`, executando `runner()` apenas na primeira vez."""
+        norm = normalize_command(cmd)
+        with self._lock:
+            if norm in self._results:
+                self.hits += 1
+                return self._results[norm]
+            event = self._pending.get(norm)
+            owner = event is None
+            if owner:
+                event = self._pending[norm] = threading.Event()
+        if not owner:
+            event.wait()
+            with self._lock:
+                if norm in self._results:
+                    self.hits += 1
+                    return self._results[norm]
+            # a execução original falhou: tentar por conta própria
+            return runner()
+        try:
+            value = runner()
+            with self._lock:
+                self.misses += 1
+                if not isinstance(value, FailedOutput):
+                    self._results[norm] = value
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(norm, None)
+            event.set()
+
+    def release(self):
+        with _LOCK:
+            self.refs -= 1
+            if self.refs > 0:
+                return
+            if _ACTIVE.get(self.key) is self:
+                del _ACTIVE[self.key]
+        with self._lock:
+            self._results.clear()
+
+
+def begin(computer_name=None):
+    """Ativa (ou reaproveita) o cache do alvo; chamar `release()` ao final."""
+    key = _target_key(computer_name)
+    with _LOCK:
+        cache = _ACTIVE.get(key)
+        if cache is None:
+            cache = _ACTIVE[key] = QueryCache(computer_name)
+        cache.refs += 1
+    return cache
+
+
+def active(computer_name=None):
+    """Cache da coleta em andamento para o alvo, ou None."""
+    with _LOCK:
+        return _ACTIVE.get(_target_key(computer_name))
@@ -0,0 +1,165 @@
+"""Cache persistente (em disco) de seções de inventário que mudam pouco.
+
+Placa-mãe, processador, pentes de memória, placas de vídeo, monitores e
+softwares instalados raramente mudam, mas cada coleta os consultava de novo
+a custo cheio (`get_installed_software` é um dos getters mais lentos). Aqui o
+resultado de cada seção é gravado por (host, seção) no diretório de estado
+do csinfo, com TTL próprio por seção; dentro do TTL `main()` usa o valor
+gravado e marca a seção como vinda do cache no relatório.
+
+O cache é opcional: uma coleta comum sempre consulta a máquina, já que um
+relatório avulso com dados de até 30 dias atrás surpreende quem o pediu.
+Coletas recorrentes (frota, agendadas) o ativam por variável de ambiente.
+
+Cada entrada é um arquivo JSON; quando o total ultrapassa o limite de tamanho
+os arquivos usados há mais tempo são removidos primeiro. Resultados vazios
+(falha na coleta) não são gravados.
+
+Variáveis de ambiente:
+    CSINFO_SECTION_CACHE=1          habilita o cache (desabilitado por padrão)
+    CSINFO_SECTION_CACHE_MAX_MB     tamanho máximo em disco (padrão 20)
+    CSINFO_FORCE_REFRESH=1          ignora o cache e recoleta todas as seções
+"""
+import hashlib
+import os
+import threading
+import time
+
+from . import _pshost
+from . import _state
+
+DAY = 24 * 3600
+
+# seção (nome do nó em _COLLECTION_GRAPH) -> TTL em segundos
+DEFAULT_TTLS = {
+    'get_motherboard_info': 30 * DAY,
+    'get_processor_info': 30 * DAY,
+    'get_memory_modules_info': 7 * DAY,
+    'get_video_cards_info': 7 * DAY,
+    'monitors': 1 * DAY,
+    'get_installed_software': 1 * DAY,
+}
+
+# seções cujo valor original é uma tupla (JSON devolve lista)
+_TUPLE_SECTIONS = ('get_motherboard_info',)
+
+
+def _is_empty(value):
+    """Resultado de coleta que falhou (não deve ir para o cache).
+
+    Os getters devolvem marcadores como ('', '', 'NÃO OBTIDO') ou
+    [{'Fabricante': '', 'Serial': 'NÃO OBTIDO'}] quando a consulta falha.
+    """
+    if isinstance(value, dict):
+        return all(_is_empty(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(_is_empty(v) for v in value)
+    if isinstance(value, str):
+        return not value.strip() or value.strip() == 'NÃO OBTIDO'
+    return value is None
+
+
+class SectionCache(object):
+    def __init__(self, directory=None, ttls=None, max_bytes=None):
+        self.directory = directory or _state.state_path('sections')
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        if max_bytes is None:
+            max_bytes = int(_pshost._env_number('CSINFO_SECTION_CACHE_MAX_MB', 20.0, float) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def cacheable(self, section):
+        return bool(self.ttls.get(section))
+
+    def _path(self, host, section):
+        digest = hashlib.sha1(f"{str(host or '').strip().lower()}|{section}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, host, section):
+        """Retorna (valor, instante da coleta) dentro do TTL, ou None."""
+        ttl = self.ttls.get(section)
+        if not ttl:
+            return None
+        path = self._path(host, section)
+        entry = _state.load_json(path)
+        if not isinstance(entry, dict) or 'value' not in entry:
+            return None
+        ts = float(entry.get('ts', 0))
+        if time.time() - ts > ttl:
+            return None
+        try:
+            # marcar uso recente para a política de remoção
+            os.utime(path, None)
+        except Exception:
+            pass
+        value = entry['value']
+        if section in _TUPLE_SECTIONS and isinstance(value, list):
+            value = tuple(value)
+        return value, ts
+
+    def put(self, host, section, value):
+        if not self.cacheable(section) or _is_empty(value):
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except Exception:
+            return False
+        ok = _state.save_json(self._path(host, section), {'host': str(host), 'section': section, 'ts': time.time(), 'value': value})
+        if ok:
+            self._evict()
+        return ok
+
+    def forget(self, host, section=None):
+        sections = [section] if section else list(self.ttls)
+        for sec in sections:
+            try:
+                os.remove(self._path(host, sec))
+            except Exception:
+                pass
+
+    def _evict(self):
+        """Remove as entradas usadas há mais tempo até caber em `max_bytes`."""
+        with self._lock:
+            try:
+                entries = []
+                for name in os.listdir(self.directory):
+                    if not name.endswith('.json'):
+                        continue
+                    path = os.path.join(self.directory, name)
+                    st = os.stat(path)
+                    entries.append((st.st_mtime, st.st_size, path))
+            except Exception:
+                return
+            total = sum(size for _m, size, _p in entries)
+            for _mtime, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except Exception:
+                    pass
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_cache():
+    """Cache compartilhado do processo, ou None se não habilitado por env."""
+    global _DEFAULT_CACHE
+    if os.environ.get('CSINFO_SECTION_CACHE', '0') != '1':
+        return None
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = SectionCache()
+        return _DEFAULT_CACHE
+
+
+def refresh_requested(force_refresh, section):
+    """Indica se `section` deve ser recoletada (força total, por seção ou por env)."""
+    if force_refresh is None:
+        return os.environ.get('CSINFO_FORCE_REFRESH') == '1'
+    if isinstance(force_refresh, (list, tuple, set, frozenset)):
+        return section in force_refresh
+    return bool(force_refresh)
@@ -0,0 +1,55 @@
+"""Local de estado persistente do csinfo (caches que sobrevivem entre execuções).
+
+O diretório pode ser definido pela variável de ambiente CSINFO_STATE_DIR.
+Por padrão usa %LOCALAPPDATA%\\CSInfo no Windows e ~/.csinfo nos demais
+sistemas; se não for possível criá-lo, recorre ao diretório temporário.
+"""
+import json
+import os
+import tempfile
+
+
+def state_dir():
+    base = os.environ.get('CSINFO_STATE_DIR')
+    if not base:
+        if os.name == 'nt':
+            root = os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA') or tempfile.gettempdir()
+            base = os.path.join(root, 'CSInfo')
+        else:
+            base = os.path.join(os.path.expanduser('~'), '.csinfo')
+    try:
+        os.makedirs(base, exist_ok=True)
+    except Exception:
+        base = tempfile.gettempdir()
+    return base
+
+
+def state_path(name):
+    """Caminho de um arquivo dentro do diretório de estado."""
+    return os.path.join(state_dir(), name)
+
+
+def load_json(path, default=None):
+    """Lê um JSON; retorna `default` se o arquivo não existir ou estiver corrompido."""
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except Exception:
+        return default
+
+
+def save_json(path, data):
+    """Grava JSON de forma atômica (arquivo temporário + os.replace)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        try:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        except Exception:
+            pass
+        return False
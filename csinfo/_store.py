@@ -0,0 +1,534 @@
+"""Inventário da frota em SQLite, com consultas indexadas.
+
+Cada coleta (`Report`, ver csinfo._model) pode ser gravada como um snapshot
+normalizado por seção — softwares, processadores, pentes de memória, discos,
+placas/interfaces de rede e administradores em tabelas próprias — com índices
+por host, nome/versão de software, modelo de CPU, RAM, build do Windows e
+instante da coleta. Perguntas como "quais máquinas têm menos de 8 GB de RAM"
+ou "quem tem o Office 2016" viram uma consulta SQL em vez de um grep em
+centenas de TXT.
+
+As consultas olham o snapshot mais recente de cada host (`hosts.last_snapshot_id`);
+o histórico completo continua disponível em `snapshots`. O `Report` inteiro
+também é guardado (JSON), para reconstruir o relatório ou comparar coletas.
+
+`main()` grava no inventário quando recebe `store=` ou quando a variável
+CSINFO_STORE está definida ('1' usa `inventory.sqlite3` no diretório de
+estado; outro valor é o caminho do banco). Linha de comando:
+`python -m csinfo._store hosts`, `... ram --below 8`, `... software office --version 2016`,
+`... diff PC01` (alterações desde a coleta anterior, ver csinfo._diff),
+`... find anydesk`, `... find java --max 8.0.3000 --by-host` (índice de softwares,
+ver csinfo._swindex).
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from . import _model
+from . import _state
+from . import _swindex
+
+DEFAULT_NAME = 'inventory.sqlite3'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS hosts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    alias TEXT,
+    last_snapshot_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    host_id INTEGER NOT NULL REFERENCES hosts(id),
+    collected_at REAL NOT NULL,
+    machine TEXT,
+    machine_type TEXT,
+    user TEXT,
+    os_name TEXT,
+    os_build TEXT,
+    os_arch TEXT,
+    windows_status TEXT,
+    office_version TEXT,
+    domain TEXT,
+    ram_gb REAL,
+    cpu_model TEXT,
+    report TEXT
+);
+CREATE TABLE IF NOT EXISTS software (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    name TEXT COLLATE NOCASE,
+    version TEXT,
+    publisher TEXT COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS processors (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    name TEXT COLLATE NOCASE,
+    manufacturer TEXT,
+    cores INTEGER,
+    logical_processors INTEGER
+);
+CREATE TABLE IF NOT EXISTS memory_modules (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    slot TEXT,
+    capacity_gb REAL,
+    memory_type TEXT,
+    speed TEXT,
+    manufacturer TEXT,
+    part_number TEXT
+);
+CREATE TABLE IF NOT EXISTS disks (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    model TEXT COLLATE NOCASE,
+    size TEXT,
+    disk_type TEXT,
+    interface TEXT
+);
+CREATE TABLE IF NOT EXISTS network_adapters (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    name TEXT,
+    manufacturer TEXT,
+    mac TEXT COLLATE NOCASE,
+    ip TEXT
+);
+CREATE TABLE IF NOT EXISTS admins (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    name TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS ix_snapshots_host ON snapshots(host_id, collected_at);
+CREATE INDEX IF NOT EXISTS ix_snapshots_collected ON snapshots(collected_at);
+CREATE INDEX IF NOT EXISTS ix_snapshots_ram ON snapshots(ram_gb);
+CREATE INDEX IF NOT EXISTS ix_snapshots_cpu ON snapshots(cpu_model COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS ix_snapshots_os ON snapshots(os_build, os_name);
+CREATE INDEX IF NOT EXISTS ix_software_name ON software(name, version);
+CREATE INDEX IF NOT EXISTS ix_software_snapshot ON software(snapshot_id);
+CREATE INDEX IF NOT EXISTS ix_processors_snapshot ON processors(snapshot_id);
+CREATE INDEX IF NOT EXISTS ix_processors_name ON processors(name);
+CREATE INDEX IF NOT EXISTS ix_memory_snapshot ON memory_modules(snapshot_id);
+CREATE INDEX IF NOT EXISTS ix_disks_snapshot ON disks(snapshot_id);
+CREATE INDEX IF NOT EXISTS ix_nics_snapshot ON network_adapters(snapshot_id);
+CREATE INDEX IF NOT EXISTS ix_nics_mac ON network_adapters(mac);
+CREATE INDEX IF NOT EXISTS ix_admins_snapshot ON admins(snapshot_id);
+'''
+
+_OS_RE = re.compile(r'^(?P<name>.*?)\s*\(Version\s+(?P<build>[^)]+)\)(?:\s*-\s*(?P<arch>.+))?$')
+_NUMBER_RE = re.compile(r'(\d+(?:[.,]\d+)?)')
+
+# colunas de snapshot usadas nas consultas da frota
+_HOST_COLUMNS = ('host', 'alias', 'collected_at', 'machine_type', 'os_name', 'os_build', 'ram_gb', 'cpu_model', 'domain')
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _number(value):
+    """Primeiro número de `value` ('16.0 GB' -> 16.0) ou None."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = _NUMBER_RE.search(str(value or ''))
+    if not m:
+        return None
+    try:
+        return float(m.group(1).replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def split_os_version(os_version):
+    """'Windows 11 Pro (Version 10.0.22631) - 64 bits' -> (nome, build, arquitetura)."""
+    text = _text(os_version)
+    if not text or text == _model.NAO_OBTIDO:
+        return None, None, None
+    m = _OS_RE.match(text)
+    if not m:
+        return text, None, None
+    return _text(m.group('name')), _text(m.group('build')), _text(m.group('arch'))
+
+
+class InventoryStore(object):
+    """Banco SQLite do inventário; seguro para uso por várias threads."""
+
+    def __init__(self, path=None):
+        self.path = path or _state.state_path(DEFAULT_NAME)
+        if self.path != ':memory:':
+            folder = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(folder, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            try:
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            except sqlite3.DatabaseError:
+                pass
+            self._conn.execute('PRAGMA foreign_keys=ON')
+            self._conn.executescript(_SCHEMA + _swindex.SCHEMA)
+            # bancos anteriores ao índice de softwares: indexar os hosts pendentes
+            _swindex.sync(self._conn.cursor())
+            self._conn.commit()
+        self.software_index = _swindex.SoftwareIndex(self)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # gravação -----------------------------------------------------------
+
+    def _host_id(self, cur, host, alias):
+        cur.execute('INSERT INTO hosts(name, alias) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET alias = COALESCE(excluded.alias, hosts.alias)',
+                    (host, alias))
+        return cur.execute('SELECT id FROM hosts WHERE name = ?', (host,)).fetchone()[0]
+
+    def add_snapshot(self, report, host=None, alias=None, collected_at=None, user=None):
+        """Grava um `Report` (ou seu `as_dict()`) e retorna o id do snapshot.
+
+        `host` padrão: o nome da máquina na identificação do relatório.
+        """
+        if isinstance(report, dict):
+            report = _model.Report.from_dict(report)
+        ident = report.identification
+        machine = _text(getattr(ident, 'computer_name', None))
+        host = _text(host) or machine
+        if not host:
+            raise ValueError('snapshot sem host')
+        if collected_at is None:
+            collected_at = _number(getattr(ident, 'generated_at', None)) or time.time()
+        os_name, os_build, os_arch = split_os_version(report.os_version)
+        cpu = report.processors[0].name if report.processors else None
+        ips = {}
+        for nic in report.network_interfaces:
+            if _text(nic.mac):
+                ips.setdefault(nic.mac.upper(), _text(nic.ip))
+        with self._lock:
+            cur = self._conn.cursor()
+            try:
+                host_id = self._host_id(cur, host, _text(alias))
+                cur.execute(
+                    'INSERT INTO snapshots(host_id, collected_at, machine, machine_type, user, os_name, os_build, os_arch,'
+                    ' windows_status, office_version, domain, ram_gb, cpu_model, report)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (host_id, collected_at, machine, _text(getattr(ident, 'machine_type', None)),
+                     _text(user) or _text(getattr(ident, 'generated_by', None)), os_name, os_build, os_arch,
+                     _text(report.windows_status), _text(report.office_version), _text(report.domain),
+                     _number(report.memory_total), _text(cpu),
+                     json.dumps(report.as_dict(), ensure_ascii=False, default=str)))
+                sid = cur.lastrowid
+                cur.executemany('INSERT INTO software VALUES (?, ?, ?, ?)',
+                                [(sid, _text(s.name), _text(s.version), _text(s.publisher)) for s in report.software if _text(s.name)])
+                cur.executemany('INSERT INTO processors VALUES (?, ?, ?, ?, ?)',
+                                [(sid, _text(p.name), _text(p.manufacturer), _number(p.cores), _number(p.logical_processors))
+                                 for p in report.processors])
+                cur.executemany('INSERT INTO memory_modules VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                [(sid, _text(m.location), _number(m.capacity), _text(m.memory_type), _text(m.speed),
+                                  _text(m.manufacturer), _text(m.part_number)) for m in report.memory_modules])
+                cur.executemany('INSERT INTO disks VALUES (?, ?, ?, ?, ?)',
+                                [(sid, _text(d.model), _text(d.size), _text(d.disk_type), _text(d.interface)) for d in report.disks])
+                cur.executemany('INSERT INTO network_adapters VALUES (?, ?, ?, ?, ?)',
+                                [(sid, _text(n.name), _text(n.manufacturer), _text(n.mac),
+                                  ips.get(str(n.mac or '').upper())) for n in report.network_adapters])
+                cur.executemany('INSERT INTO admins VALUES (?, ?)',
+                                [(sid, _text(a)) for a in report.admins if _text(a)])
+                # o snapshot mais recente (pela data da coleta) é o "atual" do host
+                cur.execute('UPDATE hosts SET last_snapshot_id = ? WHERE id = ? AND (last_snapshot_id IS NULL OR'
+                            ' (SELECT collected_at FROM snapshots WHERE id = last_snapshot_id) <= ?)',
+                            (sid, host_id, collected_at))
+                _swindex.update_host(cur, host_id)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            finally:
+                cur.close()
+        return sid
+
+    # consultas ----------------------------------------------------------
+
+    def query(self, sql, params=()):
+        """Executa uma consulta e retorna as linhas como dicionários."""
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def _latest(self, where='', params=(), extra_columns='', joins='', order='h.name'):
+        sql = ('SELECT h.name AS host, h.alias AS alias, s.id AS snapshot_id, s.collected_at, s.machine_type, s.os_name,'
+               ' s.os_build, s.ram_gb, s.cpu_model, s.domain' + extra_columns +
+               ' FROM hosts h JOIN snapshots s ON s.id = h.last_snapshot_id' + joins +
+               (' WHERE ' + where if where else '') + ' ORDER BY ' + order)
+        return self.query(sql, params)
+
+    def hosts(self):
+        """Resumo do snapshot mais recente de cada host."""
+        return self._latest()
+
+    def ram(self, below=None, above=None):
+        """Hosts com RAM total (GB) abaixo de `below` e/ou acima de `above`."""
+        cond, params = [], []
+        if below is not None:
+            cond.append('s.ram_gb < ?')
+            params.append(float(below))
+        if above is not None:
+            cond.append('s.ram_gb > ?')
+            params.append(float(above))
+        return self._latest(' AND '.join(cond), params, order='s.ram_gb, h.name')
+
+    def cpu(self, text):
+        """Hosts cujo processador contém `text`."""
+        return self._latest('EXISTS (SELECT 1 FROM processors p WHERE p.snapshot_id = s.id AND p.name LIKE ?)',
+                            ('%' + text + '%',))
+
+    def windows(self, text):
+        """Hosts cujo nome ou build do Windows contém `text`."""
+        like = '%' + text + '%'
+        return self._latest('(s.os_name LIKE ? OR s.os_build LIKE ?)', (like, like), order='s.os_build, h.name')
+
+    def software(self, name, version=None, exact=False):
+        """Hosts com um software instalado (nome contém `name`, ou igual com `exact`).
+
+        `version` filtra pela versão (prefixo: '16' casa '16.0.4266').
+        """
+        cond = ['sw.name = ?' if exact else 'sw.name LIKE ?']
+        params = [name if exact else '%' + name + '%']
+        if version:
+            cond.append('sw.version LIKE ?')
+            params.append(version + '%')
+        return self._latest(' AND '.join(cond), params,
+                            extra_columns=', sw.name AS software, sw.version AS version, sw.publisher AS publisher',
+                            joins=' JOIN software sw ON sw.snapshot_id = s.id', order='h.name, sw.name')
+
+    def find_software(self, text, prefix=False, min_version=None, max_version=None, publisher=None):
+        """Busca no índice invertido de softwares (ver csinfo._swindex)."""
+        return self.software_index.search(text, prefix, min_version, max_version, publisher)
+
+    def history(self, host):
+        """Snapshots de um host, do mais recente ao mais antigo."""
+        return self.query('SELECT s.id AS snapshot_id, s.collected_at, s.os_name, s.os_build, s.ram_gb, s.cpu_model,'
+                          ' (SELECT COUNT(*) FROM software sw WHERE sw.snapshot_id = s.id) AS software'
+                          ' FROM snapshots s JOIN hosts h ON h.id = s.host_id WHERE h.name = ?'
+                          ' ORDER BY s.collected_at DESC', (host,))
+
+    def report(self, snapshot_id):
+        """`Report` gravado em um snapshot (ou None)."""
+        rows = self.query('SELECT report FROM snapshots WHERE id = ?', (snapshot_id,))
+        if not rows or not rows[0]['report']:
+            return None
+        return _model.Report.from_dict(json.loads(rows[0]['report']))
+
+    def latest_report(self, host):
+        """`Report` do snapshot mais recente de `host` (ou None)."""
+        rows = self.query('SELECT last_snapshot_id FROM hosts WHERE name = ?', (host,))
+        if not rows or rows[0]['last_snapshot_id'] is None:
+            return None
+        return self.report(rows[0]['last_snapshot_id'])
+
+    def diff(self, host=None, old_id=None, new_id=None, ignore=None):
+        """Alterações entre dois snapshots (`ChangeSet`, ver csinfo._diff).
+
+        Sem ids, compara os dois snapshots mais recentes de `host`; só com
+        `new_id`, compara com o snapshot anterior do mesmo host. Retorna None
+        se não houver dois snapshots para comparar.
+        """
+        from . import _diff
+        if new_id is None:
+            ids = [row['snapshot_id'] for row in self.history(host)[:2]]
+            if len(ids) < 2:
+                return None
+            new_id = ids[0]
+            old_id = ids[1] if old_id is None else old_id
+        elif old_id is None:
+            rows = self.query('SELECT p.id FROM snapshots s JOIN snapshots p ON p.host_id = s.host_id'
+                              ' AND p.collected_at < s.collected_at WHERE s.id = ?'
+                              ' ORDER BY p.collected_at DESC LIMIT 1', (new_id,))
+            if not rows:
+                return None
+            old_id = rows[0]['id']
+        old, new = self.report(old_id), self.report(new_id)
+        if old is None or new is None:
+            return None
+        return _diff.diff_reports(old, new, ignore=ignore)
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_store(path=None):
+    """`InventoryStore` compartilhado por caminho (um por banco no processo)."""
+    key = os.path.abspath(path or _state.state_path(DEFAULT_NAME))
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = InventoryStore(key)
+        return store
+
+
+def get_default_store():
+    """Inventário definido por CSINFO_STORE, ou None se desativado."""
+    spec = os.environ.get('CSINFO_STORE', '').strip()
+    if not spec or spec == '0':
+        return None
+    return open_store(None if spec == '1' else spec)
+
+
+def record(report, store=None, host=None, alias=None, user=None):
+    """Grava `report` no inventário de `store` (instância, caminho ou None = CSINFO_STORE).
+
+    Retorna o id do snapshot, ou None se não houver inventário ou a gravação
+    falhar (a coleta não é interrompida por isso).
+    """
+    if report is None or store is False:
+        return None
+    try:
+        if store is None:
+            store = get_default_store()
+        elif not isinstance(store, InventoryStore):
+            store = open_store(store)
+        if store is None:
+            return None
+        return store.add_snapshot(report, host=host, alias=alias, user=user)
+    except Exception as e:
+        try:
+            print(f"Aviso: não foi possível gravar no inventário: {e}", file=sys.stderr)
+        except Exception:
+            pass
+        return None
+
+
+def _format_rows(rows, columns=None):
+    if not rows:
+        return '(nenhum resultado)'
+    columns = columns or list(rows[0].keys())
+    data = []
+    for row in rows:
+        item = []
+        for col in columns:
+            value = row.get(col)
+            if col == 'collected_at' and isinstance(value, (int, float)):
+                value = time.strftime('%Y-%m-%d %H:%M', time.localtime(value))
+            item.append('' if value is None else str(value))
+        data.append(item)
+    widths = [max(len(col), *(len(item[i]) for item in data)) for i, col in enumerate(columns)]
+    out = ['  '.join(col.ljust(w) for col, w in zip(columns, widths))]
+    out += ['  '.join(v.ljust(w) for v, w in zip(item, widths)) for item in data]
+    out.append(f'{len(rows)} resultado(s)')
+    return '\n'.join(out)
+
+
+def _import_files(store, paths):
+    """Importa os JSON por host gravados por csinfo._fleet."""
+    total = 0
+    for path in paths:
+        data = _state.load_json(path)
+        if not isinstance(data, dict) or not data.get('report'):
+            print(f"{path}: sem relatório, ignorado", file=sys.stderr)
+            continue
+        store.add_snapshot(data['report'], host=data.get('host'), alias=data.get('alias'), user=data.get('user'))
+        total += 1
+    return total
+
+
+def cli(argv=None):
+    """Linha de comando do inventário (`csinfo-inventory`)."""
+    parser = argparse.ArgumentParser(description='Consultas ao inventário da frota (SQLite).')
+    parser.add_argument('--db', default=None, help='arquivo do banco (padrão: CSINFO_STORE ou inventory.sqlite3 no diretório de estado)')
+    parser.add_argument('--json', action='store_true', help='saída em JSON')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('hosts', help='snapshot mais recente de cada host')
+    p = sub.add_parser('ram', help='hosts por quantidade de RAM (GB)')
+    p.add_argument('--below', type=float, default=None)
+    p.add_argument('--above', type=float, default=None)
+    p = sub.add_parser('software', help='hosts com um software instalado')
+    p.add_argument('name')
+    p.add_argument('--version', default=None, help='prefixo da versão')
+    p.add_argument('--exact', action='store_true', help='nome exato')
+    p = sub.add_parser('find', help='busca por trecho do nome no índice de softwares (com faixa de versão)')
+    p.add_argument('text')
+    p.add_argument('--prefix', action='store_true', help='palavras do nome começando pelo termo')
+    p.add_argument('--min', dest='min_version', default=None, help='versão mínima (inclusive)')
+    p.add_argument('--max', dest='max_version', default=None, help='versão máxima (exclusive)')
+    p.add_argument('--publisher', default=None, help='editor contém')
+    p.add_argument('--by-host', action='store_true', help='quantidade de instalações por host')
+    p = sub.add_parser('cpu', help='hosts por modelo de processador')
+    p.add_argument('text')
+    p = sub.add_parser('os', help='hosts por nome/build do Windows')
+    p.add_argument('text')
+    p = sub.add_parser('history', help='snapshots de um host')
+    p.add_argument('host')
+    p = sub.add_parser('diff', help='alterações entre as duas últimas coletas de um host (ou entre dois snapshots)')
+    p.add_argument('host', nargs='?')
+    p.add_argument('--from', dest='old_id', type=int, default=None, help='snapshot antigo')
+    p.add_argument('--to', dest='new_id', type=int, default=None, help='snapshot novo')
+    p = sub.add_parser('import', help='importar os JSON por host gerados pela coleta da frota')
+    p.add_argument('files', nargs='+')
+    p = sub.add_parser('sql', help='consulta SQL livre')
+    p.add_argument('statement')
+    args = parser.parse_args(argv)
+
+    path = args.db
+    if path is None:
+        spec = os.environ.get('CSINFO_STORE', '').strip()
+        path = spec if spec not in ('', '0', '1') else None
+    store = InventoryStore(path)
+    try:
+        start = time.perf_counter()
+        if args.cmd == 'import':
+            print(f"{_import_files(store, args.files)} snapshot(s) importado(s) em {store.path}")
+            return 0
+        if args.cmd == 'diff':
+            changes = store.diff(args.host, old_id=args.old_id, new_id=args.new_id)
+            if changes is None:
+                print('sem dois snapshots para comparar', file=sys.stderr)
+                return 1
+            if args.json:
+                print(json.dumps(changes.as_dict(), ensure_ascii=False, indent=2, default=str))
+            else:
+                print('\n'.join(changes.lines()))
+                print(f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+            return 0
+        if args.cmd == 'hosts':
+            rows = store.hosts()
+        elif args.cmd == 'ram':
+            rows = store.ram(below=args.below, above=args.above)
+        elif args.cmd == 'software':
+            rows = store.software(args.name, version=args.version, exact=args.exact)
+        elif args.cmd == 'find':
+            busca = store.software_index.by_host if args.by_host else store.software_index.search
+            rows = busca(args.text, args.prefix, args.min_version, args.max_version, args.publisher)
+        elif args.cmd == 'cpu':
+            rows = store.cpu(args.text)
+        elif args.cmd == 'os':
+            rows = store.windows(args.text)
+        elif args.cmd == 'history':
+            rows = store.history(args.host)
+        else:
+            rows = store.query(args.statement)
+        elapsed = time.perf_counter() - start
+        if args.json:
+            print(json.dumps(rows, ensure_ascii=False, indent=2, default=str))
+        else:
+            columns = None
+            if args.cmd in ('hosts', 'ram', 'cpu', 'os'):
+                columns = list(_HOST_COLUMNS)
+            elif args.cmd == 'software' or (args.cmd == 'find' and not args.by_host):
+                columns = ['host', 'alias', 'software', 'version', 'publisher', 'collected_at']
+            print(_format_rows(rows, columns))
+            print(f"({elapsed * 1000:.1f} ms)")
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
@@ -0,0 +1,222 @@
+"""Índice invertido dos softwares instalados na frota (ver csinfo._store).
+
+Com centenas de hosts a tabela `software` do inventário passa de centenas de
+milhares de linhas, e as buscas do dia a dia ("algum host com AnyDesk",
+"Java abaixo de 8.0.3000") eram `LIKE '%...%'` sobre todas elas. Aqui cada
+nome distinto de software (com o editor) é gravado uma única vez em
+`sw_names`, com dois índices invertidos:
+
+- `sw_trigrams`: trigramas do nome normalizado -> nomes (busca por trecho:
+  os nomes candidatos são os que têm todos os trigramas do termo, depois
+  conferidos);
+- `sw_tokens`: palavras do nome -> nomes (busca por prefixo de palavra, por
+  faixa no índice).
+
+`sw_current` guarda o que está instalado em cada host segundo o snapshot
+mais recente, com a versão também numa chave ordenável (`version_key`) para
+filtros por faixa de versão. O índice é atualizado dentro da mesma transação
+de `InventoryStore.add_snapshot`, só com a diferença para o snapshot
+anterior do host (nomes novos ganham trigramas; instalações removidas ou
+adicionadas mudam linhas de `sw_current`); nunca é reconstruído. Bancos
+criados antes do índice são alcançados host a host ao abrir o inventário.
+"""
+import re
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sw_names (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL COLLATE NOCASE,
+    publisher TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    norm TEXT NOT NULL,
+    UNIQUE (name, publisher)
+);
+CREATE TABLE IF NOT EXISTS sw_trigrams (
+    trigram TEXT NOT NULL,
+    name_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, name_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sw_tokens (
+    token TEXT NOT NULL,
+    name_id INTEGER NOT NULL,
+    PRIMARY KEY (token, name_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sw_current (
+    host_id INTEGER NOT NULL,
+    name_id INTEGER NOT NULL,
+    version TEXT NOT NULL DEFAULT '',
+    version_key TEXT,
+    PRIMARY KEY (name_id, host_id, version)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_sw_current_host ON sw_current(host_id);
+CREATE INDEX IF NOT EXISTS ix_sw_current_version ON sw_current(name_id, version_key);
+CREATE TABLE IF NOT EXISTS sw_indexed (
+    host_id INTEGER PRIMARY KEY,
+    snapshot_id INTEGER
+);
+'''
+
+_SPACES = re.compile(r'\s+')
+_TOKEN = re.compile(r'[0-9a-zà-ÿ]+')
+_DIGITS = re.compile(r'\d+')
+# limite de parâmetros por consulta (SQLite antigo aceita 999)
+_CHUNK = 500
+
+
+def normalize(text):
+    return _SPACES.sub(' ', str(text or '').strip().lower())
+
+
+def trigrams(norm):
+    return {norm[i:i + 3] for i in range(len(norm) - 2)}
+
+
+def tokens(norm):
+    return set(_TOKEN.findall(norm))
+
+
+def version_key(version):
+    """Chave ordenável da versão: cada grupo de dígitos com 10 casas.
+
+    '8.0.3010.9' -> '0000000008.0000000000.0000000003010...'; versões sem
+    dígitos ('N/A') não têm chave e ficam fora dos filtros por faixa.
+    """
+    partes = _DIGITS.findall(str(version or ''))
+    if not partes:
+        return None
+    return '.'.join(p[-10:].zfill(10) for p in partes[:8])
+
+
+def _name_id(cur, cache, name, publisher):
+    chave = (name.lower(), publisher.lower())
+    if chave in cache:
+        return cache[chave]
+    row = cur.execute('SELECT id FROM sw_names WHERE name = ? AND publisher = ?', (name, publisher)).fetchone()
+    if row is not None:
+        cache[chave] = row[0]
+        return row[0]
+    norm = normalize(name)
+    cur.execute('INSERT INTO sw_names(name, publisher, norm) VALUES (?, ?, ?)', (name, publisher, norm))
+    name_id = cur.lastrowid
+    cur.executemany('INSERT OR IGNORE INTO sw_trigrams VALUES (?, ?)', [(t, name_id) for t in trigrams(norm)])
+    cur.executemany('INSERT OR IGNORE INTO sw_tokens VALUES (?, ?)', [(t, name_id) for t in tokens(norm)])
+    cache[chave] = name_id
+    return name_id
+
+
+def update_host(cur, host_id):
+    """Leva `sw_current` do host ao seu snapshot mais recente; retorna as linhas alteradas."""
+    row = cur.execute('SELECT h.last_snapshot_id, i.snapshot_id FROM hosts h LEFT JOIN sw_indexed i ON i.host_id = h.id'
+                      ' WHERE h.id = ?', (host_id,)).fetchone()
+    if row is None or row[0] is None or row[0] == row[1]:
+        return 0
+    snapshot_id = row[0]
+    cache = {}
+    desejado = {}
+    for name, version, publisher in cur.execute('SELECT name, version, publisher FROM software WHERE snapshot_id = ?',
+                                                (snapshot_id,)).fetchall():
+        if not name:
+            continue
+        name_id = _name_id(cur, cache, name, publisher or '')
+        desejado[(name_id, version or '')] = version_key(version)
+    atual = {(name_id, version) for name_id, version in
+             cur.execute('SELECT name_id, version FROM sw_current WHERE host_id = ?', (host_id,)).fetchall()}
+    removidos = [(host_id, name_id, version) for name_id, version in atual if (name_id, version) not in desejado]
+    novos = [(host_id, name_id, version, key) for (name_id, version), key in desejado.items() if (name_id, version) not in atual]
+    cur.executemany('DELETE FROM sw_current WHERE host_id = ? AND name_id = ? AND version = ?', removidos)
+    cur.executemany('INSERT INTO sw_current VALUES (?, ?, ?, ?)', novos)
+    cur.execute('INSERT INTO sw_indexed(host_id, snapshot_id) VALUES (?, ?)'
+                ' ON CONFLICT(host_id) DO UPDATE SET snapshot_id = excluded.snapshot_id', (host_id, snapshot_id))
+    return len(removidos) + len(novos)
+
+
+def sync(cur):
+    """Atualiza os hosts cujo índice não corresponde ao snapshot mais recente."""
+    pendentes = [r[0] for r in cur.execute(
+        'SELECT h.id FROM hosts h LEFT JOIN sw_indexed i ON i.host_id = h.id'
+        ' WHERE h.last_snapshot_id IS NOT NULL AND (i.snapshot_id IS NULL OR i.snapshot_id != h.last_snapshot_id)').fetchall()]
+    for host_id in pendentes:
+        update_host(cur, host_id)
+    return len(pendentes)
+
+
+def _chunks(values):
+    values = list(values)
+    for i in range(0, len(values), _CHUNK):
+        yield values[i:i + _CHUNK]
+
+
+class SoftwareIndex(object):
+    """Consultas ao índice de softwares de um `InventoryStore`."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def _rows(self, sql, params=()):
+        return self.store.query(sql, params)
+
+    def names(self, text, prefix=False):
+        """Ids dos nomes que contêm `text` (ou com palavras começando pelas de `text`)."""
+        norm = normalize(text)
+        if not norm:
+            return set()
+        if prefix:
+            ids = None
+            for token in sorted(tokens(norm)):
+                achados = {r['name_id'] for r in self._rows(
+                    'SELECT name_id FROM sw_tokens WHERE token >= ? AND token < ?', (token, token + '\uffff'))}
+                ids = achados if ids is None else ids & achados
+                if not ids:
+                    return set()
+            return ids or set()
+        grams = sorted(trigrams(norm))
+        if not grams:
+            # termo curto demais para trigramas: poucos milhares de nomes distintos, filtrar direto
+            return {r['id'] for r in self._rows('SELECT id FROM sw_names WHERE instr(norm, ?) > 0', (norm,))}
+        marcadores = ', '.join('?' * len(grams))
+        candidatos = self._rows(
+            f'SELECT n.id, n.norm FROM sw_trigrams t JOIN sw_names n ON n.id = t.name_id'
+            f' WHERE t.trigram IN ({marcadores}) GROUP BY t.name_id HAVING COUNT(*) = ?', grams + [len(grams)])
+        return {r['id'] for r in candidatos if norm in r['norm']}
+
+    def _filtro(self, min_version=None, max_version=None, publisher=None):
+        cond, params = [], []
+        if min_version is not None:
+            cond.append('c.version_key >= ?')
+            params.append(version_key(min_version) or '')
+        if max_version is not None:
+            cond.append('c.version_key < ?')
+            params.append(version_key(max_version) or '')
+        if publisher:
+            cond.append('instr(lower(n.publisher), ?) > 0')
+            params.append(normalize(publisher))
+        return cond, params
+
+    def search(self, text, prefix=False, min_version=None, max_version=None, publisher=None):
+        """Instalações atuais de softwares cujo nome contém `text`.
+
+        `prefix=True` casa palavras do nome pelo início ('any' -> 'AnyDesk').
+        `min_version` (inclusive) e `max_version` (exclusive) comparam as
+        versões grupo a grupo de dígitos ('8.0.3010.9' < '8.0.3100').
+        """
+        ids = self.names(text, prefix)
+        linhas = []
+        for parte in _chunks(sorted(ids)):
+            cond, params = self._filtro(min_version, max_version, publisher)
+            cond.insert(0, f"c.name_id IN ({', '.join('?' * len(parte))})")
+            linhas += self._rows(
+                'SELECT h.name AS host, h.alias AS alias, n.name AS software, c.version AS version,'
+                ' n.publisher AS publisher, s.collected_at AS collected_at'
+                ' FROM sw_current c JOIN sw_names n ON n.id = c.name_id JOIN hosts h ON h.id = c.host_id'
+                ' LEFT JOIN snapshots s ON s.id = h.last_snapshot_id WHERE ' + ' AND '.join(cond),
+                parte + params)
+        linhas.sort(key=lambda r: (r['host'].lower(), r['software'].lower(), version_key(r['version']) or ''))
+        return linhas
+
+    def by_host(self, text, prefix=False, min_version=None, max_version=None, publisher=None):
+        """Quantidade de instalações encontradas por host (mais encontradas primeiro)."""
+        contagem = {}
+        for linha in self.search(text, prefix, min_version, max_version, publisher):
+            item = contagem.setdefault(linha['host'], {'host': linha['host'], 'alias': linha['alias'], 'matches': 0,
+                                                       'collected_at': linha['collected_at']})
+            item['matches'] += 1
+        return sorted(contagem.values(), key=lambda r: (-r['matches'], r['host'].lower()))
@@ -0,0 +1,146 @@
+"""Verificação do Windows Update em segundo plano com o último valor conhecido.
+
+A busca via COM `Microsoft.Update.Session` pode levar minutos (timeout=60 com
+3 tentativas) e era o primeiro getter de `main()`, segurando o relatório
+inteiro. Agora o relatório usa imediatamente o último resultado conhecido do
+host (com a data da verificação) e uma nova busca roda em uma thread; ao
+terminar, o resultado é gravado no diretório de estado e os ouvintes
+registrados (ex.: a GUI) são avisados.
+
+Sem valor conhecido (primeira coleta do host), o relatório aguarda a busca
+por até CSINFO_WU_WAIT segundos (padrão 15) antes de seguir sem ela.
+CSINFO_WU_BACKGROUND=0 volta à busca síncrona dentro do relatório.
+
+Só há quem receba um resultado tardio quando existe ouvinte registrado (a
+GUI). Sem ouvintes (CLI, `main()` avulso, frota) a espera da primeira coleta
+vai até o fim da busca, e a thread não é daemon: o processo só termina depois
+de gravar o resultado, que fica para a próxima coleta.
+"""
+import threading
+import time
+from datetime import datetime
+
+from . import _pshost
+from . import _state
+
+_LOCK = threading.Lock()
+_JOBS = {}          # host -> threading.Thread em execução
+_LISTENERS = []
+
+
+def _key(computer_name):
+    return str(computer_name or '').strip().lower()
+
+
+def _store_path():
+    return _state.state_path('windows_update.json')
+
+
+def last_known(computer_name=None):
+    """Último resultado conhecido do host: (texto, timestamp) ou None."""
+    with _LOCK:
+        data = _state.load_json(_store_path(), {})
+    entry = data.get(_key(computer_name)) if isinstance(data, dict) else None
+    if not isinstance(entry, dict) or not entry.get('value'):
+        return None
+    return entry['value'], float(entry.get('ts', 0))
+
+
+def _save(computer_name, value, ts):
+    with _LOCK:
+        data = _state.load_json(_store_path(), {})
+        if not isinstance(data, dict):
+            data = {}
+        data[_key(computer_name)] = {'value': value, 'ts': ts}
+        _state.save_json(_store_path(), data)
+
+
+def add_listener(callback):
+    """Registra `callback(computer_name, texto, timestamp)` para novas verificações."""
+    with _LOCK:
+        if callback not in _LISTENERS:
+            _LISTENERS.append(callback)
+
+
+def remove_listener(callback):
+    with _LOCK:
+        if callback in _LISTENERS:
+            _LISTENERS.remove(callback)
+
+
+def refresh(computer_name=None, search=None):
+    """Dispara (ou reaproveita) a busca em segundo plano e retorna a thread.
+
+    `search(computer_name)` executa a busca e devolve o texto; por padrão usa
+    `csinfo._impl.get_windows_update_status`.
+    """
+    key = _key(computer_name)
+    with _LOCK:
+        job = _JOBS.get(key)
+        if job is not None and job.is_alive():
+            return job
+        # sem ouvintes, o fim do processo não pode descartar a busca em andamento
+        job = threading.Thread(target=_run, args=(computer_name, search), name=f"csinfo-wu-{key or 'local'}",
+                               daemon=bool(_LISTENERS))
+        _JOBS[key] = job
+    job.start()
+    return job
+
+
+def _run(computer_name, search):
+    try:
+        if search is None:
+            from . import _impl
+            search = _impl.get_windows_update_status
+        value = search(computer_name)
+    except Exception:
+        value = None
+    finally:
+        with _LOCK:
+            if _JOBS.get(_key(computer_name)) is threading.current_thread():
+                del _JOBS[_key(computer_name)]
+    if not value or str(value).strip() == 'NÃO OBTIDO':
+        return
+    ts = time.time()
+    _save(computer_name, str(value).strip(), ts)
+    with _LOCK:
+        listeners = list(_LISTENERS)
+    for cb in listeners:
+        try:
+            cb(computer_name, str(value).strip(), ts)
+        except Exception:
+            pass
+
+
+def format_status(value, ts, pending=False):
+    """Texto do relatório para um resultado com a data da verificação."""
+    quando = datetime.fromtimestamp(ts).strftime('%d/%m/%Y %H:%M')
+    sufixo = '; nova verificação em andamento' if pending else ''
+    return f"{value} (verificado em {quando}{sufixo})"
+
+
+def _interactive():
+    with _LOCK:
+        return bool(_LISTENERS)
+
+
+def status_for_report(computer_name=None, wait=None, search=None):
+    """Valor para o relatório: último conhecido (e dispara nova busca) ou espera.
+
+    Sem valor conhecido, espera `wait` segundos (padrão CSINFO_WU_WAIT) se há
+    ouvintes para o resultado tardio; sem ouvintes, espera a busca terminar.
+    """
+    job = refresh(computer_name, search)
+    known = last_known(computer_name)
+    if known is None:
+        if not _interactive():
+            job.join()
+        else:
+            if wait is None:
+                wait = _pshost._env_number('CSINFO_WU_WAIT', 15.0, float)
+            job.join(max(0.0, wait))
+        known = last_known(computer_name)
+        if known is None:
+            return "Verificação em andamento (resultado disponível na próxima coleta)" if job.is_alive() else "NÃO OBTIDO"
+        return format_status(known[0], known[1])
+    return format_status(known[0], known[1], pending=job.is_alive())
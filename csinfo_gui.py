@@ -432,6 +432,10 @@ class CSInfoGUI(tk.Tk):
         self._pinging = False
         self._keep_progress = False
         self.last_lines = []
+        # modelo da última coleta (csinfo._model.Report), usado na exportação
+        self.last_report = None
+        # resultado do Windows Update aplicado às linhas antes de o modelo chegar
+        self._last_wu_text = None
         self._last_collection_computer = None
         self.machine_list = []
         self.machine_json_path = self._get_machine_json_path()
@@ -440,6 +444,13 @@ class CSInfoGUI(tk.Tk):
         self._build_ui()
         self.load_machine_list()
         self.protocol('WM_DELETE_WINDOW', self._on_close_attempt)
+        # a verificação do Windows Update termina em segundo plano, depois da coleta
+        try:
+            if csinfo and hasattr(csinfo, 'add_windows_update_listener'):
+                csinfo.add_windows_update_listener(
+                    lambda host, texto, ts: self.queue.put(('windows_update', host, texto, ts)))
+        except Exception:
+            pass
         self.after(100, self._process_queue)
 
     def _get_machine_json_path(self):
@@ -1020,10 +1031,23 @@ class CSInfoGUI(tk.Tk):
             pass
 
     # ping helpers
+    def _probe_module(self):
+        """csinfo._probe (ping e portas TCP em paralelo) ou None se indisponível."""
+        try:
+            return importlib.import_module('csinfo._probe')
+        except Exception:
+            return None
+
     def _ping_host(self, host):
         if not host:
             return False
         host = host.strip()
+        probe = self._probe_module()
+        if probe is not None:
+            try:
+                return probe.probe_host(host, timeout=1.0).reachable
+            except Exception:
+                pass
         try:
             if sys.platform.startswith('win'):
                 creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
@@ -1053,24 +1077,8 @@ class CSInfoGUI(tk.Tk):
             def _runner():
                 try:
                     self._pinging = True
-                    # reutiliza a implementação existente do _ping_worker
-                    try:
-                        self._ping_worker()
-                    except Exception:
-                        # fallback: ping manualmente
-                        for m in list(self.machine_list):
-                            name = (m.get('name') or '').strip()
-                            try:
-                                on = self._ping_host(name)
-                                status_text = 'ONLINE' if on else 'OFFLINE'
-                                self.queue.put(('machine_status', name, status_text))
-                            except Exception:
-                                pass
-                    # persist após atualização
-                    try:
-                        self.save_machine_list()
-                    except Exception:
-                        pass
+                    # _ping_worker já persiste a lista ao final
+                    self._ping_worker()
                 finally:
                     self._pinging = False
             threading.Thread(target=_runner, daemon=True).start()
@@ -1078,18 +1086,45 @@ class CSInfoGUI(tk.Tk):
             pass
 
     def _ping_worker(self):
+        """Atualiza o estado de todas as máquinas com concorrência limitada.
+
+        Os hosts são verificados em paralelo (ping e portas 5985/5986/445, ver
+        csinfo._probe; no máximo CSINFO_GUI_PROBE_CONCURRENCY por vez, padrão
+        32) e cada resultado vai para a fila da UI assim que chega; a lista é
+        gravada uma única vez ao final.
+        """
         try:
+            por_nome = {}
             for m in list(self.machine_list):
                 name = (m.get('name') or '').strip()
-                try:
-                    on = self._ping_host(name)
+                if name:
+                    por_nome.setdefault(name.upper(), []).append(m)
+            nomes = [ms[0].get('name').strip() for ms in por_nome.values()]
+            try:
+                concorrencia = max(1, int(os.environ.get('CSINFO_GUI_PROBE_CONCURRENCY', '32')))
+            except Exception:
+                concorrencia = 32
+
+            def publicar(name, on):
+                for m in por_nome.get(str(name).strip().upper(), []):
                     m['online'] = on
-                    status_text = 'ONLINE' if on else 'OFFLINE'
-                    # enqueue an update for the UI
-                    self.queue.put(('machine_status', name, status_text))
-                except Exception as ie:
-                    # errors are silently ignored for individual hosts
-                    pass
+                # enqueue an update for the UI
+                self.queue.put(('machine_status', name, 'ONLINE' if on else 'OFFLINE'))
+
+            probe = self._probe_module()
+            if probe is not None and nomes:
+                probe.probe_hosts(nomes, concurrency=concorrencia, timeout=1.0,
+                                  on_result=lambda r: publicar(r.host, r.reachable))
+            elif nomes:
+                from concurrent.futures import ThreadPoolExecutor, as_completed
+                with ThreadPoolExecutor(max_workers=min(concorrencia, len(nomes))) as pool:
+                    futuros = {pool.submit(self._ping_host, name): name for name in nomes}
+                    for fut in as_completed(futuros):
+                        try:
+                            publicar(futuros[fut], bool(fut.result()))
+                        except Exception:
+                            # errors are silently ignored for individual hosts
+                            pass
             # persist results
             self.save_machine_list()
             # sinalizar conclusão ao loop principal para limpar indicador
@@ -1267,9 +1302,15 @@ class CSInfoGUI(tk.Tk):
                     if csinfo:
                         # Não pedir export automático ao backend aqui; o usuário deve clicar em Exportar
                         try:
-                            csinfo.main(barra_callback=barra_callback,
-                                        computer_name=computer,
-                                        machine_alias=alias)
+                            resultado = csinfo.main(barra_callback=barra_callback,
+                                                    computer_name=computer,
+                                                    machine_alias=alias)
+                            if isinstance(resultado, dict) and resultado.get('report') is not None:
+                                self.queue.put(('report', resultado['report']))
+                            try:
+                                self._queue_changes(resultado)
+                            except Exception:
+                                pass
                         except Exception as e:
                             import traceback as _tb
                             tb = _tb.format_exc()
@@ -1421,6 +1462,22 @@ class CSInfoGUI(tk.Tk):
         self.worker_thread = threading.Thread(target=worker, daemon=True)
         self.worker_thread.start()
 
+    def _queue_changes(self, resultado):
+        """Envia ao painel as alterações desde a coleta anterior do host.
+
+        Só há comparação quando a coleta foi gravada no inventário
+        (CSINFO_STORE, ver csinfo._store); as linhas não entram na exportação.
+        """
+        snapshot_id = (resultado or {}).get('snapshot_id') if isinstance(resultado, dict) else None
+        if not snapshot_id:
+            return
+        from csinfo import _store
+        store = _store.get_default_store()
+        changes = store.diff(new_id=snapshot_id) if store is not None else None
+        if changes is None:
+            return
+        self.queue.put(('changes', ['', 'ALTERAÇÕES DESDE A ÚLTIMA COLETA'] + changes.lines()))
+
     # queue processing
     def _append_output(self, text):
         try:
@@ -1455,6 +1512,14 @@ class CSInfoGUI(tk.Tk):
                         except Exception:
                             pass
                     self.txt_output.configure(state='disabled')
+                elif kind == 'report':
+                    self.last_report = item[1]
+                    if self._last_wu_text is not None:
+                        self.last_report.windows_update = self._last_wu_text
+                elif kind == 'changes':
+                    # fora de last_lines: não fazem parte do relatório exportado
+                    for line in item[1]:
+                        self._append_output(str(line))
                 elif kind == 'progress':
                     pct = item[1]
                     stage = item[2]
@@ -1491,6 +1556,8 @@ class CSInfoGUI(tk.Tk):
                         pass
                     # não escrever logs de ping no painel para manter interface limpa
                     pass
+                elif kind == 'windows_update':
+                    self._apply_windows_update(item[1], item[2], item[3])
                 elif kind == 'ping_done':
                     # limpar indicador visual de atualização
                     try:
@@ -1547,6 +1614,45 @@ class CSInfoGUI(tk.Tk):
                     self.progress['value'] = 0
             self.after(100, self._process_queue)
 
+    def _apply_windows_update(self, host, texto, ts):
+        """Atualiza a linha do Windows Update da última coleta com o novo resultado."""
+        try:
+            atual = str(self._last_collection_computer or '').strip().lower()
+            if str(host or '').strip().lower() != atual or not self.last_lines:
+                return
+            try:
+                texto = csinfo._winupdate.format_status(texto, ts)
+            except Exception:
+                pass
+            for idx, line in enumerate(self.last_lines):
+                if line.startswith('Windows Update:'):
+                    self.last_lines[idx] = 'Windows Update:'
+                    if idx + 1 < len(self.last_lines) and self.last_lines[idx + 1].startswith('  '):
+                        self.last_lines[idx + 1] = f"  {texto}"
+                    else:
+                        self.last_lines.insert(idx + 1, f"  {texto}")
+                    break
+            else:
+                return
+            self._last_wu_text = texto
+            if self.last_report is not None:
+                self.last_report.windows_update = texto
+            # só a linha do resultado muda no painel: o restante (alterações
+            # desde a última coleta, avisos de exportação) não está em last_lines
+            inicio = self.txt_output.search('Windows Update:', '1.0', stopindex=tk.END)
+            if not inicio:
+                return
+            linha = int(inicio.split('.')[0]) + 1
+            self.txt_output.configure(state='normal')
+            if self.txt_output.get(f'{linha}.0', f'{linha}.2') == '  ':
+                self.txt_output.delete(f'{linha}.0', f'{linha}.end')
+                self.txt_output.insert(f'{linha}.0', f"  {texto}")
+            else:
+                self.txt_output.insert(f'{linha}.0', f"  {texto}\n")
+            self.txt_output.configure(state='disabled')
+        except Exception:
+            pass
+
     def _set_controls_state(self, state='normal'):
         # incluir botões que devem ser desabilitados durante processamento
         widgets = [
@@ -1729,6 +1835,8 @@ class CSInfoGUI(tk.Tk):
             self.txt_output.delete('1.0', tk.END)
             self.txt_output.configure(state='disabled')
             self.last_lines = []
+            self.last_report = None
+            self._last_wu_text = None
             self.btn_export.configure(state='disabled')
         except Exception:
             pass
@@ -1802,6 +1910,9 @@ class CSInfoGUI(tk.Tk):
         ts = datetime.now().strftime('%d%m%Y%H%M')
         base = f"Info_maquina_{_safe(alias) + '_' if alias else ''}{_safe(comp_name)}_{ts}"
         base_cwd = os.getcwd()
+        # exportar a partir do modelo da coleta quando disponível (sem
+        # reinterpretar as linhas do painel); senão, das linhas
+        dados = self.last_report if self.last_report is not None else self.last_lines
         # Propagar metadados do front-end para o backend antes de quaisquer exports
         try:
             if csinfo:
@@ -1836,7 +1947,7 @@ class CSInfoGUI(tk.Tk):
                 try:
                     if csinfo and hasattr(csinfo, 'write_report'):
                         try:
-                            csinfo.write_report(p, self.last_lines)
+                            csinfo.write_report(p, dados)
                         except TypeError:
                             csinfo.write_report(p, self.last_lines)
                     else:
@@ -1866,7 +1977,7 @@ class CSInfoGUI(tk.Tk):
                             except Exception:
                                 pass
                             # usar comp_name (resolvido acima) como nome da máquina
-                            csinfo.write_pdf_report(p, self.last_lines, comp_name)
+                            csinfo.write_pdf_report(p, dados, comp_name)
                         except TypeError:
                             try:
                                 csinfo.__version__ = __version__
@@ -1880,7 +1991,7 @@ class CSInfoGUI(tk.Tk):
                                 csinfo.__app_name__ = 'CSInfo'
                             except Exception:
                                 pass
-                            csinfo.write_pdf_report(p, self.last_lines)
+                            csinfo.write_pdf_report(p, dados)
                     else:
                         with open(p, 'w', encoding='utf-8') as fh:
                             fh.write('\n'.join(self.last_lines))
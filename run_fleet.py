@@ -0,0 +1,8 @@
+import sys
+
+from csinfo._fleet import cli
+
+
+if __name__ == '__main__':
+    # Ex.: python run_fleet.py C:\CEOSOFTWARE\machines_history.json -o Relatorio -j 8 -t 600
+    sys.exit(cli())
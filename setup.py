@@ -19,6 +19,9 @@ setup(
     entry_points={
         'console_scripts': [
             'csinfo=csinfo:main',
+            'csinfo-fleet=csinfo._fleet:cli',
+            'csinfo-inventory=csinfo._store:cli',
+            'csinfo-archive=csinfo._archive:cli',
         ],
     },
     include_package_data=True,
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _aio, _delta, _executor, _impl
+
+
+class _Lento(object):
+    """Executor simulado: 50 ms por comando, sem abrir processos."""
+
+    real = False
+
+    def __init__(self):
+        self.comandos = 0
+
+    def run(self, cmd, computer_name=None, *_args, **_kw):
+        self.comandos += 1
+        time.sleep(0.05)
+        return ''
+
+
+@pytest.fixture
+def coleta(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path / 'state'))
+    monkeypatch.setenv('CSINFO_SECTION_CACHE', '0')
+    monkeypatch.setenv('CSINFO_WU_BACKGROUND', '0')
+    monkeypatch.setenv('CSINFO_STORE', str(tmp_path / 'inv.sqlite3'))
+    monkeypatch.chdir(tmp_path)
+    terminou = threading.Event()
+    original = _impl.main
+
+    def main(*args, **kwargs):
+        try:
+            return original(*args, **kwargs)
+        finally:
+            terminou.set()
+
+    monkeypatch.setattr(_impl, 'main', main)
+    executor = _Lento()
+    anterior = _executor.set_executor(executor)
+    yield executor, terminou, tmp_path
+    _executor.set_executor(anterior)
+
+
+def _gravados(pasta):
+    return sorted(n for n in os.listdir(pasta) if n.startswith('Info_maquina') or n.endswith('.sqlite3'))
+
+
+def test_deadline_interrompe_a_montagem_sem_exportar(coleta):
+    executor, terminou, pasta = coleta
+
+    async def rodar():
+        await _aio.acollect('pc01', export_type='txt', deadline=time.monotonic() + 0.4)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(rodar())
+    assert terminou.wait(5)
+    assert 0 < executor.comandos < 20
+    assert _gravados(pasta) == []
+
+
+def test_cancelar_a_task_interrompe_a_montagem_sem_exportar(coleta):
+    executor, terminou, pasta = coleta
+
+    async def rodar():
+        task = asyncio.ensure_future(_aio.acollect('pc01', export_type='txt'))
+        await asyncio.sleep(0.4)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(rodar())
+    assert terminou.wait(5)
+    assert _gravados(pasta) == []
+
+
+def test_coleta_completa_exporta_e_grava(coleta):
+    executor, terminou, pasta = coleta
+    executor.run = lambda cmd, computer_name=None, *_a, **_kw: ''
+    dados = asyncio.run(_aio.acollect('pc01', export_type='txt'))
+    assert dados['txt'] and dados['snapshot_id']
+    assert _gravados(pasta) == ['Info_maquina_pc01.txt', 'inv.sqlite3']
+
+
+def test_impressoes_digitais_do_delta_fora_do_loop(coleta, monkeypatch):
+    executor, _terminou, pasta = coleta
+    monkeypatch.setattr(_delta, '_DEFAULT_STATE', _delta.DeltaCache(str(pasta / 'delta')))
+    threads = []
+
+    def run(cmd, computer_name=None, *_a, **_kw):
+        if cmd == _delta.FINGERPRINT_SCRIPT:
+            threads.append(threading.current_thread())
+            return '{"software": "1:a", "boot": "b", "pnp": "c", "disks": "d"}'
+        return ''
+
+    executor.run = run
+    asyncio.run(_aio.acollect('pc01', delta=True))
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,42 @@
+import os
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _archive, _model
+
+
+def _report(quando, softwares, livre='100 GB'):
+    return _model.Report(
+        identification=_model.Identification('PC01', 'Desktop', 'joao', quando),
+        os_version='Windows 10 Pro (Version 10.0.19045) - 64 bits',
+        memory_total='8.0 GB',
+        disks=[_model.Disk('Samsung SSD 860', '500 GB', '400 GB', livre, 2, 'SSD', 'SATA')],
+        software=[_model.Software(f'App {i}', '1.0', 'Editor') for i in range(softwares)],
+        admins=['Administrador'],
+    )
+
+
+def test_secoes_iguais_compartilham_blobs_e_gc_remove_orfaos(tmp_path):
+    arquivo = _archive.SnapshotArchive(str(tmp_path / 'arq'))
+    primeiro = arquivo.put(_report(100.0, 300))
+    segundo = arquivo.put(_report(200.0, 300, livre='90 GB'))
+    terceiro = arquivo.put(_report(300.0, 301, livre='90 GB'))
+    assert arquivo.snapshots('pc01') == [primeiro, segundo, terceiro]
+    # 7 seções no primeiro; depois só o disco e, no terceiro, os softwares mudam
+    assert arquivo.stats()['blobs'] == 9
+
+    reconstruido = arquivo.load(segundo)
+    assert reconstruido == _report(200.0, 300, livre='90 GB')
+    assert _model.render_lines(reconstruido) == _model.render_lines(_report(200.0, 300, livre='90 GB'))
+
+    txt = arquivo.render(terceiro, str(tmp_path / 'pc01.txt'))
+    with open(txt, encoding='utf-8') as fh:
+        assert 'App 300 | Versão: 1.0 | Editor: Editor' in fh.read()
+
+    descartados, removidos, _bytes = arquivo.prune(keep=1, grace=0)
+    assert (descartados, removidos) == (2, 2)
+    assert arquivo.snapshots() == [terceiro]
+    assert arquivo.load(terceiro) == _report(300.0, 301, livre='90 GB')
@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import threading
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _batch
+
+BIOS = '''
+    # fabricante da BIOS
+    $b = Get-CimInstance Win32_BIOS
+    $b.Manufacturer
+'''
+SCRIPT_AQUI = """$texto = @'
+  # não é comentário
+
+'@
+<# bloco
+   # ainda no bloco
+#>
+Write-Output $texto
+"""
+
+
+def get_bios(computer_name=None):
+    return _batch_run(BIOS, computer_name)
+
+
+def get_texto(computer_name=None):
+    return _batch_run(SCRIPT_AQUI, computer_name) + _batch_run('hostname', computer_name)
+
+
+def _batch_run(cmd, computer_name):
+    """Como `run_powershell`: consulta o lote e, sem resultado, executa de verdade."""
+    valor = _batch.lookup(cmd, computer_name, 30)
+    return 'real' if valor is None else valor
+
+
+def test_script_combinado_separa_saidas_por_secao_e_faz_replay():
+    plano = _batch.capture([get_bios, get_texto], 'PC01')
+    assert plano.sections == {'get_bios': [BIOS], 'get_texto': [SCRIPT_AQUI, 'hostname']}
+    assert plano.total_timeout() == 90
+
+    script = plano.build_script()
+    assert "$__csinfo['get_texto'] = @(" in script
+    assert '(__CSInfoRun ' + _batch._ps_quote('$b = Get-CimInstance Win32_BIOS\n$b.Manufacturer') + ')' in script
+    # here-string e comentário de bloco preservados linha a linha
+    assert "$texto = @''\n  # não é comentário\n\n''@\n<# bloco\n   # ainda no bloco\n#>\nWrite-Output $texto" in script
+
+    saida = 'aviso qualquer\n' + _batch._MARKER + '\n' + json.dumps(
+        {'get_bios': 'American Megatrends\r\n', 'get_texto': ['  # não é comentário', 'PC01']})
+    assert plano.load_output(saida)
+    plano.activate()
+    try:
+        assert get_bios('pc01') == 'American Megatrends'
+        # as saídas voltam sem espaços nas pontas
+        assert get_texto('PC01') == '# não é comentárioPC01'
+        assert _batch_run('ipconfig', 'pc01') == 'real'
+        plano.strict = True
+        assert _batch_run('ipconfig', 'pc01') == ''
+        assert plano.hits == 3
+    finally:
+        plano.release()
+    assert get_bios('pc01') == 'real'
+    assert not _batch.BatchPlan('PC01').load_output('sem marcador')
+
+
+def test_captura_registra_so_a_thread_que_captura():
+    dentro, liberar = threading.Event(), threading.Event()
+    outra = []
+
+    def lento(computer_name=None):
+        _batch_run('Get-Date', computer_name)
+        dentro.set()
+        liberar.wait(5)
+
+    t = threading.Thread(target=lambda: outra.append(dentro.wait(5) and _batch_run('whoami', 'PC01')))
+    t.start()
+    threading.Timer(0.5, liberar.set).start()
+    plano = _batch.capture([lento], 'PC01')
+    t.join(5)
+    # a outra thread consultou o mesmo alvo durante a captura e executou de verdade
+    assert outra == ['real']
+    assert plano.sections == {'lento': ['Get-Date']}
+    assert _batch_run('Get-Date', 'PC01') == 'real'
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _breaker, _executor, _fleet, _impl
+
+
+class _Relogio(object):
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    r = _Relogio()
+    monkeypatch.setattr(_breaker.time, 'monotonic', r)
+    return r
+
+
+def test_abre_no_limite_e_prova_uma_chamada_apos_o_cooldown(relogio):
+    breaker = _breaker.CircuitBreaker(threshold=2, cooldown=60)
+    assert not breaker.record_failure('PC01', 'sem resposta em 20s')
+    breaker.before_call('pc01')
+    assert breaker.state('pc01') == _breaker.CLOSED
+    assert breaker.record_failure('pc01', 'sem resposta em 20s')
+    assert breaker.state('PC01') == _breaker.OPEN
+    with pytest.raises(_breaker.CircuitOpenError) as erro:
+        breaker.before_call('PC01')
+    assert erro.value.reason == 'sem resposta em 20s'
+
+    relogio.agora += 59
+    with pytest.raises(_breaker.CircuitOpenError):
+        breaker.before_call('PC01')
+    relogio.agora += 1
+    breaker.before_call('PC01')
+    assert breaker.state('PC01') == _breaker.HALF_OPEN
+    # só uma chamada de prova por vez
+    with pytest.raises(_breaker.CircuitOpenError):
+        breaker.before_call('PC01')
+    # a prova falhou: reabre por mais um período
+    assert breaker.record_failure('PC01', 'WinRM parado')
+    assert breaker.state('PC01') == _breaker.OPEN and breaker.reason('PC01') == 'WinRM parado'
+
+    relogio.agora += 60
+    breaker.before_call('PC01')
+    breaker.record_success('PC01')
+    assert breaker.state('PC01') == _breaker.CLOSED and breaker.reason('PC01') == ''
+    breaker.before_call('PC01')
+
+
+def test_prova_sem_resposta_libera_nova_prova_e_trip_abre_na_hora(relogio):
+    breaker = _breaker.CircuitBreaker(threshold=3, cooldown=10)
+    breaker.trip('PC02', 'host inacessível')
+    assert breaker.state('PC02') == _breaker.OPEN
+    relogio.agora += 10
+    breaker.before_call('PC02')
+    # a chamada de prova terminou sem dizer nada sobre a conexão
+    relogio.agora += 10
+    breaker.before_call('PC02')
+    breaker.reset()
+    assert breaker.state('PC02') == _breaker.CLOSED
+
+
+def test_falha_de_conexao_e_erro_do_comando():
+    assert _breaker.is_connection_failure(subprocess.TimeoutExpired(['powershell'], 20))
+    assert _breaker.is_connection_failure(output=b'Connecting to remote server PC01 failed')
+    assert not _breaker.is_connection_failure(subprocess.CalledProcessError(1, ['powershell'], output='Cannot find path'))
+
+
+def test_circuito_aberto_e_distinto_de_saida_vazia(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path / 'state'))
+    monkeypatch.setenv('CSINFO_SECTION_CACHE', '0')
+    monkeypatch.setenv('CSINFO_WU_BACKGROUND', '0')
+    monkeypatch.setenv('CSINFO_PS_SESSIONS', '0')
+    breaker = _breaker.CircuitBreaker(threshold=3, cooldown=60)
+    monkeypatch.setattr(_breaker, '_DEFAULT_BREAKER', breaker)
+
+    breaker.trip('PC01', 'WinRM parado')
+    saida = _impl._run_powershell('hostname', 'PC01', 10, 2, 0.01, None)
+    assert saida == '' and isinstance(saida, _breaker.CircuitOpenOutput)
+    assert saida.reason == 'WinRM parado'
+    breaker.reset()
+
+    class _WinRMParado(object):
+        def run(self, cmd, computer_name=None, *_args, **_kw):
+            if str(computer_name).lower() == 'pc01':
+                breaker.trip(computer_name, 'WinRM parado')
+                return _breaker.CircuitOpenOutput(computer_name, 'WinRM parado')
+            return ''
+
+    anterior = _executor.set_executor(_WinRMParado())
+    try:
+        dados = _impl.main(export_type='nenhum', barra_callback=lambda *_a: None, computer_name='pc01',
+                           store=str(tmp_path / 'inv.sqlite3'))
+        assert dados['circuit_open'] == 'WinRM parado' and dados['snapshot_id'] is None
+        breaker.reset()
+        resumo = _fleet.FleetRun(['pc01', 'pc02'], output_dir=str(tmp_path / 'saida'), export_type='nenhum',
+                                 workers=1, precheck=False).run()
+    finally:
+        _executor.set_executor(anterior)
+    por_host = {h['host']: h for h in resumo['hosts']}
+    assert por_host['pc01']['status'] == 'falha' and por_host['pc01']['circuit_open'] == 'WinRM parado'
+    assert por_host['pc02']['status'] == 'ok' and por_host['pc02']['circuit_open'] is None
+    assert resumo['circuit_open'] == 1
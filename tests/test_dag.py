@@ -0,0 +1,62 @@
+import importlib.util
+import os
+import threading
+import time
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+_spec = importlib.util.spec_from_file_location('csinfo_dag', os.path.join(proj_root, 'csinfo', '_dag.py'))
+_dag = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_dag)
+
+
+def _lento(valor, atraso=0.1):
+    def getter(computer_name, **deps):
+        time.sleep(atraso)
+        return (valor, computer_name, deps)
+    return getter
+
+
+def test_dependencia_recebe_resultado():
+    nodes = (
+        ('monitors', _lento('mons'), ()),
+        ('chassis', lambda c, monitors: ('chassis', monitors[0]), ('monitors',)),
+    )
+    run = _dag.GetterRun(nodes, 'pc1', max_workers=4)
+    try:
+        assert run.result('chassis') == ('chassis', 'mons')
+        assert run.result('monitors') == ('mons', 'pc1', {})
+    finally:
+        run.close()
+
+
+def test_getters_independentes_rodam_em_paralelo():
+    nodes = tuple((f'g{i}', _lento(i, 0.2), ()) for i in range(5))
+    inicio = time.monotonic()
+    run = _dag.GetterRun(nodes, None, max_workers=5)
+    try:
+        assert [run.result(f'g{i}')[0] for i in range(5)] == list(range(5))
+    finally:
+        run.close()
+    assert time.monotonic() - inicio < 0.8
+
+
+def test_sequencial_executa_sob_demanda_na_thread_atual():
+    threads = []
+    nodes = (('a', lambda c: threads.append(threading.current_thread()) or 'A', ()),)
+    run = _dag.GetterRun(nodes, None, max_workers=1)
+    assert threads == []
+    assert run.result('a') == 'A'
+    assert run.result('a') == 'A'
+    assert threads == [threading.current_thread()]
+    run.close()
+
+
+def test_grafo_fora_de_ordem_e_rejeitado():
+    nodes = (
+        ('chassis', lambda c, monitors: None, ('monitors',)),
+        ('monitors', lambda c: [], ()),
+    )
+    with pytest.raises(ValueError):
+        _dag.GetterRun(nodes, None, max_workers=2)
@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _delta, _executor, _impl
+
+
+class _Maquina(object):
+    """Executor falso: impressões digitais configuráveis e lista de comandos executados."""
+
+    def __init__(self):
+        self.digitais = {'software': '2:aaa', 'boot': '2024-01-01T00:00:00|10.0.19045', 'pnp': '40:bbb', 'disks': '3:ccc'}
+        self.comandos = []
+
+    def run(self, cmd, computer_name=None, *_args, **_kw):
+        self.comandos.append(cmd)
+        if cmd == _delta.FINGERPRINT_SCRIPT:
+            return json.dumps(self.digitais)
+        if '$softwareList' in cmd:
+            return json.dumps([{'Name': '7-Zip', 'Version': '19.00', 'Publisher': 'Igor Pavlov'}])
+        return ''
+
+    def softwares_coletados(self):
+        return sum('$softwareList' in c for c in self.comandos)
+
+
+def test_delta_recoleta_so_grupos_alterados(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_SECTION_CACHE', '0')
+    monkeypatch.setenv('CSINFO_WU_BACKGROUND', '0')
+    monkeypatch.setattr(_delta, '_DEFAULT_STATE', _delta.DeltaCache(str(tmp_path / 'delta')))
+    monkeypatch.setattr(_delta, 'FINGERPRINT_TTL', 0)
+    maquina = _Maquina()
+    anterior = _executor.set_executor(maquina)
+    try:
+        def coletar():
+            return _impl.main(export_type='nenhum', barra_callback=lambda *_a: None, computer_name='pc01',
+                              workers=2, store=False, delta=True)['report']
+
+        primeiro = coletar()
+        assert maquina.softwares_coletados() == 1 and primeiro.cached == {}
+
+        segundo = coletar()
+        assert maquina.softwares_coletados() == 1
+        assert [s.name for s in segundo.software] == ['7-Zip']
+        assert 'get_installed_software' in segundo.cached
+
+        maquina.digitais['software'] = '3:ddd'
+        terceiro = coletar()
+        assert maquina.softwares_coletados() == 2
+        assert 'get_installed_software' not in terceiro.cached
+    finally:
+        _executor.set_executor(anterior)
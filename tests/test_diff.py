@@ -0,0 +1,52 @@
+import os
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _diff, _model, _store
+
+
+def _report(quando, softwares, pentes, admins, macs=('00-11-22-33-44-55',), livre='100 GB'):
+    return _model.Report(
+        identification=_model.Identification('PC01', 'Desktop', 'joao', quando),
+        os_version='Windows 10 Pro (Version 10.0.19045) - 64 bits',
+        memory_total=f"{sum(c for _s, c in pentes)} GB",
+        memory_modules=[_model.MemoryModule(f'{c} GB', 'DDR4', '2666', 'DIMM', 'Kingston', '', slot) for slot, c in pentes],
+        disks=[_model.Disk('Samsung SSD 860', '500 GB', '400 GB', livre, 2, 'SSD', 'SATA')],
+        network_adapters=[_model.NetworkAdapter('Intel Ethernet', 'Intel', '1 Gbps', mac) for mac in macs],
+        software=[_model.Software(n, v, p) for n, v, p in softwares],
+        admins=list(admins),
+    )
+
+
+def test_diff_por_chave_ignora_ordem_e_campos_volateis():
+    antigo = _report(100.0, [('7-Zip', '19.00', 'Igor Pavlov'), ('Google Chrome', '120.0', 'Google LLC')],
+                     [('DIMM1', 4), ('DIMM2', 4)], ['Administrador'])
+    novo = _report(200.0, [('Notepad++', '8.6', 'Don Ho'), ('Google Chrome', '121.0', 'Google LLC')],
+                   [('DIMM2', 4), ('DIMM1', 8)], ['administrador', 'suporte'],
+                   macs=('00:11:22:33:44:55',), livre='37 GB')
+    changes = _diff.diff_reports(antigo, novo)
+    resumo = {(c.section, c.kind, c.key) for c in changes}
+    assert resumo == {
+        ('software', 'removed', ('7-zip', 'igor pavlov')),
+        ('software', 'added', ('notepad++', 'don ho')),
+        ('software', 'changed', ('google chrome', 'google llc')),
+        ('memory_modules', 'changed', ('dimm1',)),
+        ('memory_total', 'changed', None),
+        ('admins', 'added', ('suporte',)),
+    }
+    chrome = [c for c in changes.section('software') if c.kind == 'changed'][0]
+    assert chrome.fields == ('version',) and chrome.new['version'] == '121.0'
+    assert changes.new_at == 200.0
+    assert not _diff.diff_reports(novo.as_dict(), novo)
+
+
+def test_inventario_compara_snapshots_do_host(tmp_path):
+    with _store.InventoryStore(str(tmp_path / 'inv.sqlite3')) as inv:
+        inv.add_snapshot(_report(100.0, [], [('DIMM1', 4)], ['Administrador']))
+        novo = inv.add_snapshot(_report(200.0, [('7-Zip', '19.00', 'Igor Pavlov')], [('DIMM1', 4)], ['Administrador']))
+        assert [c.describe() for c in inv.diff('pc01')] == ['+ Software: 7-Zip | 19.00 | Igor Pavlov']
+        assert len(inv.diff(new_id=novo)) == 1
+        assert inv.diff('PC02') is None
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+import csinfo
+from csinfo import _executor, _impl
+
+
+class _FakeInner(object):
+    real = True
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.calls = []
+
+    def run(self, cmd, computer_name=None, timeout=20, retries=2, initial_backoff=0.3, credential=None):
+        self.calls.append((cmd, computer_name))
+        return self.outputs.get(cmd, '')
+
+
+@pytest.fixture(autouse=True)
+def _isolar(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path / 'state'))
+    monkeypatch.setenv('CSINFO_SECTION_CACHE', '0')
+    monkeypatch.setenv('CSINFO_WU_BACKGROUND', '0')
+    anterior = _executor.set_executor(None)
+    yield
+    _executor.set_executor(anterior)
+
+
+@pytest.mark.parametrize('nome', ['fixtures.jsonl', 'fixtures.jsonl.gz'])
+def test_gravacao_e_replay(tmp_path, nome):
+    path = str(tmp_path / nome)
+    inner = _FakeInner({'Get-Thing  -A': 'valor'})
+    rec = _executor.RecordingExecutor(path, inner=inner)
+    assert rec.run('Get-Thing  -A', 'PC01') == 'valor'
+    registros = _executor.load_fixtures(path)
+    assert registros[0]['target'] == 'pc01'
+    assert registros[0]['command'] == 'Get-Thing -A'
+    assert registros[0]['output'] == 'valor'
+
+    replay = _executor.ReplayExecutor(path)
+    assert replay.run('Get-Thing -A', 'pc01') == 'valor'
+    # outro host simulado usa a mesma fixture
+    assert replay.run('Get-Thing -A', 'sim-0042') == 'valor'
+    assert replay.run('Get-Other', 'pc01') == ''
+    assert replay.misses == 1
+    assert _executor.ReplayExecutor(path, any_host=False).run('Get-Thing -A', 'sim-1') == ''
+
+
+def test_main_roda_a_partir_de_fixtures():
+    registros = [
+        {'target': 'pc01', 'command': _impl._COMPUTER_SYSTEM_QUERY,
+         'output': '{"TotalPhysicalMemory":17179869184,"PartOfDomain":true,"Domain":"corp.local","Workgroup":null}'},
+    ]
+    csinfo.set_executor(_executor.ReplayExecutor(records=registros))
+    resultado = csinfo.main(export_type='nenhum', barra_callback=lambda *_a: None, computer_name='sim-7', workers=4)
+    assert 'Memória RAM total: 16.0 GB' in resultado['lines']
+    assert 'Rede: Domínio: corp.local' in resultado['lines']
+
+
+def test_iter_collect_entrega_secoes_na_ordem():
+    csinfo.set_executor(_executor.ReplayExecutor(records=[]))
+    secoes = list(csinfo.iter_collect('sim-8', workers=4))
+    assert [s.name for s in secoes] == [nome for nome, _r in csinfo._model.SECTIONS]
+    assert all(s.status == 'ok' for s in secoes)
+    linhas = [ln for s in secoes for ln in s.lines]
+    assert linhas == csinfo.render_lines(secoes[-1].report)
+    fora_de_ordem = list(csinfo.iter_collect('sim-8', workers=4, ordered=False))
+    assert sorted(s.name for s in fora_de_ordem) == sorted(s.name for s in secoes)
+
+
+def test_main_reporta_todas_as_etapas_de_progresso(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('CSINFO_STORE', str(tmp_path / 'inv.sqlite3'))
+    csinfo.set_executor(_executor.ReplayExecutor(records=[]))
+    percentuais = []
+
+    def callback(perc, _texto):
+        if perc is not None:
+            percentuais.append(perc)
+
+    csinfo.main(export_type='txt', barra_callback=callback, computer_name='sim-9', workers=4)
+    # 23 etapas; a 3 nunca foi emitida e a 23 repete ao gravar o TXT
+    etapas = [1, 2] + list(range(4, 24)) + [23]
+    assert percentuais == [int(e / 23 * 100) for e in etapas]
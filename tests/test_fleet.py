@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _executor, _fleet, _impl
+
+
+class _SlowHostExecutor(_executor.ReplayExecutor):
+    """Replay instantâneo, exceto para o host 'lento'."""
+
+    def run(self, cmd, computer_name=None, *args, **kwargs):
+        if str(computer_name).lower() == 'lento':
+            time.sleep(0.2)
+        return super(_SlowHostExecutor, self).run(cmd, computer_name, *args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _isolar(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path / 'state'))
+    monkeypatch.setenv('CSINFO_SECTION_CACHE', '0')
+    monkeypatch.setenv('CSINFO_WU_BACKGROUND', '0')
+    registros = [{'target': 'pc01', 'command': _impl._COMPUTER_SYSTEM_QUERY,
+                  'output': '{"TotalPhysicalMemory":8589934592,"PartOfDomain":false,"Workgroup":"WORKGROUP"}'}]
+    anterior = _executor.set_executor(_SlowHostExecutor(records=registros))
+    yield
+    _executor.set_executor(anterior)
+
+
+def test_load_hosts_formatos(tmp_path):
+    gui = tmp_path / 'machines_history.json'
+    gui.write_text(json.dumps({'machines': [{'name': 'PC01', 'alias': 'RECEPCAO', 'online': False},
+                                            {'name': 'pc01', 'alias': 'DUPLICADO'}]}), encoding='utf-8')
+    assert _fleet.load_hosts(str(gui)) == [{'name': 'PC01', 'alias': 'RECEPCAO'}]
+    txt = tmp_path / 'hosts.txt'
+    txt.write_text('# frota\nPC02\nPC03, financeiro\n\n', encoding='utf-8')
+    assert _fleet.load_hosts(str(txt)) == [{'name': 'PC02', 'alias': None}, {'name': 'PC03', 'alias': 'financeiro'}]
+
+
+def test_host_lento_nao_segura_os_demais(tmp_path):
+    saida = str(tmp_path / 'saida')
+    run = _fleet.FleetRun(['pc01', 'lento', 'pc02', 'pc03'], output_dir=saida, export_type='nenhum',
+                          max_hosts=2, workers=1, host_timeout=0.5, precheck=False)
+    resumo = run.run()
+    por_host = {h['host']: h for h in resumo['hosts']}
+    assert por_host['lento']['status'] == 'falha'
+    assert 'tempo esgotado' in por_host['lento']['error']
+    assert all(por_host[h]['status'] == 'ok' for h in ('pc01', 'pc02', 'pc03'))
+    assert resumo['ok'] == 3 and resumo['failed'] == 1
+    with open(por_host['pc02']['json'], encoding='utf-8') as fh:
+        dados = json.load(fh)
+    assert 'Memória RAM total: 8.0 GB' in dados['lines']
+    assert os.path.exists(os.path.join(saida, 'fleet_summary.json'))
+
+
+def test_host_com_tempo_esgotado_ocupa_a_vaga_e_nao_grava_nada(tmp_path):
+    eventos = []
+
+    class _Registro(_executor.ReplayExecutor):
+        """Replay que anota início e fim de cada comando; 'lento' leva 0,1 s por comando."""
+
+        def run(self, cmd, computer_name=None, *args, **kwargs):
+            eventos.append((str(computer_name).lower(), 'inicio'))
+            if str(computer_name).lower() == 'lento':
+                time.sleep(0.1)
+            try:
+                return super(_Registro, self).run(cmd, computer_name, *args, **kwargs)
+            finally:
+                eventos.append((str(computer_name).lower(), 'fim'))
+
+    _executor.set_executor(_Registro(records=[]))
+    saida = str(tmp_path / 'saida')
+    inventario = str(tmp_path / 'inv.sqlite3')
+    resumo = _fleet.FleetRun(['lento', 'pc01'], output_dir=saida, export_type='txt', max_hosts=1, workers=1,
+                             host_timeout=0.3, precheck=False, store=inventario).run()
+    por_host = {h['host']: h for h in resumo['hosts']}
+    assert por_host['lento']['status'] == 'falha' and por_host['pc01']['status'] == 'ok'
+    # com max_hosts=1, o pc01 só começa depois do último comando do host abandonado
+    ultimo_lento = max(i for i, ev in enumerate(eventos) if ev == ('lento', 'fim'))
+    assert eventos.index(('pc01', 'inicio')) > ultimo_lento
+    # a coleta cancelada parou cedo e não gravou relatório, JSON nem inventário
+    assert sum(1 for ev in eventos if ev == ('lento', 'inicio')) < 8
+    assert not [n for n in os.listdir(saida) if 'lento' in n]
+    from csinfo import _store
+    with _store.InventoryStore(inventario) as inv:
+        assert [r['name'] for r in inv.query('SELECT name FROM hosts')] == ['pc01']
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# orçamento de `import csinfo` em ms (sobrescreva com CSINFO_IMPORT_BUDGET_MS em máquinas lentas)
+BUDGET_MS = float(os.environ.get('CSINFO_IMPORT_BUDGET_MS', '100'))
+PESADOS = ('reportlab', 'asyncio', 'csinfo._impl', 'winreg')
+
+
+def _python(*args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = proj_root + os.pathsep + env.get('PYTHONPATH', '')
+    return subprocess.run([sys.executable] + list(args), cwd=proj_root, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+def test_import_csinfo_dentro_do_orcamento():
+    proc = _python('-X', 'importtime', '-c', 'import csinfo')
+    assert proc.returncode == 0, proc.stderr
+    cumulativo = {}
+    for ln in proc.stderr.splitlines():
+        partes = ln.split('|')
+        if len(partes) == 3 and ln.startswith('import time:'):
+            try:
+                cumulativo[partes[2].strip()] = int(partes[1])
+            except ValueError:
+                pass
+    assert 'csinfo' in cumulativo
+    assert cumulativo['csinfo'] / 1000.0 < BUDGET_MS
+    carregados = [m for m in cumulativo if m.split('.')[0] in PESADOS or m in PESADOS]
+    assert carregados == []
+
+
+def test_reexports_carregam_sob_demanda():
+    codigo = ('import sys, csinfo\n'
+              'assert csinfo.safe_filename("a/b") == csinfo._impl.safe_filename("a/b")\n'
+              'print(",".join(m for m in ("reportlab", "asyncio") if m in sys.modules))\n'
+              'assert callable(csinfo.acollect) and "asyncio" in sys.modules\n'
+              'assert set(csinfo.__all__) <= set(dir(csinfo))\n')
+    proc = _python('-c', codigo)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ''
@@ -0,0 +1,60 @@
+import json
+import os
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _model
+
+
+def _report():
+    return _model.Report(
+        identification=_model.Identification('PC01', 'Desktop', 'joao', 1700000000.0),
+        os_version='Windows 11 Pro',
+        memory_total='16.0 GB',
+        processors=[_model.Processor.from_raw({'Name': 'i7', 'Cores': 8, 'LogicalProcessors': 16})],
+        disks=[_model.Disk.from_raw(('Samsung', '512 GB', '', '', '', 'SSD', 'NVMe'))],
+        logical_drives=[_model.LogicalDrive.from_raw({'Drive': 'C:', 'Size': '475.1', 'Used': '200', 'Free': '275.1', 'FileSystem': 'NTFS'})],
+        software=[_model.Software('7-Zip', '19.00', 'Igor Pavlov')],
+        cached={'get_installed_software': 1700000000.0},
+    )
+
+
+def test_registros_usam_slots():
+    cpu = _model.Processor(name='i7')
+    assert not hasattr(cpu, '__dict__')
+    assert cpu.cores is None
+
+
+def test_linhas_formatadas_a_partir_do_modelo():
+    lines = _model.render_lines(_report())
+    assert lines[:4] == ['IDENTIFICAÇÃO', 'Nome do computador: PC01', 'Tipo: Desktop', 'Gerado por: joao']
+    assert 'Processador 1: i7' in lines
+    assert '  Cache: L2: NÃO OBTIDO | L3: NÃO OBTIDO' in lines
+    assert 'Unidade C: (NÃO OBTIDO) | Total: 475.10 GB | Usado: 200.00 GB | Livre: 275.10 GB | Sistema: NTFS' in lines
+    assert '1. 7-Zip | Versão: 19.00 | Editor: Igor Pavlov' in lines
+    assert lines[-1].startswith('  (dados em cache, coletados em ')
+    assert 'Nome do computador: PC01' not in _model.render_lines(_report(), identification_fields=False)
+
+
+def test_agrupamentos_do_pdf_a_partir_do_modelo():
+    grupos = _model.group_lines(_report())
+    assert [t for t, _l in grupos] == [t for t, _s in _model.GROUPS]
+    por_titulo = dict(grupos)
+    assert por_titulo['INFORMAÇÕES DO SISTEMA'][0] == 'Versão do sistema operacional: Windows 11 Pro'
+    assert por_titulo['INFORMAÇÕES DE HARDWARE'][0] == 'Memória RAM total: 16.0 GB'
+    assert 'Processador 1: i7' in por_titulo['INFORMAÇÕES DE HARDWARE']
+    assert por_titulo['SOFTWARES INSTALADOS'][0] == '1. 7-Zip | Versão: 19.00 | Editor: Igor Pavlov'
+    # nenhuma linha de título dentro dos grupos; a identificação e o rodapé ficam de fora
+    todas = [ln for _t, linhas in grupos for ln in linhas]
+    assert not set(por_titulo) & set(todas)
+    assert 'CSInfo by CEOsoftware' not in todas and 'Tipo: Desktop' not in todas
+
+
+def test_serializacao_json_ida_e_volta():
+    report = _report()
+    restored = _model.Report.from_dict(json.loads(json.dumps(report.as_dict())))
+    assert restored == report
+    assert _model.render_lines(restored) == _model.render_lines(report)
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _aio, _impl, _negotiation, _pshost
+
+VARIANTES = [('negotiate', 'A'), ('default', 'B'), ('negotiate_ssl', 'C')]
+
+
+def test_variante_lembrada_persiste_e_expira_por_falhas(tmp_path, monkeypatch):
+    path = str(tmp_path / 'auth.json')
+    cache = _negotiation.NegotiationCache(path, max_failures=2)
+    assert cache.order('PC01', 'dom\\joao', VARIANTES) == VARIANTES
+    cache.record_success('PC01', 'DOM\\joao', 'default')
+
+    # outra execução lê a variante do disco
+    outra = _negotiation.NegotiationCache(path, max_failures=2)
+    assert [n for n, _v in outra.order('pc01', 'dom\\joao', VARIANTES)] == ['default', 'negotiate', 'negotiate_ssl']
+    assert outra.preferred('pc01', 'maria') is None
+
+    # falha de outra variante não conta; duas da lembrada a descartam
+    outra.record_failure('pc01', 'dom\\joao', 'negotiate')
+    outra.record_failure('pc01', 'dom\\joao', 'default')
+    assert outra.preferred('pc01', 'dom\\joao') == 'default'
+    outra.record_failure('pc01', 'dom\\joao', 'default')
+    assert outra.preferred('pc01', 'dom\\joao') is None
+    assert _negotiation.NegotiationCache(path).preferred('pc01', 'dom\\joao') is None
+
+    cache = _negotiation.NegotiationCache(path, ttl=60)
+    cache.record_success('PC02', '', 'negotiate_ssl')
+    agora = _negotiation.time.time()
+    monkeypatch.setattr(_negotiation.time, 'time', lambda: agora + 61)
+    assert cache.preferred('PC02') is None
+
+
+class _PoolFalso(object):
+    """Pool que responde a toda variante com o código e a saída configurados."""
+
+    def __init__(self):
+        self.resposta = (0, '')
+        self.comandos = []
+
+    def run(self, cmd, timeout=None):
+        self.comandos.append(cmd)
+        if callable(self.resposta):
+            return self.resposta(cmd)
+        return self.resposta
+
+
+def test_so_falha_de_conexao_rebaixa_a_variante(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_PS_SESSIONS', '0')
+    monkeypatch.setenv('CSINFO_BREAKER', '0')
+    cache = _negotiation.NegotiationCache(str(tmp_path / 'auth.json'), max_failures=1)
+    cache.record_success('PC09', '', 'default')
+    pool = _PoolFalso()
+    monkeypatch.setattr(_negotiation, 'get_default_cache', lambda: cache)
+    monkeypatch.setattr(_pshost, 'get_default_pool', lambda: pool)
+
+    # erro do próprio comando: a variante lembrada continua valendo
+    pool.resposta = (1, "Get-Item : Cannot find path 'C:\\x' because it does not exist.")
+    assert _impl._run_powershell('Get-Item C:\\x', 'PC09', 10, 2, 0.01, None) == ''
+    assert 'Invoke-Command -ComputerName PC09 -ScriptBlock { Get-Item C:\\x } -ErrorAction Stop' in pool.comandos[0]
+    assert cache.preferred('PC09') == 'default'
+
+    pool.resposta = (1, 'Connecting to remote server PC09 failed with the following error message : Access is denied.')
+    assert _impl._run_powershell('hostname', 'PC09', 10, 1, 0.01, None) == ''
+    assert cache.preferred('PC09') is None
+
+
+RECUSADO = 'Connecting to remote server PC09 failed with the following error message : Access is denied.'
+
+
+def _recusa_negotiate(cmd):
+    if '-Authentication Negotiate' in cmd:
+        return (1, RECUSADO)
+    return (0, 'pc09')
+
+
+def test_autenticacao_recusada_segue_para_a_proxima_variante(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_PS_SESSIONS', '0')
+    monkeypatch.setenv('CSINFO_BREAKER', '0')
+    cache = _negotiation.NegotiationCache(str(tmp_path / 'auth.json'))
+    pool = _PoolFalso()
+    pool.resposta = _recusa_negotiate
+    monkeypatch.setattr(_negotiation, 'get_default_cache', lambda: cache)
+    monkeypatch.setattr(_pshost, 'get_default_pool', lambda: pool)
+
+    # mesmo com uma única tentativa pedida, a recusa não esgota as variantes
+    assert _impl._run_powershell('hostname', 'PC09', 10, 1, 0.01, None) == 'pc09'
+    assert len(pool.comandos) == 2
+    assert cache.preferred('PC09') == 'default'
+    # a variante lembrada vai na frente na próxima chamada
+    assert _impl._run_powershell('hostname', 'PC09', 10, 1, 0.01, None) == 'pc09'
+    assert len(pool.comandos) == 3
+
+
+def test_autenticacao_recusada_segue_para_a_proxima_variante_async(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_BREAKER', '0')
+    cache = _negotiation.NegotiationCache(str(tmp_path / 'auth.json'))
+    comandos = []
+
+    async def executar(argv, timeout):
+        comandos.append(argv[-1])
+        rc, out = _recusa_negotiate(argv[-1])
+        return rc, out.encode('utf-8')
+
+    monkeypatch.setattr(_negotiation, 'get_default_cache', lambda: cache)
+    monkeypatch.setattr(_aio, '_exec', executar)
+    assert asyncio.run(_aio.arun_powershell('hostname', 'PC09', retries=1, initial_backoff=0.01)) == 'pc09'
+    assert len(comandos) == 2
+    assert cache.preferred('PC09') == 'default'
@@ -0,0 +1,101 @@
+import json
+import os
+import re
+import sys
+import tempfile
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+pytest.importorskip('reportlab')
+
+from csinfo import _impl, _model, _pdfassets
+
+
+def test_logo_e_estilos_reutilizados_entre_relatorios(tmp_path, monkeypatch):
+    import csinfo
+    logo = os.path.join(proj_root, 'assets', 'ico.png')
+    if not os.path.exists(logo):
+        pytest.skip('sem assets/ico.png')
+    monkeypatch.setattr(csinfo, '__logo_path__', logo, raising=False)
+    linhas = ['Computador: PC01', 'INFORMAÇÕES DO SISTEMA', 'Sistema: Windows 11 Pro']
+    tamanhos = []
+    for i in range(2):
+        destino = str(tmp_path / f'pc{i}.pdf')
+        assert _impl.write_pdf_report(destino, linhas, f'PC0{i}')
+        with open(destino, 'rb') as fh:
+            dados = fh.read()
+        assert dados.count(b'/Subtype /Image') == 2  # logo + máscara, uma vez por documento
+        tamanhos.append(len(dados))
+    assert _pdfassets.get_logo() is _pdfassets.get_logo()
+    assert _pdfassets.get_styles() is _pdfassets.get_styles()
+    assert abs(tamanhos[0] - tamanhos[1]) < 64
+
+
+def _relatorio_longo():
+    return _model.Report(
+        identification=_model.Identification('PC01', 'Desktop', 'joao', 1700000000.0),
+        os_version='Windows 11 Pro',
+        memory_total='16.0 GB',
+        software=[_model.Software(f'Aplicativo {i}', '1.0', 'Editor') for i in range(150)],
+    )
+
+
+def test_pdf_em_passagem_unica_com_total_de_paginas_links_e_bookmarks(tmp_path):
+    pypdf = pytest.importorskip('pypdf')
+    destino = str(tmp_path / 'pc01.pdf')
+    assert _impl.write_pdf_report(destino, _relatorio_longo(), 'PC01')
+    leitor = pypdf.PdfReader(destino)
+    total = len(leitor.pages)
+    assert total >= 3
+
+    # o total do rodapé (desenhado só no save) vale para todas as páginas
+    for numero, pagina in enumerate(leitor.pages, start=1):
+        rodape = re.search(r'Página (\d+) de\s*(\d+)', pagina.extract_text())
+        assert rodape and rodape.groups() == (str(numero), str(total))
+
+    # links internos apontam para objetos de página do próprio documento
+    paginas = {pagina.indirect_reference.idnum for pagina in leitor.pages}
+    links = [a.get_object() for pagina in leitor.pages for a in (pagina.get('/Annots') or [])]
+    links = [a for a in links if a.get('/Subtype') == '/Link']
+    assert links
+    for link in links:
+        destino_link = link['/Dest']
+        assert destino_link[0].idnum in paginas
+        assert destino_link[0].get_object().get('/Type') == '/Page'
+
+    titulos = [item.title for item in leitor.outline if not isinstance(item, list)]
+    assert 'IDENTIFICAÇÃO' in titulos
+    assert all(t in titulos for t, _s in _model.GROUPS)
+    assert 'Detalhes: SOFTWARES INSTALADOS' in titulos
+
+
+def test_links_do_pdf_so_gravados_com_csinfo_pdf_links_dump(tmp_path, monkeypatch):
+    saida = tmp_path / 'saida'
+    temp = tmp_path / 'temp'
+    saida.mkdir()
+    temp.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(temp))
+    monkeypatch.delenv('CSINFO_PDF_LINKS_DUMP', raising=False)
+    relatorio = _relatorio_longo()
+
+    # padrão: nenhum JSONL ao lado do PDF nem cópia .fixed, aqui ou no temp
+    assert _impl.write_pdf_report(str(saida / 'pc01.pdf'), relatorio, 'PC01')
+    assert sorted(os.listdir(saida)) == ['pc01.pdf']
+    assert os.listdir(temp) == []
+
+    monkeypatch.setenv('CSINFO_PDF_LINKS_DUMP', '1')
+    assert _impl.write_pdf_report(str(saida / 'pc02.pdf'), relatorio, 'PC02')
+    assert sorted(os.listdir(saida)) == ['pc01.pdf', 'pc02.pdf']
+    assert os.listdir(temp) == ['pc02.pdf.annots.jsonl']
+    with open(temp / 'pc02.pdf.annots.jsonl', encoding='utf-8') as fh:
+        links = [json.loads(ln) for ln in fh]
+    assert links and all(isinstance(ln['tgt_page'], int) for ln in links)
+
+    dump = tmp_path / 'links.jsonl'
+    monkeypatch.setenv('CSINFO_PDF_LINKS_DUMP', str(dump))
+    assert _impl.write_pdf_report(str(saida / 'pc03.pdf'), relatorio, 'PC03')
+    assert dump.exists() and os.listdir(temp) == ['pc02.pdf.annots.jsonl']
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import socket
+import sys
+import time
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _probe
+
+
+def _porta_livre():
+    s = socket.socket()
+    s.bind(('127.0.0.1', 0))
+    porta = s.getsockname()[1]
+    s.close()
+    return porta
+
+
+def test_primeira_porta_aberta_responde():
+    servidor = socket.socket()
+    servidor.bind(('127.0.0.1', 0))
+    servidor.listen(8)
+    aberta = servidor.getsockname()[1]
+    try:
+        r = _probe.probe_host('127.0.0.1', ports=(_porta_livre(), aberta), icmp=False, timeout=1.0)
+    finally:
+        servidor.close()
+    assert r.reachable
+    assert r.first == aberta
+    assert aberta in r.latencies
+
+
+def test_hosts_verificados_em_paralelo(monkeypatch):
+    async def tcp_lento(host, port, timeout):
+        await asyncio.sleep(0.3)
+        return 0.3 if host == 'on' else None
+
+    monkeypatch.setattr(_probe, '_tcp', tcp_lento)
+    inicio = time.perf_counter()
+    resultados = _probe.probe_hosts(['off', 'on'] * 5, icmp=False, timeout=1.0)
+    assert time.perf_counter() - inicio < 1.0
+    assert [r.reachable for r in resultados] == [False, True] * 5
+    assert _probe.rank(resultados)[0].host == 'on'
+
+
+def test_on_result_na_ordem_de_conclusao_com_limite(monkeypatch):
+    atrasos = {'lento': 0.3, 'medio': 0.15, 'rapido': 0.0, 'off': 0.05}
+    ativos = {'agora': 0, 'max': 0}
+
+    async def tcp_falso(host, port, timeout):
+        ativos['agora'] += 1
+        ativos['max'] = max(ativos['max'], ativos['agora'])
+        try:
+            await asyncio.sleep(atrasos[host])
+        finally:
+            ativos['agora'] -= 1
+        return None if host == 'off' else atrasos[host]
+
+    monkeypatch.setattr(_probe, '_tcp', tcp_falso)
+    avisos = []
+
+    def on_result(r):
+        avisos.append((r.host, r.reachable))
+        if r.host == 'off':
+            raise RuntimeError('erro na UI')
+
+    resultados = _probe.probe_hosts(['lento', 'medio', 'rapido', 'off'], concurrency=3, ports=(5985,),
+                                    icmp=False, on_result=on_result)
+    # um aviso por host, assim que cada um termina; erro no callback não interrompe os demais
+    assert avisos == [('rapido', True), ('off', False), ('medio', True), ('lento', True)]
+    assert ativos['max'] == 3
+    # o retorno segue a ordem pedida
+    assert [(r.host, r.reachable) for r in resultados] == [('lento', True), ('medio', True), ('rapido', True), ('off', False)]
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _impl, _psession, _pshost
+
+
+@pytest.fixture
+def stub_env(tmp_path, monkeypatch):
+    # sessões abertas no host substituto: ele ecoa o script, que contém o marcador de sucesso
+    monkeypatch.setenv('CSINFO_PS_HOST', 'stub')
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path))
+    monkeypatch.setenv('CSINFO_BREAKER', '0')
+
+
+def test_reutiliza_sessao_e_encerra_a_usada_ha_mais_tempo(stub_env):
+    cache = _psession.RemoteSessionCache(max_sessions=2, health_interval=3600)
+    try:
+        rc, out = cache.run('PC01', 'hostname', timeout=10)
+        assert rc == 0 and '{ hostname }' in out
+        primeira = cache._sessions[('pc01', '')]
+        assert primeira.variant == 'negotiate'
+        cache.run('pc01', 'whoami', timeout=10)
+        assert cache._sessions[('pc01', '')] is primeira
+
+        cache.run('PC02', 'hostname', timeout=10)
+        segunda = cache._sessions[('pc02', '')]
+        cache.run('PC01', 'hostname', timeout=10)
+        cache.run('PC03', 'hostname', timeout=10)
+        assert list(cache._sessions) == [('pc01', ''), ('pc03', '')]
+        assert not segunda.host.is_alive()
+        assert primeira.host.is_alive()
+    finally:
+        cache.close()
+
+
+def test_falha_ao_abrir_e_lembrada_por_host(stub_env, monkeypatch):
+    aberturas = []
+
+    class _SemResposta(object):
+        def __init__(self, computer_name, **_kw):
+            aberturas.append(computer_name)
+            raise subprocess.TimeoutExpired(['powershell'], 30)
+
+    monkeypatch.setattr(_psession, 'RemoteSession', _SemResposta)
+    cache = _psession.RemoteSessionCache(retry_after=300)
+    for _ in range(3):
+        with pytest.raises(_psession.RemoteSessionError):
+            cache.run('PC09', 'hostname', timeout=30)
+    assert aberturas == ['PC09']
+    cache.retry_after = 0
+    with pytest.raises(_psession.RemoteSessionError):
+        cache.run('PC09', 'hostname', timeout=30)
+    assert aberturas == ['PC09', 'PC09']
+
+
+def test_run_powershell_segue_pelo_invoke_command_sem_sessao(stub_env, monkeypatch):
+    chamadas = []
+
+    class _SessoesRecusadas(object):
+        def run(self, computer_name, cmd, credential=None, timeout=None):
+            if computer_name == 'PC09':
+                chamadas.append(computer_name)
+            raise _psession.RemoteSessionError('acesso negado')
+
+    pool = _pshost.PowerShellHostPool(argv=_pshost.stub_host_argv())
+    monkeypatch.setattr(_psession, 'get_default_cache', lambda: _SessoesRecusadas())
+    monkeypatch.setattr(_pshost, 'get_default_pool', lambda: pool)
+    monkeypatch.setenv('CSINFO_AUTH_CACHE', '0')
+    try:
+        out = _impl._run_powershell('hostname', 'PC09', 10, 2, 0.01, None)
+    finally:
+        pool.close()
+    assert out == 'Invoke-Command -ComputerName PC09 -ScriptBlock { hostname } -Authentication Negotiate -ErrorAction Stop'
+    assert chamadas == ['PC09']
@@ -0,0 +1,88 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Carregar o módulo diretamente do arquivo: o pool não depende do restante do
+# pacote e assim pode ser testado fora do Windows com o host substituto.
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+_spec = importlib.util.spec_from_file_location('csinfo_pshost', os.path.join(proj_root, 'csinfo', '_pshost.py'))
+_pshost = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_pshost)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def _make(**kwargs):
+        pool = _pshost.PowerShellHostPool(argv=_pshost.stub_host_argv(), **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for p in pools:
+        p.close()
+
+
+def test_roundtrip_and_host_reuse(make_pool):
+    pool = make_pool(max_hosts=1)
+    assert pool.run('Get-Date', timeout=10) == (0, 'Get-Date')
+    assert pool.run('Olá, ação', timeout=10) == (0, 'Olá, ação')
+    _, pid1 = pool.run('$PID', timeout=10)
+    _, pid2 = pool.run('$PID', timeout=10)
+    assert pid1 == pid2
+    assert pool.size() == 1
+
+
+def test_error_return_code(make_pool):
+    pool = make_pool()
+    assert pool.run('throw falhou', timeout=10) == (1, 'falhou')
+
+
+def test_recycle_after_max_commands(make_pool):
+    pool = make_pool(max_hosts=1, max_commands=2)
+    _, pid1 = pool.run('$PID', timeout=10)
+    _, pid2 = pool.run('$PID', timeout=10)
+    _, pid3 = pool.run('$PID', timeout=10)
+    assert pid1 == pid2
+    assert pid3 != pid1
+
+
+def test_idle_eviction(make_pool):
+    pool = make_pool(max_hosts=1, idle_timeout=0.05)
+    _, pid1 = pool.run('$PID', timeout=10)
+    time.sleep(0.1)
+    pool.evict_idle()
+    assert pool.size() == 0
+    _, pid2 = pool.run('$PID', timeout=10)
+    assert pid2 != pid1
+
+
+def test_dead_host_is_replaced(make_pool):
+    pool = make_pool(max_hosts=1)
+    _, pid1 = pool.run('$PID', timeout=10)
+    with pytest.raises(_pshost.PowerShellHostError):
+        pool.run('exit', timeout=10)
+    _, pid2 = pool.run('$PID', timeout=10)
+    assert pid2 != pid1
+
+
+def test_timeout_discards_host(make_pool):
+    pool = make_pool(max_hosts=1)
+    _, pid1 = pool.run('$PID', timeout=10)
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.run('Start-Sleep -Seconds 5', timeout=0.3)
+    _, pid2 = pool.run('$PID', timeout=10)
+    assert pid2 != pid1
+
+
+def test_unusable_host_disables_pool():
+    pool = _pshost.PowerShellHostPool(argv=[sys.executable, '-c', 'pass'])
+    for _ in range(pool.MAX_START_FAILURES):
+        with pytest.raises(_pshost.PowerShellHostError):
+            pool.run('$PID', timeout=5)
+    assert pool.disabled
@@ -0,0 +1,89 @@
+import os
+import sys
+import threading
+
+import pytest
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _executor, _impl, _querycache
+
+
+class _Contador(object):
+    """Executor falso que conta as execuções por (alvo, comando)."""
+
+    def __init__(self):
+        self.execucoes = []
+        self.lock = threading.Lock()
+
+    def run(self, cmd, computer_name=None, *_args, **_kw):
+        with self.lock:
+            self.execucoes.append((computer_name, cmd))
+        if cmd == 'falha':
+            return _executor.FailedOutput('sem resposta em 20s')
+        return f'{computer_name}: {cmd}'
+
+
+@pytest.fixture
+def contador():
+    c = _Contador()
+    anterior = _executor.set_executor(c)
+    yield c
+    _executor.set_executor(anterior)
+
+
+def test_chave_por_alvo_e_comando_normalizado(contador):
+    pc01 = _querycache.begin('PC01')
+    pc02 = _querycache.begin('pc02')
+    try:
+        assert _querycache.active('pc01') is pc01 and pc01 is not pc02
+        assert _impl.run_powershell('Get-CimInstance  Win32_BIOS', 'PC01') == 'PC01: Get-CimInstance  Win32_BIOS'
+        assert _impl.run_powershell('Get-CimInstance Win32_BIOS\n', 'pc01') == 'PC01: Get-CimInstance  Win32_BIOS'
+        assert _impl.run_powershell('Get-CimInstance Win32_BIOS', 'PC02') == 'PC02: Get-CimInstance Win32_BIOS'
+        assert len(contador.execucoes) == 2
+        assert (pc01.hits, pc01.misses, pc02.misses) == (1, 1, 1)
+    finally:
+        pc01.release()
+        pc02.release()
+
+
+def test_nao_reaproveita_entre_coletas(contador):
+    primeira = _querycache.begin('PC01')
+    # coleta simultânea do mesmo alvo compartilha o cache até a última liberar
+    simultanea = _querycache.begin('PC01')
+    assert simultanea is primeira
+    _impl.run_powershell('hostname', 'PC01')
+    primeira.release()
+    assert _querycache.active('PC01') is simultanea
+    simultanea.release()
+    assert _querycache.active('PC01') is None
+
+    _impl.run_powershell('hostname', 'PC01')
+    segunda = _querycache.begin('PC01')
+    try:
+        assert segunda is not primeira
+        _impl.run_powershell('hostname', 'PC01')
+    finally:
+        segunda.release()
+    assert contador.execucoes == [('PC01', 'hostname')] * 3
+
+
+def test_falhas_nao_sao_guardadas(contador):
+    cache = _querycache.begin('PC01')
+    try:
+        assert _impl.run_powershell('falha', 'PC01') == ''
+        assert _impl.run_powershell('falha', 'PC01') == ''
+        assert len(contador.execucoes) == 2
+
+        def explode():
+            raise RuntimeError('powershell ausente')
+
+        with pytest.raises(RuntimeError):
+            cache.fetch('Get-Date', explode)
+        assert cache.fetch('Get-Date', lambda: '') == ''
+        # saída vazia legítima é guardada
+        assert cache.fetch('Get-Date', explode) == ''
+    finally:
+        cache.release()
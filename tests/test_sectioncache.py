@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _sectioncache
+
+PLACA = ('ASUSTeK', 'PRIME B450M', 'ABC123')
+
+
+def test_entrada_expira_pelo_ttl_da_secao(tmp_path, monkeypatch):
+    cache = _sectioncache.SectionCache(str(tmp_path), ttls={'get_motherboard_info': 60})
+    agora = time.time()
+    monkeypatch.setattr(_sectioncache.time, 'time', lambda: agora)
+    assert cache.put('PC01', 'get_motherboard_info', PLACA)
+    # falha na coleta e seções sem TTL não são gravadas
+    assert not cache.put('PC01', 'get_motherboard_info', ('', '', 'NÃO OBTIDO'))
+    assert not cache.put('PC01', 'get_installed_software', [{'Name': 'x'}])
+
+    monkeypatch.setattr(_sectioncache.time, 'time', lambda: agora + 59)
+    assert cache.get('pc01', 'get_motherboard_info') == (PLACA, agora)
+    monkeypatch.setattr(_sectioncache.time, 'time', lambda: agora + 61)
+    assert cache.get('pc01', 'get_motherboard_info') is None
+
+
+def test_remove_entradas_usadas_ha_mais_tempo(tmp_path):
+    ttls = {f'secao{i}': 3600 for i in range(3)}
+    cache = _sectioncache.SectionCache(str(tmp_path), ttls=ttls, max_bytes=10 ** 6)
+    for i, secao in enumerate(ttls):
+        cache.put('PC01', secao, 'x' * 100)
+        os.utime(cache._path('PC01', secao), (1000 + i, 1000 + i))
+    # a mais antiga foi lida agora: passa a ser a usada mais recentemente
+    assert cache.get('PC01', 'secao0') is not None
+    cache.max_bytes = sum(os.path.getsize(cache._path('PC01', s)) for s in ('secao0', 'secao2'))
+    cache._evict()
+    restantes = [s for s in ttls if cache.get('PC01', s) is not None]
+    assert restantes == ['secao0', 'secao2']
+
+
+def test_refresh_requested_e_cache_opcional(monkeypatch):
+    monkeypatch.delenv('CSINFO_FORCE_REFRESH', raising=False)
+    assert not _sectioncache.refresh_requested(None, 'monitors')
+    assert _sectioncache.refresh_requested(True, 'monitors')
+    assert _sectioncache.refresh_requested({'monitors'}, 'monitors')
+    assert not _sectioncache.refresh_requested(['monitors'], 'get_processor_info')
+    monkeypatch.setenv('CSINFO_FORCE_REFRESH', '1')
+    assert _sectioncache.refresh_requested(None, 'monitors')
+
+    monkeypatch.delenv('CSINFO_SECTION_CACHE', raising=False)
+    assert _sectioncache.get_default_cache() is None
+    monkeypatch.setenv('CSINFO_SECTION_CACHE', '1')
+    assert isinstance(_sectioncache.get_default_cache(), _sectioncache.SectionCache)
@@ -0,0 +1,55 @@
+import os
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _executor, _impl, _model, _store
+
+
+def _report(nome, ram, softwares, quando, cpu='Intel(R) Core(TM) i5-8500'):
+    return _model.Report(
+        identification=_model.Identification(nome, 'Desktop', 'joao', quando),
+        os_version='Windows 10 Pro (Version 10.0.19045) - 64 bits',
+        memory_total=f'{ram} GB',
+        processors=[_model.Processor(name=cpu, cores=6, logical_processors=6)],
+        software=[_model.Software(n, v, 'Microsoft') for n, v in softwares],
+        admins=['Administrador'],
+    )
+
+
+def test_consultas_usam_o_snapshot_mais_recente(tmp_path):
+    with _store.InventoryStore(str(tmp_path / 'inv.sqlite3')) as inv:
+        inv.add_snapshot(_report('PC01', 4.0, [('Microsoft Office 2016', '16.0.4266')], 100.0))
+        inv.add_snapshot(_report('PC01', 16.0, [('Microsoft Office 2021', '16.0.14332')], 200.0))
+        inv.add_snapshot(_report('PC02', 7.88, [('Microsoft Office 2016', '16.0.4266'), ('7-Zip', '19.00')], 150.0,
+                                 cpu='AMD Ryzen 5 3600'))
+        # snapshot antigo chegando depois não substitui o atual
+        inv.add_snapshot(_report('pc01', 2.0, [], 50.0))
+
+        assert [r['host'] for r in inv.ram(below=8)] == ['PC02']
+        assert [(r['host'], r['version']) for r in inv.software('office 2016')] == [('PC02', '16.0.4266')]
+        assert [r['host'] for r in inv.software('Office', version='16.0.1')] == ['PC01']
+        assert [r['host'] for r in inv.cpu('ryzen')] == ['PC02']
+        assert inv.hosts()[0]['os_build'] == '10.0.19045'
+        assert [r['collected_at'] for r in inv.history('PC01')] == [200.0, 100.0, 50.0]
+        assert inv.latest_report('PC01').memory_total == '16.0 GB'
+
+
+def test_main_grava_no_inventario(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path / 'state'))
+    monkeypatch.setenv('CSINFO_SECTION_CACHE', '0')
+    monkeypatch.setenv('CSINFO_WU_BACKGROUND', '0')
+    registros = [{'target': 'pc01', 'command': _impl._COMPUTER_SYSTEM_QUERY,
+                  'output': '{"TotalPhysicalMemory":8589934592,"PartOfDomain":false,"Workgroup":"WORKGROUP"}'}]
+    anterior = _executor.set_executor(_executor.ReplayExecutor(records=registros))
+    try:
+        banco = str(tmp_path / 'frota.sqlite3')
+        resultado = _impl.main(export_type='nenhum', barra_callback=lambda *_a: None, computer_name='sim-1',
+                               workers=2, store=banco)
+    finally:
+        _executor.set_executor(anterior)
+    assert resultado['snapshot_id'] is not None
+    linhas = _store.open_store(banco).ram(above=7)
+    assert [(r['host'], r['ram_gb']) for r in linhas] == [('sim-1', 8.0)]
@@ -0,0 +1,49 @@
+import os
+import sys
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _model, _store, _swindex
+
+
+def _report(nome, quando, softwares):
+    return _model.Report(
+        identification=_model.Identification(nome, 'Desktop', 'joao', quando),
+        software=[_model.Software(n, v, p) for n, v, p in softwares],
+    )
+
+
+JAVA_ANTIGO = ('Java 8 Update 291', '8.0.2910.10', 'Oracle Corporation')
+JAVA_NOVO = ('Java 8 Update 381', '8.0.3810.9', 'Oracle Corporation')
+ANYDESK = ('AnyDesk', '7.1.8', 'philandro Software GmbH')
+
+
+def test_indice_incremental_com_busca_por_trecho_prefixo_e_versao(tmp_path):
+    with _store.InventoryStore(str(tmp_path / 'inv.sqlite3')) as inv:
+        inv.add_snapshot(_report('PC01', 100.0, [JAVA_ANTIGO, ANYDESK]))
+        inv.add_snapshot(_report('PC02', 100.0, [JAVA_NOVO, ('7-Zip', '19.00', 'Igor Pavlov')]))
+        indice = inv.software_index
+
+        assert [r['host'] for r in inv.find_software('nydes')] == ['PC01']
+        assert [r['host'] for r in indice.search('any', prefix=True)] == ['PC01']
+        assert indice.search('desk', prefix=True) == []
+        assert [r['host'] for r in indice.search('java', max_version='8.0.3000')] == ['PC01']
+        assert [r['host'] for r in indice.search('java', min_version='8.0.3000')] == ['PC02']
+        assert [(r['host'], r['matches']) for r in indice.by_host('a')] == [('PC01', 2), ('PC02', 1)]
+
+        # nova coleta do PC01: Java atualizado e AnyDesk removido
+        inv.add_snapshot(_report('PC01', 200.0, [JAVA_NOVO]))
+        assert inv.find_software('anydesk') == []
+        assert [(r['host'], r['version']) for r in inv.find_software('java 8')] == [('PC01', '8.0.3810.9'), ('PC02', '8.0.3810.9')]
+        # um snapshot mais antigo chegando depois não altera o estado atual
+        inv.add_snapshot(_report('PC01', 50.0, [ANYDESK]))
+        assert inv.find_software('anydesk') == []
+        assert inv.query('SELECT COUNT(*) AS n FROM sw_names')[0]['n'] == 4
+
+
+def test_version_key_ordena_por_grupo_numerico():
+    assert _swindex.version_key('8.0.2910.10') < _swindex.version_key('8.0.3000') < _swindex.version_key('8.0.3810.9')
+    assert _swindex.version_key('10.0') > _swindex.version_key('9.9')
+    assert _swindex.version_key('N/A') is None
@@ -0,0 +1,68 @@
+import os
+import sys
+import threading
+
+proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if proj_root not in sys.path:
+    sys.path.insert(0, proj_root)
+
+from csinfo import _winupdate
+
+
+class _Busca(object):
+    """Busca falsa: só termina quando `liberar` é sinalizado."""
+
+    def __init__(self, valor='Nenhuma atualização pendente'):
+        self.valor = valor
+        self.liberar = threading.Event()
+        self.chamadas = 0
+
+    def __call__(self, computer_name):
+        self.chamadas += 1
+        self.liberar.wait(5)
+        return self.valor
+
+
+def test_sem_ouvintes_espera_a_busca_e_grava(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path))
+    monkeypatch.setattr(_winupdate, '_LISTENERS', [])
+    busca = _Busca()
+    threading.Timer(0.2, busca.liberar.set).start()
+    texto = _winupdate.status_for_report('pc01', wait=0, search=busca)
+    assert texto.startswith('Nenhuma atualização pendente (verificado em ')
+    assert _winupdate.last_known('PC01')[0] == 'Nenhuma atualização pendente'
+
+    # com valor conhecido o relatório não espera; a nova busca não é daemon
+    busca.liberar.clear()
+    texto = _winupdate.status_for_report('pc01', search=busca)
+    assert texto.endswith('; nova verificação em andamento)')
+    job = _winupdate._JOBS['pc01']
+    assert not job.daemon
+    busca.liberar.set()
+    job.join(5)
+    assert busca.chamadas == 2
+
+
+def test_com_ouvinte_espera_curta_e_avisa_depois(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path))
+    monkeypatch.setattr(_winupdate, '_LISTENERS', [])
+    avisos = []
+    _winupdate.add_listener(lambda host, texto, ts: avisos.append((host, texto)))
+    busca = _Busca('2 atualizações pendentes')
+    assert _winupdate.status_for_report('pc02', wait=0.05, search=busca).startswith('Verificação em andamento')
+    job = _winupdate._JOBS['pc02']
+    assert job.daemon
+    # uma segunda coleta reaproveita a busca em andamento
+    assert _winupdate.refresh('PC02', busca) is job
+    busca.liberar.set()
+    job.join(5)
+    assert avisos == [('pc02', '2 atualizações pendentes')]
+    assert busca.chamadas == 1
+
+
+def test_falha_na_busca_nao_sobrescreve_valor_conhecido(tmp_path, monkeypatch):
+    monkeypatch.setenv('CSINFO_STATE_DIR', str(tmp_path))
+    monkeypatch.setattr(_winupdate, '_LISTENERS', [])
+    _winupdate._save('pc03', 'Nenhuma atualização pendente', 100.0)
+    _winupdate.refresh('pc03', lambda _host: 'NÃO OBTIDO').join(5)
+    assert _winupdate.last_known('pc03') == ('Nenhuma atualização pendente', 100.0)